@@ -1,17 +1,55 @@
 """
 Expose the usable components to the library user
+
+The public names are imported lazily on first access, so `import openrocket_parser` stays cheap for
+short-lived tools and workers, and pandas is only imported by the parts of the library that need it.
+Logging is left to the host application, the command line tools configure it in their entry points.
 """
+import importlib
+from typing import TYPE_CHECKING
 
-from .simulations.loader import XmlSimulationLoader, CsvSimulationLoader
-from .simulations.simulation_data import FlightEvent
-from .components.components import component_factory
-from .core import load_rocket_from_xml
+# Public name -> module defining it
+_LAZY_ATTRIBUTES = {
+    'XmlSimulationLoader': '.simulations.loader',
+    'CsvSimulationLoader': '.simulations.loader',
+    'TelemetryCsvLoader': '.simulations.loader',
+    'FlightEvent': '.simulations.simulation_data',
+    'FlightData': '.simulations.flight_data',
+    'scan_summaries': '.simulations.scan',
+    'compute_metrics': '.simulations.metrics',
+    'Ensemble': '.simulations.ensemble',
+    'LandingDispersion': '.simulations.dispersion',
+    'follow': '.simulations.live',
+    'listen': '.simulations.live',
+    'component_factory': '.components.components',
+    'load_rocket_from_xml': '.core',
+    'OrkDocument': '.document',
+}
 
-"""
-Main entry point for openrocket_parser. Configures the logging, for now.
-"""
+__all__ = list(_LAZY_ATTRIBUTES)
+
+if TYPE_CHECKING:
+    from .simulations.loader import XmlSimulationLoader, CsvSimulationLoader, TelemetryCsvLoader
+    from .simulations.simulation_data import FlightEvent
+    from .simulations.flight_data import FlightData
+    from .simulations.scan import scan_summaries
+    from .simulations.metrics import compute_metrics
+    from .simulations.ensemble import Ensemble
+    from .simulations.dispersion import LandingDispersion
+    from .simulations.live import follow, listen
+    from .components.components import component_factory
+    from .core import load_rocket_from_xml
+    from .document import OrkDocument
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    # Cached on the module, so later accesses don't go through __getattr__
+    globals()[name] = value
+    return value
 
-import logging
 
-# Configure the basic logging to show a specific formatting
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,5 @@
+"""
+OpenRocket components. Every component module is imported here, so all the component classes are
+registered in the factory before the first file is parsed, whichever module is imported first.
+"""
+from . import components, bodytube, finset, motor, nosecone, rocket, stage  # noqa: F401
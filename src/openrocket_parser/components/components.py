@@ -3,9 +3,11 @@ Components collects a
 """
 
 import logging
-from typing import Type, List
+from typing import Dict, Type, List
 from xml.etree.ElementTree import Element
 
+from openrocket_parser.units import COMPONENT_FIELD_UNITS, convert
+
 COMPONENT_REGISTRY = {}
 
 
@@ -77,6 +79,23 @@ class XMLComponent:
 
         setattr(self, attr_name, value)
 
+    @classmethod
+    def field_units(cls) -> Dict[str, str]:
+        """The SI unit of every numeric field of this component, by attribute name."""
+        return {
+            attr_name: COMPONENT_FIELD_UNITS[attr_name]
+            for klass in reversed(cls.__mro__)
+            for attr_name, *_ in getattr(klass, '_FIELDS', [])
+            if attr_name in COMPONENT_FIELD_UNITS
+        }
+
+    def value_in(self, attr_name: str, unit: str):
+        """Returns a numeric field converted from its SI unit, e.g. `fin.value_in('rootchord', 'in')`."""
+        units = self.field_units()
+        if attr_name not in units:
+            raise ValueError(f"Field '{attr_name}' of {self.__class__.__name__} has no unit.")
+        return convert(getattr(self, attr_name), units[attr_name], unit)
+
     def findall(self, path: str) -> List[Element]:
         """Convenience wrapper for element.findall."""
         return self.element.findall(path)
@@ -15,6 +15,7 @@ class Stage(XMLComponent):
     """
     def __init__(self, element: Element):
         super().__init__(element)
+        # Same lookup as Subcomponent, iterating the element itself would turn <name> and <id> into components
         self.subcomponents: List[XMLComponent] = [
-            component_factory(e) for e in self.element
+            component_factory(e) for e in self.findall('.//subcomponents/*')
         ]
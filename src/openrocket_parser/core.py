@@ -10,6 +10,14 @@ from openrocket_parser.components.rocket import Rocket
 
 
 def export_xml_from_ork(filepath: str) -> bytes:
+    """
+    Returns the raw XML document of an .ork file. OpenRocket saves either a ZIP container holding the
+    XML document, or the plain XML document itself, so both are supported.
+    """
+    if not zipfile.is_zipfile(filepath):
+        with open(filepath, 'rb') as xml_file:
+            return xml_file.read()
+
     with zipfile.ZipFile(filepath, 'r') as zip_ref:
         for name in zip_ref.namelist():
             if name.endswith('.xml') or name.endswith('.ork'):
@@ -51,3 +59,6 @@ def load_rocket_from_xml_safe(file_path: str, root_ele: str = 'rocket') -> Optio
     except ET.ParseError as e:
         logging.error(f"Error parsing XML file: {e}")
         return None
+    except ValueError as e:
+        logging.error(f"Error loading rocket from {file_path}: {e}")
+        return None
@@ -0,0 +1,57 @@
+"""
+Single-parse access to an OpenRocket document. The container is decompressed and tokenized once,
+and both the rocket design and its simulations are built lazily from that same parse.
+"""
+import logging
+from functools import cached_property
+from typing import List, Optional
+from xml.etree.ElementTree import Element
+import xml.etree.ElementTree as ET
+
+from openrocket_parser.components.rocket import Rocket
+from openrocket_parser.core import export_xml_from_ork
+from openrocket_parser.simulations.loader import XmlSimulationLoader
+from openrocket_parser.simulations.simulation import Simulation
+
+
+class OrkDocument:
+    """
+    A parsed OpenRocket document exposing `.rocket` and `.simulations`.
+    Neither view is built until it's first accessed, and both share the same element tree.
+    """
+
+    def __init__(self, root: Element, file_path: Optional[str] = None):
+        if root is None:
+            raise ValueError("Cannot initialize OrkDocument with a None element.")
+        self.root: Element = root
+        self.file_path = file_path
+
+    @classmethod
+    def open(cls, file_path: str) -> 'OrkDocument':
+        """
+        Reads a zipped or plain XML .ork file once. Raises ValueError if the document can't be parsed.
+        """
+        try:
+            root = ET.fromstring(export_xml_from_ork(file_path))
+        except ET.ParseError as e:
+            error = f'Could not parse {file_path}: {e}'
+            logging.error(error)
+            raise ValueError(error) from e
+        return cls(root, file_path)
+
+    @cached_property
+    def rocket(self) -> Rocket:
+        """The rocket design. Raises ValueError if the document has no <rocket> element."""
+        rocket_element = self.root if self.root.tag == 'rocket' else self.root.find('.//rocket')
+        if rocket_element is None:
+            raise ValueError(f"Could not find a <rocket> element in {self.file_path or 'the document'}.")
+        return Rocket(rocket_element)
+
+    @cached_property
+    def simulations(self) -> List[Simulation]:
+        """All simulations with flight data stored in the document, empty if there are none."""
+        simulations_element = self.root.find('.//simulations')
+        if simulations_element is None:
+            logging.warning("No <simulations> tag found in the XML file.")
+            return []
+        return XmlSimulationLoader(simulations_element).load()
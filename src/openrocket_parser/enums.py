@@ -0,0 +1,22 @@
+"""
+Enumerations of the fixed values used by OpenRocket files
+"""
+from enum import Enum
+
+
+class FlightEventType(str, Enum):
+    """Flight event types, as written in the `type` attribute of the <event> elements."""
+    LAUNCH = 'launch'
+    IGNITION = 'ignition'
+    LIFTOFF = 'liftoff'
+    LAUNCH_ROD = 'launchrod'
+    BURNOUT = 'burnout'
+    EJECTION_CHARGE = 'ejectioncharge'
+    STAGE_SEPARATION = 'stageseparation'
+    APOGEE = 'apogee'
+    RECOVERY_DEVICE_DEPLOYMENT = 'recoverydevicedeployment'
+    GROUND_HIT = 'groundhit'
+    SIMULATION_END = 'simulationend'
+    ALTITUDE = 'altitude'
+    TUMBLE = 'tumble'
+    EXCEPTION = 'exception'
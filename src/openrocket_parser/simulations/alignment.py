@@ -0,0 +1,124 @@
+"""
+Comparison of recorded flights against simulations.
+
+The launch time offset between a recorded log and a simulation is found with an FFT based
+cross-correlation of one channel resampled on a common uniform grid, so logs with millions of
+samples align in a fraction of a second.
+"""
+from dataclasses import replace
+from typing import TYPE_CHECKING, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .resampling import interpolate_columns
+from .simulation import Simulation
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def _median_step(time: np.ndarray) -> float:
+    steps = np.diff(time)
+    steps = steps[steps > 0]
+    return float(np.median(steps)) if len(steps) else 0.0
+
+
+def _uniform_signal(sim: Simulation, column: str, dt: float) -> Tuple[float, np.ndarray]:
+    """The column on a uniform grid starting at the first sample, with its mean removed."""
+    time = np.asarray(sim.flight_data['time'], dtype=np.float64)
+    grid = time[0] + dt * np.arange(int(np.floor((time[-1] - time[0]) / dt)) + 1)
+    signal = interpolate_columns(time, sim.column_values([column]), grid)[:, 0]
+    signal = np.nan_to_num(signal - np.nanmean(signal))
+    return float(time[0]), signal
+
+
+def estimate_time_offset(reference: Simulation, measured: Simulation, column: str = 'altitude',
+                         dt: Optional[float] = None, max_offset: Optional[float] = None) -> float:
+    """
+    Estimates how much later, in seconds, the events of `measured` happen in its own time base than
+    the same events in `reference`. Subtracting the offset from the measured time aligns both series.
+
+    :param column: Channel both series have, altitude by default
+    :param dt: Resolution of the search. Defaults to the coarser median time step of both series,
+        the peak is then refined below that resolution by parabolic interpolation
+    :param max_offset: Only search offsets up to this absolute value, in seconds
+    """
+    reference_time = np.asarray(reference.flight_data['time'], dtype=np.float64)
+    measured_time = np.asarray(measured.flight_data['time'], dtype=np.float64)
+    if len(reference_time) < 2 or len(measured_time) < 2:
+        raise ValueError("Both series need at least two samples to be aligned.")
+    if dt is None:
+        dt = max(_median_step(reference_time), _median_step(measured_time))
+    if dt <= 0:
+        raise ValueError(f"The time step must be positive, got {dt}")
+
+    reference_start, a = _uniform_signal(reference, column, dt)
+    measured_start, b = _uniform_signal(measured, column, dt)
+
+    # Full cross-correlation through zero-padded real FFTs:
+    # correlation[k] = sum(a[n] * b[n + k]), negative lags wrap around to the end
+    size = 1 << int(len(a) + len(b) - 1).bit_length()
+    correlation = np.fft.irfft(np.conj(np.fft.rfft(a, size)) * np.fft.rfft(b, size), size)
+    lags = np.arange(size)
+    lags[lags >= len(b)] -= size
+    valid = (lags > -len(a)) & (lags < len(b))
+
+    start_difference = measured_start - reference_start
+    if max_offset is not None:
+        valid &= np.abs(start_difference + lags * dt) <= max_offset
+    if not valid.any():
+        raise ValueError(f"No offset within {max_offset} s can be searched.")
+
+    candidates = np.flatnonzero(valid)
+    peak = int(candidates[np.argmax(correlation[candidates])])
+    lag = float(lags[peak])
+
+    # Parabolic interpolation between the neighbours of a true peak,
+    # a peak at the edge of the searched range is kept as is
+    before, after = correlation[peak - 1], correlation[(peak + 1) % size]
+    if correlation[peak] >= max(before, after):
+        curvature = before - 2.0 * correlation[peak] + after
+        if curvature < 0:
+            lag += 0.5 * (before - after) / curvature
+
+    return start_difference + lag * dt
+
+
+def align(reference: Simulation, measured: Simulation, column: str = 'altitude',
+          dt: Optional[float] = None, max_offset: Optional[float] = None) -> Tuple[Simulation, float]:
+    """
+    Shifts the time of `measured` onto the time base of `reference`.
+    Returns the shifted copy of `measured` and the offset that was removed, see `estimate_time_offset`.
+    """
+    offset = estimate_time_offset(reference, measured, column, dt, max_offset)
+    flight_data = measured.flight_data.copy()
+    flight_data['time'] = flight_data['time'] - offset
+    return replace(measured, flight_data=flight_data), offset
+
+
+def residuals(reference: Simulation, measured: Simulation, columns: Sequence[str] = ('altitude',)) -> 'pd.DataFrame':
+    """
+    Statistics of measured minus reference values, one row per column, over the time range both cover.
+    The reference is interpolated at the measured sample times, so align the series first.
+    """
+    import pandas as pd
+    reference_time = np.asarray(reference.flight_data['time'], dtype=np.float64)
+    measured_time = np.asarray(measured.flight_data['time'], dtype=np.float64)
+    columns = list(columns)
+
+    expected = interpolate_columns(reference_time, reference.column_values(columns), measured_time)
+    difference = measured.column_values(columns) - expected
+
+    rows = []
+    for position, column in enumerate(columns):
+        values = difference[:, position]
+        values = values[np.isfinite(values)]
+        rows.append({
+            'column': column,
+            'samples': len(values),
+            'mean': values.mean() if len(values) else np.nan,
+            'std': values.std() if len(values) else np.nan,
+            'rms': np.sqrt(np.mean(values ** 2)) if len(values) else np.nan,
+            'max_abs': np.abs(values).max() if len(values) else np.nan,
+        })
+    return pd.DataFrame(rows).set_index('column')
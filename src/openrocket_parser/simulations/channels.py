@@ -0,0 +1,105 @@
+"""
+Derived flight data channels, computed from the recorded ones.
+
+Every derived channel declares the channels it is computed from, which can be flight data columns or
+other derived channels, and a vectorized function of their arrays. `Simulation.channel(name)` computes
+a derived channel once and caches it on the simulation until one of its sources changes. The source
+arrays are always in the SI units of `units.FLIGHT_DATA_UNITS`, whatever the units of the file.
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from openrocket_parser.units import STANDARD_GRAVITY
+
+# Specific gas constant of dry air, in J/(kg K)
+AIR_GAS_CONSTANT = 287.05287
+
+
+@dataclass(frozen=True)
+class DerivedChannel:
+    """A channel computed by `compute` from the arrays of the `requires` channels, in that order."""
+    name: str
+    requires: Tuple[str, ...]
+    compute: Callable[..., np.ndarray]
+    unit: Optional[str] = None
+    description: str = ''
+
+
+DERIVED_CHANNELS: Dict[str, DerivedChannel] = {}
+
+
+def register_channel(name: str, requires: Sequence[str], unit: Optional[str] = None):
+    """A decorator registering a function as a derived channel, its docstring being the description."""
+
+    def decorator(function: Callable[..., np.ndarray]):
+        DERIVED_CHANNELS[name] = DerivedChannel(
+            name=name,
+            requires=tuple(requires),
+            compute=function,
+            unit=unit,
+            description=(function.__doc__ or '').strip(),
+        )
+        return function
+
+    return decorator
+
+
+def time_derivative(values: np.ndarray, time: np.ndarray) -> np.ndarray:
+    """
+    Derivative of a channel over time with second order central differences (`np.gradient`).
+    Samples sharing a time stamp, as OpenRocket writes around events, are NaN instead of infinite.
+    """
+    if len(values) < 2:
+        return np.full(len(values), np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        derivative = np.gradient(values, time)
+    derivative[~np.isfinite(derivative)] = np.nan
+    return derivative
+
+
+@register_channel('air_density', ('air_pressure', 'air_temperature'), unit='kg/m³')
+def air_density(pressure: np.ndarray, temperature: np.ndarray) -> np.ndarray:
+    """Air density from the ideal gas law."""
+    return pressure / (AIR_GAS_CONSTANT * temperature)
+
+
+@register_channel('dynamic_pressure', ('air_density', 'total_velocity'), unit='Pa')
+def dynamic_pressure(density: np.ndarray, velocity: np.ndarray) -> np.ndarray:
+    """Dynamic pressure, 1/2 rho v²."""
+    return 0.5 * density * velocity ** 2
+
+
+@register_channel('total_acceleration_g', ('total_acceleration',), unit='G')
+def total_acceleration_g(acceleration: np.ndarray) -> np.ndarray:
+    """Total acceleration in multiples of the standard gravity."""
+    return acceleration / STANDARD_GRAVITY
+
+
+@register_channel('jerk', ('total_acceleration', 'time'), unit='m/s³')
+def jerk(acceleration: np.ndarray, time: np.ndarray) -> np.ndarray:
+    """Rate of change of the total acceleration."""
+    return time_derivative(acceleration, time)
+
+
+@register_channel('drag_force', ('mass', 'thrust', 'total_velocity', 'vertical_velocity', 'time'), unit='N')
+def drag_force(mass: np.ndarray, thrust: np.ndarray, velocity: np.ndarray, vertical_velocity: np.ndarray,
+               time: np.ndarray) -> np.ndarray:
+    """
+    Drag force from Newton's second law along the flight path: thrust minus mass times the sum of
+    the acceleration along the path and the gravity component along the path. Used for logs
+    without a drag column, e.g. to estimate the drag from recorded telemetry.
+    """
+    path_acceleration = time_derivative(velocity, time)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gravity_along_path = STANDARD_GRAVITY * np.where(velocity > 0, vertical_velocity / velocity, 0.0)
+    return thrust - mass * (path_acceleration + gravity_along_path)
+
+
+@register_channel('stability_margin_calibers', ('cp_location', 'cg_location', 'reference_length'))
+def stability_margin_calibers(cp_location: np.ndarray, cg_location: np.ndarray,
+                              reference_length: np.ndarray) -> np.ndarray:
+    """Distance from the center of gravity to the center of pressure, in body diameters."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (cp_location - cg_location) / reference_length
@@ -0,0 +1,121 @@
+"""
+Columnar on-disk cache for decoded simulations.
+
+Every flight data channel is written as its own raw little-endian float64 file, next to a small
+JSON manifest holding the names, units, events and summary of the simulation. Reopening the cache
+memory-maps the channel files, so only the channels that are actually used get paged in.
+"""
+import json
+import os
+import re
+from typing import Dict, Optional
+
+import numpy as np
+
+from .flight_data import FlightData, check_backend
+from .simulation import Simulation
+from .simulation_data import FlightEvent
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+COLUMN_DTYPE = '<f8'
+
+
+def _column_file_name(index: int, column_name: str) -> str:
+    """Builds a filesystem safe file name for a channel, keeping it readable when possible."""
+    safe_name = re.sub(r'[^A-Za-z0-9_]+', '_', str(column_name)).strip('_')
+    return f'{index:04d}_{safe_name}.f64' if safe_name else f'{index:04d}.f64'
+
+
+def save_columns(sim: Simulation, directory: str, units: Optional[Dict[str, str]] = None) -> None:
+    """
+    Writes the simulation into `directory` as one raw float64 file per channel plus a manifest.
+    The manifest is written last, so an interrupted save never looks like a valid cache.
+    `units` overrides the units of the simulation's columns.
+    """
+    os.makedirs(directory, exist_ok=True)
+    units = {**sim.units, **(units or {})}
+    flight_data = sim.flight_data
+
+    columns = []
+    for index, column_name in enumerate(flight_data.columns):
+        file_name = _column_file_name(index, column_name)
+        values = np.ascontiguousarray(flight_data[column_name], dtype=COLUMN_DTYPE)
+        values.tofile(os.path.join(directory, file_name))
+        columns.append({
+            'name': str(column_name),
+            'file': file_name,
+            'unit': units.get(column_name),
+        })
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'name': sim.name,
+        'description': sim.description,
+        'motor_config': sim.motor_config,
+        'summary': sim.summary,
+        'conditions': sim.conditions,
+        'events': [
+            {'time': evt.time, 'type': evt.type, 'source': evt.source} for evt in sim.events
+        ],
+        'length': len(flight_data),
+        'dtype': COLUMN_DTYPE,
+        'columns': columns,
+    }
+    with open(os.path.join(directory, MANIFEST_NAME), 'w', encoding='utf-8') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+
+
+def open_columns(directory: str, mmap: bool = True, backend: str = 'pandas') -> Simulation:
+    """
+    Opens a cache written by `save_columns`. With `mmap=True` (the default) the channels are
+    read-only memory maps wrapped in a DataFrame without copying; otherwise they are read into memory.
+
+    With `backend='numpy'` the channels are read straight into the contiguous block of a `FlightData`,
+    without importing pandas. Memory maps only apply to the pandas backend, as a block is one allocation.
+    """
+    check_backend(backend)
+    manifest_path = os.path.join(directory, MANIFEST_NAME)
+    with open(manifest_path, 'r', encoding='utf-8') as manifest_file:
+        manifest = json.load(manifest_file)
+
+    if manifest.get('version') != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported column cache version {manifest.get('version')} in {manifest_path}")
+
+    length = manifest['length']
+    dtype = np.dtype(manifest.get('dtype', COLUMN_DTYPE))
+    names = [c['name'] for c in manifest['columns']]
+    block = np.empty((len(names), length)) if backend == 'numpy' else None
+    data = {}
+    for position, column in enumerate(manifest['columns']):
+        column_path = os.path.join(directory, column['file'])
+        if length == 0:
+            values = np.empty(0, dtype=dtype)
+        elif mmap and block is None:
+            values = np.memmap(column_path, dtype=dtype, mode='r', shape=(length,))
+        else:
+            values = np.fromfile(column_path, dtype=dtype, count=length)
+        if len(values) != length:
+            raise ValueError(f"Column file {column_path} holds {len(values)} samples, expected {length}")
+        if block is not None:
+            block[position] = values
+        else:
+            data[column['name']] = values
+
+    if block is not None:
+        flight_data = FlightData.from_block(block, names)
+    else:
+        import pandas as pd
+        # copy=False keeps every column backed by its own memory map instead of consolidating them
+        flight_data = pd.DataFrame(data, columns=names, copy=False)
+
+    return Simulation(
+        name=manifest['name'],
+        description=manifest['description'],
+        motor_config=manifest['motor_config'],
+        summary=manifest['summary'],
+        events=[FlightEvent(**evt) for evt in manifest['events']],
+        flight_data=flight_data,
+        conditions=manifest.get('conditions', {}),
+        units={c['name']: c['unit'] for c in manifest['columns'] if c.get('unit')},
+    )
@@ -0,0 +1,240 @@
+"""
+Landing dispersion and drift statistics over many simulations, e.g. for range safety paperwork.
+
+Landing points are gathered for all runs at once from the flat column arrays, at the ground hit
+event or the last sample. The scatter is summarized by covariance ellipses, and the points and
+ellipses can be exported to CSV and GeoJSON.
+"""
+from dataclasses import dataclass
+import json
+import math
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from openrocket_parser.enums import FlightEventType
+from .metrics import concatenate_columns, event_samples
+from .simulation import Simulation
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Mean earth radius, in meters
+EARTH_RADIUS = 6371000.0
+
+_POSITION_COLUMNS = [
+    'time', 'position_east_of_launch', 'position_north_of_launch',
+    'lateral_distance', 'lateral_direction', 'latitude', 'longitude',
+]
+
+
+def _condition_array(simulations: Sequence[Simulation], key: str) -> np.ndarray:
+    """One launch condition per simulation as floats, NaN where it's missing or not numeric."""
+    values = [sim.conditions.get(key) for sim in simulations]
+    return np.array([v if isinstance(v, (int, float)) else np.nan for v in values], dtype=np.float64)
+
+
+def landing_points(simulations: Sequence[Simulation]) -> 'pd.DataFrame':
+    """
+    The landing point of every simulation, one row per simulation:
+
+    - east and north: position relative to the launch site (m). Computed from the lateral distance and
+      direction when the position columns are missing
+    - drift: distance from the launch site at landing (m), and max_drift: the largest one during the flight
+    - latitude and longitude (degrees): projected from the launch site in the simulation conditions,
+      or taken from the latitude/longitude columns when the launch site is unknown
+
+    Columns are read in the units recorded in `Simulation.units`, SI units being assumed when unknown.
+    """
+    simulations = list(simulations)
+    # In SI units, so the lateral direction and the latitude/longitude columns are in radians even
+    # when the file recorded them in degrees, as OpenRocket's CSV exports do
+    columns, starts, lengths = concatenate_columns(simulations, _POSITION_COLUMNS, si_units=True)
+
+    ground_hit = event_samples([sim.event_index for sim in simulations], FlightEventType.GROUND_HIT)
+    landing = np.where(ground_hit >= 0, ground_hit, lengths - 1)
+    valid = landing >= 0
+    rows = starts + np.maximum(landing, 0)
+
+    def at_landing(values: np.ndarray) -> np.ndarray:
+        return np.where(valid, values[rows] if values.size else np.nan, np.nan)
+
+    distance = at_landing(columns['lateral_distance'])
+    direction = at_landing(columns['lateral_direction'])
+    # OpenRocket measures the lateral direction counterclockwise from east
+    east = at_landing(columns['position_east_of_launch'])
+    east = np.where(np.isnan(east), distance * np.cos(direction), east)
+    north = at_landing(columns['position_north_of_launch'])
+    north = np.where(np.isnan(north), distance * np.sin(direction), north)
+
+    max_drift = np.full(len(simulations), np.nan)
+    non_empty = lengths > 0
+    if columns['lateral_distance'].size and non_empty.any():
+        with np.errstate(invalid='ignore'):
+            max_drift[non_empty] = np.fmax.reduceat(columns['lateral_distance'], starts[non_empty])
+
+    # Projection on the local tangent plane, accurate for the few kilometers of a rocket's drift
+    launch_latitude = _condition_array(simulations, 'launchlatitude')
+    launch_longitude = _condition_array(simulations, 'launchlongitude')
+    latitude = launch_latitude + np.degrees(north / EARTH_RADIUS)
+    longitude = launch_longitude + np.degrees(east / (EARTH_RADIUS * np.cos(np.radians(launch_latitude))))
+    latitude = np.where(np.isnan(latitude), np.degrees(at_landing(columns['latitude'])), latitude)
+    longitude = np.where(np.isnan(longitude), np.degrees(at_landing(columns['longitude'])), longitude)
+
+    import pandas as pd
+    return pd.DataFrame({
+        'name': [sim.name for sim in simulations],
+        'landing_time': at_landing(columns['time']),
+        'east': east,
+        'north': north,
+        'drift': np.hypot(east, north),
+        'max_drift': max_drift,
+        'latitude': latitude,
+        'longitude': longitude,
+        'launch_latitude': launch_latitude,
+        'launch_longitude': launch_longitude,
+    })
+
+
+@dataclass
+class DispersionEllipse:
+    """
+    An ellipse of the landing scatter, centered on the mean landing point.
+    The angle of the semi-major axis is counterclockwise from east, in radians.
+    """
+    sigma: float
+    probability: float
+    center_east: float
+    center_north: float
+    semi_major: float
+    semi_minor: float
+    angle: float
+
+    def outline(self, num_points: int = 72) -> np.ndarray:
+        """(num_points x 2) east/north coordinates of the closed ellipse outline."""
+        theta = np.linspace(0.0, 2.0 * np.pi, num_points)
+        x = self.semi_major * np.cos(theta)
+        y = self.semi_minor * np.sin(theta)
+        cos_angle, sin_angle = np.cos(self.angle), np.sin(self.angle)
+        return np.column_stack((
+            self.center_east + x * cos_angle - y * sin_angle,
+            self.center_north + x * sin_angle + y * cos_angle,
+        ))
+
+
+class LandingDispersion:
+    """Landing scatter statistics of a set of simulations."""
+
+    def __init__(self, points: 'pd.DataFrame'):
+        self.points = points
+        landed = points[['east', 'north']].dropna()
+        self._east_north = landed.to_numpy(dtype=np.float64)
+
+    @classmethod
+    def from_simulations(cls, simulations: Sequence[Simulation]) -> 'LandingDispersion':
+        """Gathers the landing points of the simulations, see `landing_points`."""
+        return cls(landing_points(simulations))
+
+    @property
+    def mean(self) -> np.ndarray:
+        """The mean (east, north) landing point."""
+        return self._east_north.mean(axis=0)
+
+    @property
+    def covariance(self) -> np.ndarray:
+        """The 2x2 covariance of the (east, north) landing points."""
+        if len(self._east_north) < 2:
+            return np.zeros((2, 2))
+        return np.cov(self._east_north, rowvar=False)
+
+    @property
+    def max_drift(self) -> float:
+        """The farthest landing point from the launch site among all runs (m)."""
+        return float(np.nanmax(self.points['drift'])) if len(self.points) else math.nan
+
+    def ellipse(self, sigma: Optional[float] = None, probability: Optional[float] = None) -> DispersionEllipse:
+        """
+        The covariance ellipse scaled to `sigma` standard deviations, or to the ellipse holding a given
+        `probability` of the landings. In two dimensions the 1, 2 and 3 sigma ellipses hold
+        about 39.3%, 86.5% and 98.9% of the landings.
+        """
+        if (sigma is None) == (probability is None):
+            raise ValueError("Exactly one of sigma or probability must be given.")
+        if probability is not None:
+            if not 0.0 < probability < 1.0:
+                raise ValueError(f"Probability must be between 0 and 1, got {probability}")
+            sigma = math.sqrt(-2.0 * math.log(1.0 - probability))
+        else:
+            probability = 1.0 - math.exp(-sigma ** 2 / 2.0)
+
+        eigenvalues, eigenvectors = np.linalg.eigh(self.covariance)
+        eigenvalues = np.clip(eigenvalues, 0.0, None)
+        # eigh sorts the eigenvalues in ascending order, so the major axis is the last one
+        major = eigenvectors[:, 1]
+        center_east, center_north = self.mean
+        return DispersionEllipse(
+            sigma=float(sigma),
+            probability=float(probability),
+            center_east=float(center_east),
+            center_north=float(center_north),
+            semi_major=float(sigma * np.sqrt(eigenvalues[1])),
+            semi_minor=float(sigma * np.sqrt(eigenvalues[0])),
+            angle=float(np.arctan2(major[1], major[0])),
+        )
+
+    def ellipses(self, sigmas: Sequence[float] = (1.0, 2.0, 3.0)) -> List[DispersionEllipse]:
+        """The ellipses for several sigma levels, 1, 2 and 3 sigma by default."""
+        return [self.ellipse(sigma=s) for s in sigmas]
+
+    def to_csv(self, path: str) -> None:
+        """Writes the landing points to a CSV file."""
+        self.points.to_csv(path, index=False)
+
+    def ellipses_to_csv(self, path: str, sigmas: Sequence[float] = (1.0, 2.0, 3.0)) -> None:
+        """Writes the parameters of the ellipses to a CSV file."""
+        import pandas as pd
+        pd.DataFrame([vars(e) for e in self.ellipses(sigmas)]).to_csv(path, index=False)
+
+    def _to_lon_lat(self, east: np.ndarray, north: np.ndarray) -> np.ndarray:
+        """Projects east/north offsets around the launch site to (longitude, latitude) pairs."""
+        launch_latitude = float(np.nanmean(self.points['launch_latitude'])) if len(self.points) else math.nan
+        launch_longitude = float(np.nanmean(self.points['launch_longitude'])) if len(self.points) else math.nan
+        if math.isnan(launch_latitude) or math.isnan(launch_longitude):
+            raise ValueError("The launch site is unknown, so the ellipses can't be placed on a map.")
+        latitude = launch_latitude + np.degrees(north / EARTH_RADIUS)
+        longitude = launch_longitude + np.degrees(east / (EARTH_RADIUS * np.cos(np.radians(launch_latitude))))
+        return np.column_stack((longitude, latitude))
+
+    def to_geojson(self, path: Optional[str] = None, sigmas: Sequence[float] = (1.0, 2.0, 3.0)) -> Dict[str, Any]:
+        """
+        Builds a GeoJSON FeatureCollection with the landing points and the ellipses as polygons,
+        writing it to `path` when given. The ellipses need the launch site from the simulation conditions.
+        """
+        points = self.points.dropna(subset=['latitude', 'longitude'])
+        features = [
+            {
+                'type': 'Feature',
+                'geometry': {'type': 'Point', 'coordinates': [lon, lat]},
+                'properties': {'kind': 'landing', 'name': name, 'drift': drift},
+            }
+            for name, lon, lat, drift in zip(
+                points['name'], points['longitude'].tolist(), points['latitude'].tolist(), points['drift'].tolist()
+            )
+        ]
+        if len(self._east_north):
+            for ellipse in self.ellipses(sigmas):
+                outline = ellipse.outline()
+                features.append({
+                    'type': 'Feature',
+                    'geometry': {
+                        'type': 'Polygon',
+                        'coordinates': [self._to_lon_lat(outline[:, 0], outline[:, 1]).tolist()],
+                    },
+                    'properties': {'kind': 'ellipse', 'sigma': ellipse.sigma, 'probability': ellipse.probability},
+                })
+
+        collection = {'type': 'FeatureCollection', 'features': features}
+        if path is not None:
+            with open(path, 'w', encoding='utf-8') as geojson_file:
+                json.dump(collection, geojson_file)
+        return collection
@@ -0,0 +1,132 @@
+"""
+Ensembles of simulations, e.g. from Monte Carlo dispersion analysis.
+
+All runs are resampled onto a common time base and stored in one contiguous
+(run x time x channel) float64 array, so statistics across runs are single NumPy reductions.
+"""
+from typing import List, Optional, Sequence, Tuple
+import warnings
+
+import numpy as np
+
+from .resampling import interpolate_columns
+from .simulation import Simulation
+
+
+class Ensemble:
+    """
+    A set of runs sharing the same time base and channels.
+    Samples after the end of a shorter run are NaN, and ignored by all the statistics.
+    """
+
+    def __init__(self, time: np.ndarray, data: np.ndarray, channels: Sequence[str], names: Sequence[str]):
+        data = np.ascontiguousarray(data, dtype=np.float64)
+        if data.ndim != 3 or data.shape[1] != len(time) or data.shape[2] != len(channels):
+            raise ValueError(
+                f"Ensemble data of shape {data.shape} doesn't match {len(time)} samples and {len(channels)} channels"
+            )
+        if data.shape[0] != len(names):
+            raise ValueError(f"Ensemble data holds {data.shape[0]} runs, but {len(names)} names were given")
+
+        self.time: np.ndarray = np.asarray(time, dtype=np.float64)
+        self.data: np.ndarray = data
+        self.channels: List[str] = list(channels)
+        self.names: List[str] = list(names)
+        self._channel_positions = {name: i for i, name in enumerate(self.channels)}
+
+    @classmethod
+    def from_simulations(cls, simulations: Sequence[Simulation], channels: Optional[Sequence[str]] = None,
+                         dt: Optional[float] = None, num_samples: Optional[int] = None,
+                         method: str = 'linear') -> 'Ensemble':
+        """
+        Resamples the simulations onto a common time base, from the earliest start to the latest end.
+
+        :param channels: Channels to keep. Defaults to every channel all the simulations have, except time
+        :param dt: Time step of the common time base
+        :param num_samples: Number of samples of the common time base, used when `dt` isn't given.
+            Defaults to the number of samples of the longest run
+        :param method: 'linear' or 'previous', see `interpolate_columns`
+        """
+        simulations = list(simulations)
+        if not simulations:
+            raise ValueError("Cannot build an ensemble without simulations.")
+
+        if channels is None:
+            common = set.intersection(*(set(sim.flight_data.columns) for sim in simulations))
+            channels = [c for c in simulations[0].flight_data.columns if c in common and c != 'time']
+        channels = list(channels)
+
+        run_times = [np.asarray(sim.flight_data['time'], dtype=np.float64) for sim in simulations]
+        start = min(t[0] for t in run_times if len(t))
+        end = max(t[-1] for t in run_times if len(t))
+        if dt is not None:
+            time = start + dt * np.arange(int(np.floor((end - start) / dt + 1e-9)) + 1)
+        else:
+            time = np.linspace(start, end, num_samples or max(len(t) for t in run_times))
+
+        data = np.empty((len(simulations), len(time), len(channels)))
+        for run, (sim, run_time) in enumerate(zip(simulations, run_times)):
+            data[run] = interpolate_columns(run_time, sim.column_values(channels), time, method)
+
+        return cls(time, data, channels, [sim.name for sim in simulations])
+
+    def __len__(self) -> int:
+        return self.data.shape[0]
+
+    @property
+    def valid(self) -> np.ndarray:
+        """(run x time) mask of the samples that hold data, False after the end of shorter runs."""
+        return ~np.isnan(self.data).all(axis=2)
+
+    def channel_index(self, channel: str) -> int:
+        """The position of a channel on the last axis of `data`."""
+        if channel not in self._channel_positions:
+            raise KeyError(f"Unknown channel '{channel}', available channels are {self.channels}")
+        return self._channel_positions[channel]
+
+    def channel(self, channel: str) -> np.ndarray:
+        """The (run x time) values of a channel. This is a view, not a copy."""
+        return self.data[:, :, self.channel_index(channel)]
+
+    def _values(self, channel: Optional[str]) -> np.ndarray:
+        return self.data if channel is None else self.channel(channel)
+
+    def _reduce(self, reducer, channel: Optional[str], axis: int = 0, **kwargs) -> np.ndarray:
+        """Applies a NaN-aware reduction, over the runs by default, without warning about all-NaN slices."""
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            return reducer(self._values(channel), axis=axis, **kwargs)
+
+    def mean(self, channel: Optional[str] = None) -> np.ndarray:
+        """Mean across runs, (time) for one channel or (time x channel) for all of them."""
+        return self._reduce(np.nanmean, channel)
+
+    def std(self, channel: Optional[str] = None) -> np.ndarray:
+        """Standard deviation across runs, (time) for one channel or (time x channel) for all of them."""
+        return self._reduce(np.nanstd, channel)
+
+    def percentile(self, q, channel: Optional[str] = None) -> np.ndarray:
+        """
+        Percentiles across runs. With several percentiles in `q`, the percentile is the first axis,
+        e.g. `ensemble.percentile([5, 50, 95], 'altitude')` is a (3 x time) array.
+        """
+        return self._reduce(np.nanpercentile, channel, q=q)
+
+    def envelope(self, channel: str, sigma: float = 1.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """The (mean - sigma * std, mean, mean + sigma * std) envelope of a channel."""
+        mean = self.mean(channel)
+        spread = sigma * self.std(channel)
+        return mean - spread, mean, mean + spread
+
+    def run_values(self, channel: str, reducer=np.nanmax) -> np.ndarray:
+        """
+        Reduces a channel to one value per run, to build run masks,
+        e.g. `ensemble.select(ensemble.run_values('altitude') > 500)` keeps the runs with an apogee above 500 m.
+        """
+        return self._reduce(reducer, channel, axis=1)
+
+    def select(self, runs) -> 'Ensemble':
+        """A new ensemble with the runs picked by a boolean mask or by their indices."""
+        runs = np.asarray(runs)
+        positions = np.flatnonzero(runs) if runs.dtype == bool else runs
+        return Ensemble(self.time, self.data[positions], self.channels, [self.names[i] for i in positions])
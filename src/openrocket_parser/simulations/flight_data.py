@@ -0,0 +1,168 @@
+"""
+A lightweight flight data container for workers that only need raw arrays.
+
+`FlightData` holds every channel in one contiguous float64 block plus a name to index map, and
+implements the small part of the DataFrame interface the library relies on (`columns`, `len`,
+`data['altitude']`, `to_numpy`, `copy`, `take`, `iloc`). Loaders build it with `backend='numpy'`,
+in which case pandas is never imported; `to_pandas()` wraps the same memory in a DataFrame on demand.
+"""
+import importlib.util
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+BACKENDS = ('pandas', 'numpy')
+
+
+def check_backend(backend: str) -> None:
+    """
+    Raises a ValueError for unknown flight data backends, and an ImportError for the pandas backend
+    when pandas isn't installed, as it's an optional dependency. pandas isn't imported here.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown flight data backend '{backend}', expected one of {BACKENDS}")
+    if backend == 'pandas' and importlib.util.find_spec('pandas') is None:
+        raise ImportError("The 'pandas' flight data backend needs pandas, install it with "
+                          "`pip install openrocket-python-parser[pandas]`, or load with backend='numpy'")
+
+
+def make_flight_data(values: np.ndarray, columns: Sequence[str], backend: str = 'pandas'):
+    """Builds flight data from (samples x columns) values, as a DataFrame or a FlightData."""
+    check_backend(backend)
+    if backend == 'numpy':
+        return FlightData(values, columns)
+    import pandas as pd
+    return pd.DataFrame(values, columns=list(columns))
+
+
+class FlightData:
+    """
+    Flight data channels stored as a (channels x samples) C-contiguous float64 block, so every
+    channel is a contiguous row and `data['altitude']` is a view, not a copy.
+    """
+
+    def __init__(self, values: Optional[np.ndarray] = None, columns: Sequence[str] = ()):
+        """
+        :param values: (samples x channels) values, like the rows of a CSV file
+        :param columns: The channel names, in the order of the values
+        """
+        columns = [str(c) for c in columns]
+        if values is None:
+            values = np.empty((0, len(columns)))
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim != 2 or values.shape[1] != len(columns):
+            raise ValueError(f"Flight data of shape {values.shape} doesn't match {len(columns)} columns")
+        self._set_block(np.ascontiguousarray(values.T), columns)
+
+    def _set_block(self, block: np.ndarray, columns: List[str]) -> None:
+        # Counts the writes through __setitem__, which can happen in place, for the derived channel cache
+        self.version = getattr(self, 'version', -1) + 1
+        self._block = block
+        self._columns = columns
+        self._positions: Dict[str, int] = {name: i for i, name in enumerate(columns)}
+
+    @classmethod
+    def from_block(cls, block: np.ndarray, columns: Sequence[str]) -> 'FlightData':
+        """Wraps a (channels x samples) float64 block without copying it."""
+        data = cls.__new__(cls)
+        block = np.asarray(block, dtype=np.float64)
+        if block.ndim != 2 or block.shape[0] != len(columns):
+            raise ValueError(f"Flight data block of shape {block.shape} doesn't match {len(columns)} columns")
+        data._set_block(block, [str(c) for c in columns])
+        return data
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, np.ndarray]) -> 'FlightData':
+        """Stacks {name: values} columns of equal length into one block."""
+        names = list(columns)
+        length = len(next(iter(columns.values()))) if columns else 0
+        block = np.empty((len(names), length))
+        for position, name in enumerate(names):
+            block[position] = columns[name]
+        return cls.from_block(block, names)
+
+    @classmethod
+    def from_pandas(cls, frame) -> 'FlightData':
+        """Copies the numeric columns of a DataFrame into a new block."""
+        return cls(frame.to_numpy(dtype=np.float64), frame.columns)
+
+    def to_pandas(self):
+        """A DataFrame over the same memory. Pandas is imported only here."""
+        import pandas as pd
+        return pd.DataFrame(self._block.T, columns=self._columns, copy=False)
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    @property
+    def shape(self):
+        return self._block.shape[1], self._block.shape[0]
+
+    @property
+    def empty(self) -> bool:
+        return self._block.size == 0
+
+    def __len__(self) -> int:
+        return self._block.shape[1]
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._positions
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns)
+
+    def __repr__(self) -> str:
+        return f"FlightData({len(self)} samples x {len(self._columns)} columns)"
+
+    def _position(self, column: str) -> int:
+        if column not in self._positions:
+            raise KeyError(column)
+        return self._positions[column]
+
+    def __getitem__(self, key: Union[str, Sequence[str]]):
+        """A channel as a 1-D view for a name, or a new FlightData for a list of names."""
+        if isinstance(key, str):
+            return self._block[self._position(key)]
+        key = list(key)
+        return FlightData.from_block(self._block[[self._position(c) for c in key]], key)
+
+    def __setitem__(self, column: str, values) -> None:
+        """Replaces a channel in place, or appends a new one (which reallocates the block)."""
+        values = np.broadcast_to(np.asarray(values, dtype=np.float64), (len(self),))
+        if column in self._positions:
+            if not self._block.flags.writeable:
+                self._block = self._block.copy()
+            self._block[self._positions[column]] = values
+            self.version += 1
+        else:
+            self._set_block(np.vstack((self._block, values[np.newaxis])), self._columns + [str(column)])
+
+    def to_numpy(self, dtype=None, copy: bool = False) -> np.ndarray:
+        """The (samples x channels) values, a transposed view of the block unless a copy is asked for."""
+        values = self._block.T
+        if dtype is not None and np.dtype(dtype) != values.dtype:
+            return values.astype(dtype)
+        return values.copy() if copy else values
+
+    def copy(self) -> 'FlightData':
+        return FlightData.from_block(self._block.copy(), self._columns)
+
+    def take(self, indices) -> 'FlightData':
+        """The samples at the given positions, as a new FlightData."""
+        return FlightData.from_block(np.ascontiguousarray(self._block[:, indices]), self._columns)
+
+    @property
+    def iloc(self) -> '_RowIndexer':
+        """Positional row selection, `data.iloc[10:20]` is a view on the same block."""
+        return _RowIndexer(self)
+
+
+class _RowIndexer:
+    def __init__(self, data: FlightData):
+        self._data = data
+
+    def __getitem__(self, rows) -> FlightData:
+        if isinstance(rows, slice):
+            return FlightData.from_block(self._data._block[:, rows], self._data._columns)
+        return self._data.take(np.atleast_1d(rows))
@@ -0,0 +1,359 @@
+"""
+Live data from files that are still being written, e.g. a DAQ logging a ground test to CSV,
+or from telemetry sent to a UDP port or a FIFO.
+
+`follow` remembers how far the file was read and only parses the complete lines appended since,
+so an update costs the same whether the file holds a hundred rows or a hundred million. `listen`
+reads whatever telemetry arrived without ever blocking. The rows go into a fixed-capacity ring
+buffer of NumPy columns, and subscribers are notified of every new block.
+"""
+import logging
+import os
+import socket
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from .flight_data import make_flight_data
+from .loader import CsvSimulationLoader
+from .simulation import Simulation
+
+# Called with the follower and the {column: array} block of the rows that were just appended
+Subscriber = Callable[['CsvFollower', Dict[str, np.ndarray]], None]
+
+# Bytes read from a followed file at a time, so a large backlog is parsed in bounded blocks
+READ_BLOCK_SIZE = 1 << 20
+# Bytes before the read offset that are compared at every poll to notice a rewritten file
+_TAIL_SIZE = 64
+
+
+class RingBuffer:
+    """
+    The last `capacity` rows of a set of columns. Rows are written in place, wrapping around,
+    so appending never reallocates and the memory use is fixed.
+    """
+
+    def __init__(self, columns: Sequence[str], capacity: int, dtype=np.float64):
+        if capacity < 1:
+            raise ValueError(f"The capacity must be positive, got {capacity}")
+        self.columns: List[str] = list(columns)
+        self.capacity = capacity
+        self._positions = {name: i for i, name in enumerate(self.columns)}
+        # One contiguous row per column, so reading a column is a slice
+        self._data = np.full((len(self.columns), capacity), np.nan, dtype=dtype)
+        self._end = 0
+        # Rows appended since the creation of the buffer, including the overwritten ones
+        self.total = 0
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def append(self, rows: np.ndarray) -> None:
+        """Appends a (rows x columns) array, overwriting the oldest rows once the buffer is full."""
+        rows = np.asarray(rows).reshape(-1, len(self.columns))
+        count = len(rows)
+        self.total += count
+        if count >= self.capacity:
+            self._data[:] = rows[-self.capacity:].T
+            self._end = 0
+            return
+        first = min(count, self.capacity - self._end)
+        self._data[:, self._end:self._end + first] = rows[:first].T
+        self._data[:, :count - first] = rows[first:].T
+        self._end = (self._end + count) % self.capacity
+
+    def clear(self) -> None:
+        """Drops all the rows, keeping the allocated memory."""
+        self._end = 0
+        self.total = 0
+
+    def column(self, name: str) -> np.ndarray:
+        """The values of a column, oldest first. A view when the buffer hasn't wrapped yet, a copy otherwise."""
+        if name not in self._positions:
+            raise KeyError(f"Unknown column '{name}', available columns are {self.columns}")
+        values = self._data[self._positions[name]]
+        if self.total <= self.capacity:
+            return values[:self._end if self.total < self.capacity else self.capacity]
+        return np.concatenate((values[self._end:], values[:self._end]))
+
+    def to_array(self) -> np.ndarray:
+        """The (rows x columns) values, oldest first."""
+        if self.total < self.capacity:
+            return self._data[:, :self._end].T.copy()
+        return np.roll(self._data, -self._end, axis=1).T.copy()
+
+
+class CsvFollower(CsvSimulationLoader):
+    """
+    Follows a CSV file as it grows, like `tail -f`. Every `poll` reads the bytes appended since
+    the previous one, parses the complete lines into the ring `buffer` and notifies the subscribers.
+    A partially written last line is left for the next poll. Headers and event comments are
+    handled like `CsvSimulationLoader` does. The file is read in blocks of `READ_BLOCK_SIZE` bytes, so the
+    first poll of a long existing log doesn't hold it in memory at once.
+
+    A file that was truncated, replaced, or rewritten with other content before the read offset
+    is read again from the start.
+    """
+
+    def __init__(self, file_path: str, capacity: int = 100_000, dtype=np.float64, delimiter: str = ',',
+                 backend: str = 'pandas'):
+        super().__init__(file_path, dtype=dtype, delimiter=delimiter, backend=backend)
+        self.capacity = capacity
+        self.offset = 0
+        self.buffer: Optional[RingBuffer] = None
+        self._subscribers: List[Subscriber] = []
+        # The (device, inode) of the file read, and the bytes it held just before `offset`
+        self._file_id = None
+        self._tail = b''
+
+    def subscribe(self, callback: Subscriber) -> Subscriber:
+        """Calls `callback(follower, block)` for every block of new rows. Returns the callback."""
+        self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback: Subscriber) -> None:
+        self._subscribers.remove(callback)
+
+    def _reset(self) -> None:
+        self.offset = 0
+        self._tail = b''
+        self.columns, self.units, self.events = None, {}, []
+        self._header_candidate = None
+        self.buffer = None
+
+    def poll(self) -> int:
+        """Reads what was appended to the file since the last poll. Returns the number of new rows."""
+        try:
+            csv_file = open(self.file_path, 'rb')
+        except FileNotFoundError:
+            return 0
+        with csv_file:
+            stat = os.fstat(csv_file.fileno())
+            file_id = (stat.st_dev, stat.st_ino)
+            if self._file_id is not None and file_id != self._file_id:
+                logging.warning(f"{self.file_path} was replaced, reading it again from the start.")
+                self._reset()
+            self._file_id = file_id
+            if stat.st_size < self.offset:
+                logging.warning(f"{self.file_path} was truncated, reading it again from the start.")
+                self._reset()
+            if stat.st_size == self.offset:
+                return 0
+
+            csv_file.seek(self.offset - len(self._tail))
+            if csv_file.read(len(self._tail)) != self._tail:
+                logging.warning(f"{self.file_path} was rewritten, reading it again from the start.")
+                self._reset()
+                csv_file.seek(0)
+
+            rows = 0
+            pending = b''
+            for block in iter(lambda: csv_file.read(READ_BLOCK_SIZE), b''):
+                chunk = pending + block
+                # Only complete lines are consumed, the rest is read again once its newline is written
+                complete = chunk.rfind(b'\n') + 1
+                pending = chunk[complete:]
+                if complete == 0:
+                    continue
+                self.offset += complete
+                self._tail = chunk[max(0, complete - _TAIL_SIZE):complete]
+                rows += self._consume(chunk[:complete].decode('utf-8').splitlines(keepends=True))
+            return rows
+
+    def _consume(self, lines: List[str]) -> int:
+        """Parses complete lines into the buffer. Returns the number of new rows."""
+        data = self._split_lines(lines)
+        if not data or self.columns is None:
+            return 0
+        return self._append(self._parse_rows(data))
+
+    def _append(self, rows: np.ndarray) -> int:
+        """Appends parsed rows to the buffer and notifies the subscribers."""
+        if not len(rows):
+            return 0
+        if self.buffer is None:
+            self.buffer = RingBuffer(self.columns, self.capacity, self.dtype)
+        self.buffer.append(rows)
+        if self._subscribers:
+            block = {name: rows[:, i] for i, name in enumerate(self.columns)}
+            for callback in list(self._subscribers):
+                callback(self, block)
+        return len(rows)
+
+    def run(self, poll_interval: float = 0.1, timeout: Optional[float] = None,
+            stop: Optional[Callable[[], bool]] = None) -> None:
+        """
+        Polls the file every `poll_interval` seconds until `stop()` returns True or `timeout` seconds
+        have passed. Meant to run in a background thread while the subscribers plot or analyze.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not (stop and stop()) and (deadline is None or time.monotonic() < deadline):
+            if self.poll() == 0:
+                time.sleep(poll_interval)
+
+    def load(self) -> List[Simulation]:
+        """A snapshot of the rows currently in the buffer, as a simulation."""
+        self.poll()
+        columns = self.columns or []
+        values = self.buffer.to_array() if self.buffer is not None else np.empty((0, len(columns)), self.dtype)
+        return [Simulation(
+            name=self.file_path.split('/')[-1],
+            description=f"Live data from {self.file_path}",
+            motor_config="unknown",
+            events=list(self.events),
+            flight_data=make_flight_data(values, columns, self.backend),
+            units=dict(self.units),
+        )]
+
+
+def follow(file_path: str, capacity: int = 100_000, dtype=np.float64, delimiter: str = ',',
+           backend: str = 'pandas') -> CsvFollower:
+    """
+    Starts following a CSV file, reading what it already holds. Call `poll()` (or `run()`) to pick
+    up appended rows, and `subscribe` to be notified of them, e.g.::
+
+        follower = follow('daq.csv', capacity=50_000)
+        follower.subscribe(lambda f, block: print(block['time'][-1]))
+        follower.run(poll_interval=0.05)
+    """
+    follower = CsvFollower(file_path, capacity=capacity, dtype=dtype, delimiter=delimiter, backend=backend)
+    follower.poll()
+    return follower
+
+
+class TelemetryStream(CsvFollower):
+    """
+    Telemetry sent to a UDP port (`udp://host:port`) or written to a FIFO (named pipe), e.g. by a
+    ground station. `poll` never blocks: it reads what arrived since the previous call, at most
+    `max_read` bytes, parses it into the ring `buffer` and notifies the subscribers, so it can be
+    called from a GUI timer.
+
+    Frames are CSV lines, after a header line or with the `columns` given, or with `binary_dtype`
+    (e.g. '<f4'), packed records of one value of that type per column. Every UDP datagram holds
+    whole frames, while a FIFO is a stream of bytes where an incomplete frame waits for the rest.
+    Frames that can't be parsed are dropped and counted in `dropped`.
+    """
+
+    def __init__(self, source: str, columns: Optional[Sequence[str]] = None, capacity: int = 100_000,
+                 dtype=np.float64, delimiter: str = ',', binary_dtype=None, backend: str = 'pandas',
+                 max_read: int = 1 << 22):
+        super().__init__(source, capacity=capacity, dtype=dtype, delimiter=delimiter, backend=backend)
+        self.binary_dtype = None if binary_dtype is None else np.dtype(binary_dtype)
+        if self.binary_dtype is not None and not columns:
+            raise ValueError("The columns of binary frames must be given")
+        if columns:
+            self.columns = list(columns)
+        self.max_read = max_read
+        self.dropped = 0
+        self._pending = b''
+        self._socket: Optional[socket.socket] = None
+        self._fd: Optional[int] = None
+
+        url = urlsplit(source)
+        if url.scheme == 'udp':
+            if url.port is None:
+                raise ValueError(f"No port in {source}, expected udp://host:port")
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self._socket.bind((url.hostname or '0.0.0.0', url.port))
+            self._socket.setblocking(False)
+        else:
+            self._fd = os.open(source, os.O_RDONLY | getattr(os, 'O_NONBLOCK', 0))
+
+    @property
+    def address(self):
+        """The (host, port) the UDP socket is bound to, e.g. to find the port picked for udp://host:0."""
+        return self._socket.getsockname() if self._socket is not None else None
+
+    def _receive(self) -> List[bytes]:
+        chunks, size = [], 0
+        while size < self.max_read:
+            try:
+                chunk = self._socket.recv(65536) if self._socket is not None else os.read(self._fd, 65536)
+            except (BlockingIOError, InterruptedError):
+                break
+            if not chunk:
+                # No writer on the FIFO
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+        return chunks
+
+    def _parse_rows(self, rows: List[str]) -> np.ndarray:
+        try:
+            return super()._parse_rows(rows)
+        except ValueError:
+            # A corrupted frame, the rows are parsed one at a time to keep the others
+            parsed = []
+            for row in rows:
+                try:
+                    parsed.append(super()._parse_rows([row]))
+                except ValueError:
+                    self.dropped += 1
+            return np.concatenate(parsed) if parsed else np.empty((0, len(self.columns)), self.dtype)
+
+    def _parse_binary(self, chunks: List[bytes]) -> np.ndarray:
+        frame_size = self.binary_dtype.itemsize * len(self.columns)
+        if self._socket is not None:
+            # Trailing partial frames of datagrams can't be completed
+            whole = [chunk[:len(chunk) - len(chunk) % frame_size] for chunk in chunks]
+            self.dropped += sum(len(chunk) % frame_size != 0 for chunk in chunks)
+            data = b''.join(whole)
+        else:
+            data = self._pending + b''.join(chunks)
+            # An incomplete last frame waits for the rest of its bytes
+            complete = len(data) - len(data) % frame_size
+            data, self._pending = data[:complete], data[complete:]
+        values = np.frombuffer(data, dtype=self.binary_dtype)
+        return values.reshape(-1, len(self.columns)).astype(self.dtype)
+
+    def poll(self) -> int:
+        """Reads the telemetry received since the last poll. Returns the number of new rows."""
+        chunks = self._receive()
+        if not chunks:
+            return 0
+        if self.binary_dtype is not None:
+            return self._append(self._parse_binary(chunks))
+
+        if self._socket is not None:
+            data = b''.join(chunk if chunk.endswith(b'\n') else chunk + b'\n' for chunk in chunks)
+        else:
+            data = self._pending + b''.join(chunks)
+        complete = data.rfind(b'\n') + 1
+        self._pending = data[complete:]
+        lines = data[:complete].decode('utf-8', errors='replace').splitlines(keepends=True)
+        if self.columns is None:
+            # Data sent before the header, when listening to a stream that already started
+            start = next((i for i, line in enumerate(lines) if line.strip() and not self._is_data_line(line)),
+                         len(lines))
+            self.dropped += start
+            lines = lines[start:]
+        try:
+            return self._consume(lines)
+        except ValueError:
+            # Only event comments before the data, the header is still to come
+            self.dropped += len(lines)
+            self._header_candidate = None
+            return 0
+
+    def close(self) -> None:
+        if self._socket is not None:
+            self._socket.close()
+        if self._fd is not None:
+            os.close(self._fd)
+        self._socket = self._fd = None
+
+
+def listen(source: str, columns: Optional[Sequence[str]] = None, capacity: int = 100_000, dtype=np.float64,
+           delimiter: str = ',', binary_dtype=None, backend: str = 'pandas') -> TelemetryStream:
+    """
+    Starts receiving telemetry on `udp://host:port`, or from a FIFO path. Call `poll()` to pick up
+    what arrived, and `subscribe` to be notified of it, e.g.::
+
+        stream = listen('udp://0.0.0.0:5005', columns=['time', 'altitude'], binary_dtype='<f4')
+        stream.subscribe(lambda s, block: print(block['altitude'][-1]))
+        stream.run(poll_interval=0.02)
+    """
+    return TelemetryStream(source, columns=columns, capacity=capacity, dtype=dtype, delimiter=delimiter,
+                           binary_dtype=binary_dtype, backend=backend)
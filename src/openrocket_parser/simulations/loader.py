@@ -2,37 +2,79 @@
 Simulation Loading capabilities. It loads the simulations from either an XML or a CSV export
 """
 import abc
+import io
+import itertools
 import re
 import logging
-from typing import List
+import warnings
+from typing import Any, Collection, Dict, Iterator, List, Optional, Tuple
 from xml.etree.ElementTree import Element
 import xml.etree.ElementTree as ET
-import pandas as pd
+import numpy as np
 
+from openrocket_parser.core import export_xml_from_ork
+from openrocket_parser.units import FLIGHT_DATA_UNITS, split_unit
+from .flight_data import check_backend, make_flight_data
 from .simulation import Simulation
 from .simulation_data import FlightEvent
 
 
-def load_simulations_from_xml(file_path: str) -> List[Simulation]:
+def load_simulations_from_xml(file_path: str, backend: str = 'pandas',
+                              indices: Optional[Collection[int]] = None) -> List[Simulation]:
     """
     Loads all simulations from an OpenRocket XML file.
+    With `backend='numpy'` the flight data is a `FlightData` array container and pandas isn't imported.
+    With `indices`, only the simulations at these positions in the file (0-based, as listed by
+    `scan_summaries`) are loaded; the flight data of the others is skipped without being parsed.
     """
+    check_backend(backend)
 
     try:
-        tree = ET.parse(file_path)
+        # Supports both zipped and plain XML .ork files
+        document = export_xml_from_ork(file_path)
+        if indices is not None:
+            document = _drop_datapoints(document, set(indices))
+        root = ET.fromstring(document)
         # The loader now expects the parent <simulations> tag
-        simulations_element = tree.find('.//simulations')
+        simulations_element = root.find('.//simulations')
         if simulations_element is None:
             logging.warning("No <simulations> tag found in the XML file.")
             return []
 
-        loader = XmlSimulationLoader(simulations_element)
+        loader = XmlSimulationLoader(simulations_element, backend=backend, indices=indices)
         return loader.load()
     except Exception as e:
         logging.error(f"Could not load or parse XML file at {file_path}: {e}")
         return []
 
 
+_SIMULATION_START = re.compile(rb'<simulation[\s>]')
+
+
+def _drop_datapoints(document: bytes, keep: Collection[int]) -> bytes:
+    """
+    Cuts the <datapoint> elements of the simulations that aren't kept out of the raw document, before
+    it reaches the XML parser, so skipped simulations cost a byte search instead of a parse.
+    The datapoints of a branch are contiguous and end with the closing </databranch> tag.
+    """
+    starts = [match.start() for match in _SIMULATION_START.finditer(document)]
+    if not starts:
+        return document
+    ends = starts[1:] + [len(document)]
+    pieces = [document[:starts[0]]]
+    for position, (start, end) in enumerate(zip(starts, ends)):
+        cursor = start
+        while position not in keep:
+            first = document.find(b'<datapoint', cursor, end)
+            close = document.find(b'</databranch>', first, end) if first >= 0 else -1
+            if close < 0:
+                break
+            pieces.append(document[cursor:first])
+            cursor = close
+        pieces.append(document[cursor:end])
+    return b''.join(pieces)
+
+
 class BaseSimulationLoader(abc.ABC):
     """
     Abstract base class for all simulation loaders.
@@ -48,29 +90,139 @@ class BaseSimulationLoader(abc.ABC):
 class CsvSimulationLoader(BaseSimulationLoader):
     """
     Loads a simulation from an exported CSV file.
+
+    The file is streamed in blocks of `block_size` rows parsed by the C engine into `dtype` arrays,
+    so `iter_blocks` runs at constant memory on files of any size. Headers are normalized like the
+    XML ones ('Vertical velocity (m/s)' becomes 'vertical_velocity', with 'm/s' kept in `units`),
+    and the `# Event APOGEE occurred at t=12.3 seconds` comments become flight events.
+    With `backend='numpy'` the rows are parsed by NumPy and pandas isn't imported.
     """
 
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, block_size: int = 100_000, dtype=np.float64, delimiter: str = ',',
+                 backend: str = 'pandas'):
+        if block_size < 1:
+            raise ValueError(f"The block size must be positive, got {block_size}")
+        check_backend(backend)
         self.file_path = file_path
+        self.backend = backend
+        self.block_size = block_size
+        self.dtype = np.dtype(dtype)
+        self.delimiter = delimiter
+        # Filled while the file is read
+        self.columns: Optional[List[str]] = None
+        self.units: Dict[str, str] = {}
+        self.events: List[FlightEvent] = []
+        self._header_candidate: Optional[str] = None
+
+    def _set_header(self, header_line: str) -> None:
+        parsed = [parse_header(h) for h in header_line.lstrip('#').strip().split(self.delimiter)]
+        self.columns = [name for name, _ in parsed]
+        self.units = {name: unit for name, unit in parsed if unit}
+
+    def _is_data_line(self, line: str) -> bool:
+        try:
+            float(line.split(self.delimiter, 1)[0])
+            return True
+        except ValueError:
+            return False
+
+    def _parse_comments(self, lines: List[str]) -> None:
+        for line in lines:
+            if line.startswith('#'):
+                event = _parse_event_comment(line)
+                if event is not None:
+                    self.events.append(event)
+
+    def _take_header(self, lines: List[str], header_candidate: Optional[str]) -> Tuple[int, Optional[str]]:
+        """
+        Looks for the header in the lines read before the first data row. OpenRocket writes it as the
+        last comment before the data, other tools as a plain first line. Returns the position of the
+        first line after the header and the header candidate seen so far.
+        """
+        for position, line in enumerate(lines):
+            if line.startswith('#'):
+                event = _parse_event_comment(line)
+                if event is not None:
+                    self.events.append(event)
+                elif self.delimiter in line:
+                    header_candidate = line
+            elif line.strip():
+                if not self._is_data_line(line):
+                    self._set_header(line)
+                    return position + 1, None
+                if header_candidate is None:
+                    raise ValueError(f"No header found before the data of {self.file_path}")
+                self._set_header(header_candidate)
+                return position, None
+        return len(lines), header_candidate
+
+    def _split_lines(self, lines: List[str]) -> List[str]:
+        """Finds the header if it's still unknown and the events, returning the data rows of the lines."""
+        if self.columns is None:
+            start, self._header_candidate = self._take_header(lines, self._header_candidate)
+            lines = lines[start:]
+        data = [line for line in lines if line[0] not in '#\r\n']
+        if len(data) != len(lines):
+            self._parse_comments(lines)
+        return data
+
+    def _parse_rows(self, rows: List[str]) -> np.ndarray:
+        """Parses data rows into a (rows x columns) array with the C engine."""
+        if self.backend == 'numpy':
+            return np.loadtxt(rows, delimiter=self.delimiter, dtype=self.dtype, ndmin=2).reshape(-1, len(self.columns))
+        import pandas as pd
+        frame = pd.read_csv(
+            io.StringIO(''.join(rows)),
+            engine='c',
+            header=None,
+            names=self.columns,
+            sep=self.delimiter,
+            dtype=self.dtype,
+        )
+        return frame.to_numpy(dtype=self.dtype)
+
+    def iter_blocks(self) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Yields the flight data as {column: array} blocks of at most `block_size` rows. The columns,
+        units and the events found so far are available on the loader while iterating.
+        """
+        self.columns, self.units, self.events = None, {}, []
+        self._header_candidate = None
+        with open(self.file_path, 'r', encoding='utf-8') as csv_file:
+            while True:
+                lines = list(itertools.islice(csv_file, self.block_size))
+                if not lines:
+                    break
+                data = self._split_lines(lines)
+                if not data:
+                    continue
+
+                values = self._parse_rows(data)
+                yield {name: values[:, i] for i, name in enumerate(self.columns)}
+
+        if self.columns is None and self._header_candidate is not None:
+            self._set_header(self._header_candidate)
 
     def load(self) -> List[Simulation]:
         try:
-            # Using pandas to easily read and process the data
-            flight_data = pd.read_csv(self.file_path, comment='#')
-
-            column_map = {
-                'Time (s)': 'time',
-                'Altitude (m)': 'altitude',
-                'Vertical velocity (m/s)': 'vertical_velocity',
-                'Vertical acceleration (m/s²)': 'vertical_acceleration',
-            }
-            flight_data.rename(columns=column_map, inplace=True)
+            blocks = list(self.iter_blocks())
+            columns = self.columns or []
+            num_rows = sum(len(block[columns[0]]) for block in blocks) if blocks else 0
+            values = np.empty((num_rows, len(columns)), dtype=self.dtype)
+            start = 0
+            for block in blocks:
+                length = len(block[columns[0]])
+                values[start:start + length] = np.column_stack([block[name] for name in columns])
+                start += length
+            flight_data = make_flight_data(values, columns, self.backend)
 
             sim = Simulation(
                 name=self.file_path.split('/')[-1],  # Use filename as name
                 description=f"Loaded from {self.file_path}",
                 motor_config="unknown",  # Not available in CSV
-                flight_data=flight_data
+                events=list(self.events),
+                flight_data=flight_data,
+                units=dict(self.units),
             )
             return [sim]  # Return as a list for consistency
         except FileNotFoundError:
@@ -78,6 +230,140 @@ class CsvSimulationLoader(BaseSimulationLoader):
             return []
 
 
+_EVENT_COMMENT = re.compile(
+    r'^#\s*(?:Event\s+)?(?P<type>[A-Za-z_ ]+?)\s+occurred at t\s*=\s*(?P<time>[-+0-9.eE]+)', re.IGNORECASE
+)
+# Event names of the CSV exports that differ from the XML event types
+_CSV_EVENT_TYPES = {'launchrodclearance': 'launchrod'}
+
+
+def _parse_event_comment(line: str) -> Optional[FlightEvent]:
+    """Parses a comment like '# Event GROUND_HIT occurred at t=80.2 seconds', None for other comments."""
+    match = _EVENT_COMMENT.match(line.strip())
+    if match is None:
+        return None
+    event_type = re.sub(r'[^a-z]', '', match.group('type').lower())
+    return FlightEvent(time=float(match.group('time')), type=_CSV_EVENT_TYPES.get(event_type, event_type))
+
+
+class TelemetryCsvLoader(BaseSimulationLoader):
+    """
+    Loads a recorded flight log (altimeter, GPS, ...) from a CSV file, to compare it with a simulation.
+
+    `column_map` maps the file's column names to the library's names (e.g. {'Alt (ft)': 'altitude'}),
+    and only those columns are read. `scales` multiplies columns by a factor after renaming, e.g.
+    {'altitude': 0.3048, 'time': 0.001} for feet and milliseconds. The file is parsed by the C engine
+    in chunks of `chunk_size` rows, copied into one preallocated float64 array, and sorted by time.
+    A KeyError is raised if a mapped column is missing from the file. Reading needs pandas,
+    `backend` only selects the kind of flight data that is returned.
+    """
+
+    def __init__(self, file_path: str, column_map: Optional[Dict[str, str]] = None,
+                 scales: Optional[Dict[str, float]] = None, chunk_size: int = 1_000_000,
+                 backend: str = 'pandas', **read_csv_kwargs):
+        check_backend(backend)
+        self.file_path = file_path
+        self.backend = backend
+        self.column_map = column_map or {
+            'Time (s)': 'time',
+            'Altitude (m)': 'altitude',
+            'Vertical velocity (m/s)': 'vertical_velocity',
+            'Vertical acceleration (m/s²)': 'vertical_acceleration',
+        }
+        self.scales = scales or {}
+        self.chunk_size = chunk_size
+        self.read_csv_kwargs = read_csv_kwargs
+
+    def load(self) -> List[Simulation]:
+        import pandas as pd
+        try:
+            columns = list(self.column_map)
+            options = dict(engine='c', comment='#', **self.read_csv_kwargs)
+            header = pd.read_csv(self.file_path, nrows=0, **options).columns
+            missing = [name for name in columns if name not in header]
+            if missing:
+                raise KeyError(f"Columns {missing} not found in {self.file_path}, it has {list(header)}")
+
+            # Every chunk is copied straight into one array, sized from the line count of the file, so
+            # reading never holds more than the result and one chunk
+            values = np.empty((_count_lines(self.file_path), len(columns)), dtype=np.float64)
+            filled = 0
+            reader = pd.read_csv(
+                self.file_path,
+                usecols=columns,
+                dtype={name: np.float64 for name in columns},
+                chunksize=self.chunk_size,
+                **options
+            )
+            with reader:
+                for chunk in reader:
+                    end = filled + len(chunk)
+                    if end > len(values):
+                        # More rows than lines, e.g. a compressed file: grow the array
+                        grown = np.empty((max(end, 2 * len(values)), len(columns)), dtype=np.float64)
+                        grown[:filled] = values[:filled]
+                        values = grown
+                    for position, name in enumerate(columns):
+                        values[filled:end, position] = chunk[name].to_numpy(dtype=np.float64)
+                    filled = end
+            values = values[:filled]
+
+            names = [self.column_map[name] for name in columns]
+            scales = np.array([self.scales.get(name, 1.0) for name in names])
+            values *= scales
+            if 'time' in names:
+                time = values[:, names.index('time')]
+                if np.any(time[1:] < time[:-1]):
+                    values = values[np.argsort(time, kind='stable')]
+
+            # The unit in a header only still holds for the columns that weren't scaled
+            units = {
+                name: split_unit(header)[1] for header, name in zip(columns, names)
+                if name not in self.scales and split_unit(header)[1]
+            }
+
+            sim = Simulation(
+                name=self.file_path.split('/')[-1],  # Use filename as name
+                description=f"Telemetry loaded from {self.file_path}",
+                motor_config="unknown",  # Not available in telemetry
+                flight_data=make_flight_data(values, names, self.backend),
+                units=units,
+            )
+            return [sim]
+        except FileNotFoundError:
+            logging.error(f"Error: CSV file not found at {self.file_path}")
+            return []
+
+
+def _count_lines(file_path: str) -> int:
+    """Number of lines of a file, counted in 1 MiB blocks. An upper bound of the rows of a CSV file."""
+    count = 1
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            count += block.count(b'\n')
+    return count
+
+
+def _convert_condition(text: str) -> Any:
+    """Converts numeric text to float, leaving any other value as a stripped string."""
+    text = text.strip()
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def parse_conditions(conditions_element: Optional[Element]) -> Dict[str, Any]:
+    """Reads the simple values of a <conditions> element (launch rod, wind, launch site, ...)."""
+    if conditions_element is None:
+        return {}
+    return {
+        child.tag: _convert_condition(child.text)
+        for child in conditions_element
+        if len(child) == 0 and child.text and child.text.strip()
+    }
+
+
 def _clean_header(header_text: str) -> str:
     """Converts a header like 'Vertical velocity (m/s²)' to 'vertical_velocity_ms2'."""
     text = header_text.lower().strip()
@@ -89,16 +375,61 @@ def _clean_header(header_text: str) -> str:
     return text
 
 
+def parse_header(header_text: str) -> Tuple[str, Optional[str]]:
+    """
+    Splits a header like 'Vertical acceleration (m/s²)' into a column name and a unit symbol,
+    ('vertical_acceleration', 'm/s²'). Headers without a unit, like the ones of OpenRocket XML files,
+    get the unit OpenRocket uses for that channel, or None when it's unknown or unitless.
+    """
+    label, unit = split_unit(header_text)
+    name = _clean_header(label)
+    return name, unit or FLIGHT_DATA_UNITS.get(name)
+
+
+def _parse_datapoints(texts: List[str], num_columns: int) -> np.ndarray:
+    """
+    Parses the comma separated <datapoint> texts into a (samples x columns) array, in a single
+    C-level pass over the joined texts. 'NaN' values are parsed as NaN.
+    """
+    expected = len(texts) * num_columns
+    if expected:
+        with warnings.catch_warnings():
+            # A malformed value stops the fast parser early, the row by row parsing below reports it
+            warnings.simplefilter('ignore', DeprecationWarning)
+            values = np.fromstring(','.join(texts), dtype=np.float64, sep=',')
+        if values.size == expected:
+            return values.reshape(-1, num_columns)
+    rows = [[float(p) for p in text.split(',')] for text in texts]
+    return np.array(rows, dtype=np.float64).reshape(-1, num_columns)
+
+
 class XmlSimulationLoader(BaseSimulationLoader):
     """Loads one or more simulations from an OpenRocket XML element."""
 
-    def __init__(self, simulations_element: Element):
-        # Expects the <simulations> tag as input
+    def __init__(self, simulations_element: Element, backend: str = 'pandas',
+                 indices: Optional[Collection[int]] = None):
+        """
+        :param simulations_element: The <simulations> element
+        :param backend: 'pandas' or 'numpy', see `make_flight_data`
+        :param indices: Positions of the simulations to load (0-based), all of them by default
+        """
+        check_backend(backend)
         self.element = simulations_element
+        self.backend = backend
+        self.indices = None if indices is None else set(indices)
 
     def load(self) -> List[Simulation]:
+        return [sim for _, sim in self.load_indexed()]
+
+    def load_indexed(self) -> List[Tuple[int, Simulation]]:
+        """
+        The loaded simulations paired with their position in the file (0-based), so the simulations
+        skipped for lack of flight data or parse errors don't shift the positions of the others.
+        """
         simulations = []
-        for sim_element in self.element.findall('./simulation'):
+        for position, sim_element in enumerate(self.element.findall('./simulation')):
+            if self.indices is not None and position not in self.indices:
+                continue
             try:
                 flightdata_el = sim_element.find('.//flightdata')
                 if flightdata_el is None:
@@ -116,19 +447,13 @@ class XmlSimulationLoader(BaseSimulationLoader):
 
                 # Parse the column headers from the 'types' attribute
                 headers_raw = branch_el.get('types').split(',')
-                headers = [_clean_header(h) for h in headers_raw]
-
-                # Parse all datapoints into a list of lists
-                data_rows = []
-                for dp in branch_el.findall('datapoint'):
-                    if dp.text:
-                        row_values = [
-                            float(p) if p.strip().lower() != 'nan' else None
-                            for p in dp.text.split(',')
-                        ]
-                        data_rows.append(row_values)
+                parsed_headers = [parse_header(h) for h in headers_raw]
+                headers = [name for name, _ in parsed_headers]
+                units = {name: unit for name, unit in parsed_headers if unit}
 
-                df = pd.DataFrame(data_rows, columns=headers)
+                values = _parse_datapoints([dp.text for dp in branch_el.findall('datapoint') if dp.text],
+                                           len(headers))
+                df = make_flight_data(values, headers, self.backend)
 
                 # Parse flight events
                 events = [
@@ -140,15 +465,18 @@ class XmlSimulationLoader(BaseSimulationLoader):
                 ]
 
                 # Assemble the final Simulation object
+                conditions_el = sim_element.find('.//conditions')
                 sim = Simulation(
                     name=sim_element.findtext('.//name', 'Unnamed Simulation'),
                     description=sim_element.findtext('.//description', ''),
-                    motor_config=sim_element.find('.//conditions').get('configid', 'default'),
+                    motor_config=conditions_el.get('configid', 'default'),
                     summary=summary_data,
                     events=events,
-                    flight_data=df
+                    flight_data=df,
+                    conditions=parse_conditions(conditions_el),
+                    units=units,
                 )
-                simulations.append(sim)
+                simulations.append((position, sim))
             except Exception as e:
                 sim_name = sim_element.findtext('.//name', 'unknown')
                 logging.error(f"Failed to parse simulation '{sim_name}': {e}")
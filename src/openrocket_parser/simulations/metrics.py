@@ -0,0 +1,162 @@
+"""
+Derived flight metrics computed across many simulations at once.
+
+The flight data of all the simulations is concatenated into flat column arrays, and every metric is
+a single NumPy reduction or gather over those arrays, using the event sample indices for alignment.
+"""
+from typing import TYPE_CHECKING, Dict, Sequence, Tuple
+
+import numpy as np
+
+from openrocket_parser.enums import FlightEventType
+from openrocket_parser.units import FLIGHT_DATA_UNITS, conversion
+from .simulation import Simulation
+from .simulation_data import EventIndex, normalize_event_type
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def concatenate_columns(simulations: Sequence[Simulation], names: Sequence[str], si_units: bool = False) \
+        -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray]:
+    """
+    Concatenates the given columns of every simulation into flat float64 arrays.
+    Columns a simulation doesn't have are filled with NaN for its samples. With `si_units`, the columns
+    of a simulation recorded in other units (see `Simulation.units`) are converted to the units of
+    `units.FLIGHT_DATA_UNITS`, e.g. angles in degrees to radians.
+    Returns the arrays by name, plus the start offset and the number of samples of every simulation.
+    """
+    names = list(names)
+    lengths = np.array([len(sim.flight_data) for sim in simulations], dtype=np.intp)
+    starts = np.zeros(len(simulations), dtype=np.intp)
+    np.cumsum(lengths[:-1], out=starts[1:])
+
+    flat = np.full((len(names), int(lengths.sum())), np.nan)
+    for sim, start, length in zip(simulations, starts, lengths):
+        flat[:, start:start + length] = sim.column_values(names).T
+        if not si_units:
+            continue
+        for row, name in enumerate(names):
+            unit, si_unit = sim.units.get(name), FLIGHT_DATA_UNITS.get(name)
+            if unit is not None and si_unit is not None and unit != si_unit:
+                scale, offset = conversion(unit, si_unit)
+                segment = flat[row, start:start + length]
+                segment *= scale
+                segment += offset
+
+    return {name: flat[row] for row, name in enumerate(names)}, starts, lengths
+
+
+def event_samples(event_indexes: Sequence[EventIndex], event_type: FlightEventType,
+                  occurrence: int = 0) -> np.ndarray:
+    """The per-simulation sample index of an event occurrence, -1 where the event didn't happen."""
+    event_type = normalize_event_type(event_type)
+    samples = np.full(len(event_indexes), -1, dtype=np.intp)
+    for position, event_index in enumerate(event_indexes):
+        event_sample_indices = event_index.samples_of(event_type)
+        if -len(event_sample_indices) <= occurrence < len(event_sample_indices):
+            samples[position] = event_sample_indices[occurrence]
+    return samples
+
+
+def _segment_max(values: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """NaN-ignoring maximum of every simulation's segment, NaN for empty segments."""
+    result = np.full(len(starts), np.nan)
+    non_empty = lengths > 0
+    if values.size and non_empty.any():
+        with np.errstate(invalid='ignore'):
+            result[non_empty] = np.fmax.reduceat(values, starts[non_empty])
+    return result
+
+
+def _gather(values: np.ndarray, starts: np.ndarray, samples: np.ndarray) -> np.ndarray:
+    """Picks one value per simulation at a local sample index, NaN where the index is -1."""
+    valid = samples >= 0
+    result = np.full(len(starts), np.nan)
+    result[valid] = values[starts[valid] + samples[valid]]
+    return result
+
+
+def _segment_rate(values: np.ndarray, time: np.ndarray, starts: np.ndarray,
+                  first: np.ndarray, last: np.ndarray) -> np.ndarray:
+    """Average rate of change of every simulation's values between the first and last samples."""
+    valid = (first >= 0) & (last > first)
+    result = np.full(len(starts), np.nan)
+    begin = starts[valid] + first[valid]
+    end = starts[valid] + last[valid]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result[valid] = (values[end] - values[begin]) / (time[end] - time[begin])
+    return result
+
+
+def compute_metrics(simulations: Sequence[Simulation]) -> 'pd.DataFrame':
+    """
+    Computes the main performance metrics of every simulation, one DataFrame row per simulation:
+
+    - apogee: maximum altitude (m), and apogee_time from the apogee event (s)
+    - max_velocity, max_mach and max_q: maximum total velocity (m/s), Mach number and
+      dynamic pressure (Pa), the latter being the `dynamic_pressure` channel of the simulation
+    - rail_exit_velocity: total velocity when leaving the launch rod (m/s)
+    - burnout_altitude: altitude at the first motor burnout (m)
+    - drogue_descent_rate and main_descent_rate: average descent speed under each recovery device (m/s).
+      The last deployment is considered the main parachute, and an earlier one the drogue.
+      Descent is measured from apogee when a device deploys before it.
+    - landing_velocity: vertical speed at ground hit, or at the last sample without one (m/s)
+
+    Metrics that can't be computed for a simulation, e.g. because a column or an event is missing, are NaN.
+    """
+    simulations = list(simulations)
+    columns, starts, lengths = concatenate_columns(simulations, [
+        'time', 'altitude', 'vertical_velocity', 'total_velocity', 'mach_number',
+    ])
+    # The cached channel, computed from the air data converted to SI units whatever the units of the file
+    dynamic_pressure = np.full(int(lengths.sum()), np.nan)
+    for sim, start, length in zip(simulations, starts, lengths):
+        try:
+            dynamic_pressure[start:start + length] = sim.channel('dynamic_pressure')
+        except KeyError:
+            pass
+
+    event_indexes = [sim.event_index for sim in simulations]
+    ground_hit = event_samples(event_indexes, FlightEventType.GROUND_HIT)
+    last_sample = lengths - 1
+    landing = np.where(ground_hit >= 0, ground_hit, last_sample)
+
+    deployment_counts = np.array(
+        [len(index.samples_of(FlightEventType.RECOVERY_DEVICE_DEPLOYMENT)) for index in event_indexes],
+        dtype=np.intp
+    )
+    first_deployment = event_samples(event_indexes, FlightEventType.RECOVERY_DEVICE_DEPLOYMENT, 0)
+    main_deployment = event_samples(event_indexes, FlightEventType.RECOVERY_DEVICE_DEPLOYMENT, -1)
+    drogue_deployment = np.where(deployment_counts > 1, first_deployment, -1)
+
+    # Only the descending part counts, for devices deployed before apogee
+    apogee = event_samples(event_indexes, FlightEventType.APOGEE)
+    drogue_deployment = np.where(drogue_deployment >= 0, np.maximum(drogue_deployment, apogee), -1)
+    main_deployment = np.where(main_deployment >= 0, np.maximum(main_deployment, apogee), -1)
+
+    apogee_times = np.array([
+        index.time_of(FlightEventType.APOGEE) if FlightEventType.APOGEE in index else np.nan
+        for index in event_indexes
+    ], dtype=np.float64)
+
+    metrics = {
+        'name': [sim.name for sim in simulations],
+        'apogee': _segment_max(columns['altitude'], starts, lengths),
+        'apogee_time': apogee_times,
+        'max_velocity': _segment_max(columns['total_velocity'], starts, lengths),
+        'max_mach': _segment_max(columns['mach_number'], starts, lengths),
+        'max_q': _segment_max(dynamic_pressure, starts, lengths),
+        'rail_exit_velocity': _gather(
+            columns['total_velocity'], starts, event_samples(event_indexes, FlightEventType.LAUNCH_ROD)),
+        'burnout_altitude': _gather(
+            columns['altitude'], starts, event_samples(event_indexes, FlightEventType.BURNOUT)),
+        'drogue_descent_rate': -_segment_rate(
+            columns['altitude'], columns['time'], starts, drogue_deployment, main_deployment),
+        'main_descent_rate': -_segment_rate(
+            columns['altitude'], columns['time'], starts, main_deployment, landing),
+        'landing_velocity': np.abs(_gather(
+            columns['vertical_velocity'], starts, np.where(lengths > 0, landing, -1))),
+    }
+    import pandas as pd
+    return pd.DataFrame(metrics)
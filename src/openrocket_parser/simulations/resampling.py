@@ -0,0 +1,91 @@
+"""
+Vectorized resampling of irregularly sampled flight data onto new time grids.
+"""
+import numpy as np
+
+RESAMPLING_METHODS = ('linear', 'previous')
+DOWNSAMPLING_METHODS = ('lttb', 'stride')
+
+
+def interpolate_columns(time: np.ndarray, values: np.ndarray, grid: np.ndarray, method: str = 'linear') -> np.ndarray:
+    """
+    Interpolates every column of a (samples x columns) array at the `grid` times in one pass.
+    `time` must be sorted. Grid points outside of the sampled time range are NaN.
+
+    - 'linear' interpolates between the two surrounding samples
+    - 'previous' holds the value of the last sample at or before the grid point
+    """
+    if method not in RESAMPLING_METHODS:
+        raise ValueError(f"Unknown resampling method '{method}', expected one of {RESAMPLING_METHODS}")
+
+    time = np.asarray(time, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    grid = np.asarray(grid, dtype=np.float64)
+    result = np.full((len(grid), values.shape[1]), np.nan)
+    if len(time) == 0:
+        return result
+
+    inside = (grid >= time[0]) & (grid <= time[-1])
+    points = grid[inside]
+    # Index of the last sample at or before every grid point
+    left = np.searchsorted(time, points, side='right') - 1
+
+    if method == 'previous' or len(time) == 1:
+        result[inside] = values[left]
+        return result
+
+    left = np.clip(left, 0, len(time) - 2)
+    span = time[left + 1] - time[left]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Repeated time stamps have no span, and take the left value
+        weight = np.where(span > 0, (points - time[left]) / span, 0.0)[:, np.newaxis]
+    result[inside] = values[left] * (1.0 - weight) + values[left + 1] * weight
+    return result
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, num_points: int) -> np.ndarray:
+    """
+    Picks `num_points` sample indices with the largest-triangle-three-buckets algorithm, which keeps
+    the visual shape of a series, peaks included, with a fraction of its samples.
+
+    `y` can be a (samples x channels) array: every channel is scaled to its range and the triangle
+    areas are summed, so the peaks of all the channels are kept. The first and last samples are always kept.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    num_samples = len(x)
+    if num_points >= num_samples:
+        return np.arange(num_samples)
+    if num_points < 3:
+        raise ValueError(f"LTTB needs at least 3 points, got {num_points}")
+
+    y = np.asarray(y, dtype=np.float64).reshape(num_samples, -1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        span = np.nanmax(y, axis=0) - np.nanmin(y, axis=0)
+        y = np.nan_to_num((y - np.nanmin(y, axis=0)) / np.where(span > 0, span, 1.0))
+    x_span = x[-1] - x[0]
+    x = (x - x[0]) / (x_span if x_span > 0 else 1.0)
+
+    # The samples between the first and the last one are split in num_points - 2 buckets
+    edges = np.linspace(1, num_samples - 1, num_points - 1).astype(np.intp)
+    x_sums = np.concatenate(([0.0], np.cumsum(x)))
+    y_sums = np.vstack((np.zeros((1, y.shape[1])), np.cumsum(y, axis=0)))
+
+    indices = np.empty(num_points, dtype=np.intp)
+    indices[0] = 0
+    indices[-1] = num_samples - 1
+    previous = 0
+    for bucket in range(num_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # The third vertex is the average of the next bucket, or the last sample for the last bucket
+        next_start, next_end = (end, edges[bucket + 2]) if bucket + 2 < len(edges) else (num_samples - 1, num_samples)
+        count = next_end - next_start
+        x_next = (x_sums[next_end] - x_sums[next_start]) / count
+        y_next = (y_sums[next_end] - y_sums[next_start]) / count
+
+        x_a, y_a = x[previous], y[previous]
+        areas = np.abs(
+            (x_a - x_next) * (y[start:end] - y_a) - (x_a - x[start:end, np.newaxis]) * (y_next - y_a)
+        ).sum(axis=1)
+        previous = start + int(np.argmax(areas))
+        indices[bucket + 1] = previous
+    return indices
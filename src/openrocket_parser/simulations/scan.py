@@ -0,0 +1,144 @@
+"""
+Fast scanning of the precomputed simulation summaries across many .ork files.
+
+Only the simulation names, launch conditions and the <flightdata> summary attributes are read.
+The <datapoint> bodies are cut out of the byte stream before reaching the XML tokenizer, so a file
+costs little more than its decompression, and files are scanned in parallel worker processes.
+"""
+import logging
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional
+import xml.etree.ElementTree as ET
+
+from .loader import parse_conditions
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+_READ_CHUNK_SIZE = 1 << 20
+_DATAPOINT_START = b'<datapoint'
+_BRANCH_END = b'</databranch>'
+
+
+def _iter_xml_chunks(file_path: str) -> Iterator[bytes]:
+    """Yields the raw XML document in chunks, from either a zipped or a plain XML .ork file."""
+    if zipfile.is_zipfile(file_path):
+        with zipfile.ZipFile(file_path, 'r') as zip_ref:
+            names = [n for n in zip_ref.namelist() if n.endswith('.xml') or n.endswith('.ork')]
+            if not names:
+                raise ValueError("No XML or ORK file found inside archive.")
+            with zip_ref.open(names[0]) as xml_file:
+                yield from iter(lambda: xml_file.read(_READ_CHUNK_SIZE), b'')
+    else:
+        with open(file_path, 'rb') as xml_file:
+            yield from iter(lambda: xml_file.read(_READ_CHUNK_SIZE), b'')
+
+
+def _skip_datapoints(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Removes everything between the first <datapoint> of a branch and the closing </databranch> tag,
+    handling markers split across chunk boundaries.
+    """
+    skipping = False
+    pending = b''
+    for chunk in chunks:
+        buffer = pending + chunk
+        position = 0
+        while True:
+            marker = _BRANCH_END if skipping else _DATAPOINT_START
+            found = buffer.find(marker, position)
+            if found < 0:
+                break
+            if skipping:
+                # Keep the closing tag, so the document stays well formed
+                position = found
+            else:
+                yield buffer[position:found]
+                position = found + len(marker)
+            skipping = not skipping
+
+        # Hold back a possible partial marker at the end of the buffer for the next chunk
+        keep = len(_BRANCH_END if skipping else _DATAPOINT_START) - 1
+        cut = max(position, len(buffer) - keep)
+        if not skipping:
+            yield buffer[position:cut]
+        pending = buffer[cut:]
+
+    if not skipping:
+        yield pending
+
+
+def _scan_file(file_path: str) -> List[Dict[str, Any]]:
+    """Scans one file, returning one row per simulation. Errors are logged and yield no rows."""
+    rows = []
+    try:
+        parser = ET.XMLPullParser(events=('start', 'end'))
+        tag_stack = []
+        current = None
+        for chunk in _skip_datapoints(_iter_xml_chunks(file_path)):
+            parser.feed(chunk)
+            for event, element in parser.read_events():
+                if event == 'start':
+                    tag_stack.append(element.tag)
+                    if element.tag == 'simulation':
+                        current = {'file': file_path, 'index': len(rows), 'name': None}
+                    elif element.tag == 'flightdata' and current is not None:
+                        for key, value in element.attrib.items():
+                            try:
+                                current[key] = float(value)
+                            except ValueError:
+                                current[key] = float('nan')
+                    continue
+
+                tag_stack.pop()
+                if current is None:
+                    continue
+                if element.tag == 'name' and tag_stack[-1:] == ['simulation']:
+                    current['name'] = (element.text or '').strip()
+                elif element.tag == 'conditions':
+                    current.update(parse_conditions(element))
+                elif element.tag == 'simulation':
+                    rows.append(current)
+                    current = None
+                    element.clear()
+        parser.close()
+    except Exception as e:
+        logging.error(f"Could not scan simulation summaries in {file_path}: {e}")
+        return []
+
+    return rows
+
+
+def list_simulations(file_path: str) -> List[Dict[str, Any]]:
+    """
+    The simulations of one file, in file order, as dicts of their `index` in the file, `name`, launch
+    conditions and summary values. No flight data is decoded and pandas isn't needed, so it's cheap
+    enough to list the simulations before loading the one picked with `load_simulations_from_xml(indices=...)`.
+    Errors are logged and return an empty list.
+    """
+    return _scan_file(file_path)
+
+
+def scan_summaries(paths: Iterable[str], max_workers: Optional[int] = None) -> 'pd.DataFrame':
+    """
+    Collects the simulation names, launch conditions and OpenRocket's summary values
+    (max altitude, max velocity, time to apogee, ...) of every simulation in `paths`.
+
+    Returns one DataFrame row per simulation, with the source `file` and its `index` in that file.
+    Files are scanned in `max_workers` processes; use `max_workers=1` to scan in this process.
+    """
+    paths = [str(p) for p in paths]
+    if max_workers == 1 or len(paths) <= 1:
+        results = [_scan_file(p) for p in paths]
+    else:
+        workers = max_workers or os.cpu_count() or 1
+        # Batch the files so thousands of small files don't pay one round trip each
+        chunksize = max(1, len(paths) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_scan_file, paths, chunksize=chunksize))
+
+    import pandas as pd
+    rows = [row for file_rows in results for row in file_rows]
+    return pd.DataFrame(rows)
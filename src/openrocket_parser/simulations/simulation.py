@@ -1,19 +1,53 @@
 """
 Collection of simulation base classes
 """
-from dataclasses import dataclass, field
-from typing import Dict, Any, List
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Sequence, Union
 
-import pandas as pd
+import numpy as np
 
-from openrocket_parser.simulations.simulation_data import FlightEvent
+from openrocket_parser.enums import FlightEventType
+from openrocket_parser.units import FLIGHT_DATA_UNITS, conversion, convert
+from openrocket_parser.simulations.channels import DERIVED_CHANNELS
+from openrocket_parser.simulations.flight_data import FlightData, check_backend, make_flight_data
+from openrocket_parser.simulations.simulation_data import FlightEvent, EventIndex
+from openrocket_parser.simulations.resampling import interpolate_columns, lttb_indices, DOWNSAMPLING_METHODS
+
+# Channels shaping the flight plots, used by default to pick the samples kept when downsampling
+DISPLAY_CHANNELS = (
+    'altitude', 'vertical_velocity', 'vertical_acceleration', 'total_velocity', 'total_acceleration',
+    'lateral_distance',
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# An event type (e.g. 'apogee' or FlightEventType.APOGEE), a time in seconds, or None for the data bounds
+EventOrTime = Union[str, FlightEventType, float, None]
+
+# A pandas DataFrame, or a FlightData for the NumPy backend
+FlightDataFrame = Union['pd.DataFrame', FlightData]
+
+
+def _empty_flight_data() -> FlightDataFrame:
+    try:
+        import pandas as pd
+    except ImportError:
+        return FlightData()
+    return pd.DataFrame()
+
+
+def backend_of(flight_data: FlightDataFrame) -> str:
+    """The backend holding some flight data, 'numpy' or 'pandas'."""
+    return 'numpy' if isinstance(flight_data, FlightData) else 'pandas'
 
 
 @dataclass
 class Simulation:
     """
     Holds the complete data for a single simulation run.
-    Flight data is stored in a pandas DataFrame for easy analysis.
+    Flight data is stored in a pandas DataFrame for easy analysis, or in a `FlightData`
+    array container when loaded with the NumPy backend.
     """
     name: str
     description: str
@@ -26,4 +60,235 @@ class Simulation:
     events: List[FlightEvent] = field(default_factory=list)
 
     # Time-series data
-    flight_data: pd.DataFrame = field(default_factory=pd.DataFrame)
+    flight_data: FlightDataFrame = field(default_factory=_empty_flight_data)
+
+    # Launch conditions from <conditions> (launch rod, wind, launch site, ...)
+    conditions: Dict[str, Any] = field(default_factory=dict)
+
+    # Unit symbol of the flight data columns, when known (e.g. {'altitude': 'm'})
+    units: Dict[str, str] = field(default_factory=dict)
+
+    # Lazily built lookup structures, not part of the simulation's identity
+    _event_index: Optional[EventIndex] = field(default=None, init=False, repr=False, compare=False)
+    _event_index_key: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    _channel_cache: Dict[str, tuple] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    @property
+    def event_index(self) -> EventIndex:
+        """
+        The events as time-sorted arrays aligned to flight data samples.
+        Built on first use, and rebuilt when the events or the flight data are replaced.
+        """
+        key = (id(self.events), len(self.events), id(self.flight_data), len(self.flight_data))
+        if self._event_index is None or self._event_index_key != key:
+            time = np.asarray(self.flight_data['time']) if 'time' in self.flight_data else np.empty(0)
+            self._event_index = EventIndex(self.events, time)
+            self._event_index_key = key
+        return self._event_index
+
+    def column_values(self, names: Sequence[str]) -> np.ndarray:
+        """
+        The given flight data columns as a (samples x columns) float64 array.
+        Columns the simulation doesn't have are filled with NaN.
+        """
+        frame = self.flight_data
+        # Only the requested columns are read, so memory mapped frames don't page in the other channels
+        result = np.empty((len(frame), len(names)))
+        for position, name in enumerate(names):
+            result[:, position] = np.asarray(frame[name], dtype=np.float64) if name in frame else np.nan
+        return result
+
+    def si_column(self, name: str) -> np.ndarray:
+        """
+        A flight data column as a float64 array in its SI unit (see `units.FLIGHT_DATA_UNITS`), e.g. the
+        air pressure of a CSV export in mbar as Pa. Columns already in that unit, or whose unit isn't known,
+        are returned as stored without copying.
+        """
+        values = np.asarray(self.flight_data[name], dtype=np.float64)
+        unit, si_unit = self.units.get(name), FLIGHT_DATA_UNITS.get(name)
+        if unit is None or si_unit is None or unit == si_unit:
+            return values
+        scale, offset = conversion(unit, si_unit)
+        return values * scale + offset
+
+    def _source_array(self, name: str) -> np.ndarray:
+        """A flight data column as stored, or a derived channel, without any conversion."""
+        if name in self.flight_data:
+            return np.asarray(self.flight_data[name])
+        if name in DERIVED_CHANNELS:
+            return self.channel(name)
+        raise KeyError(f"Unknown channel '{name}', it's neither a flight data column nor a derived channel")
+
+    def channel(self, name: str) -> np.ndarray:
+        """
+        A flight data column or a derived channel as a float64 array, e.g. `sim.channel('dynamic_pressure')`.
+        Derived channels (see `channels.DERIVED_CHANNELS`) are computed from their sources converted to SI
+        units with `si_column`, so e.g. a CSV export in °C and mbar gives the dynamic pressure in Pa. They are
+        computed once and cached, and recomputed only when one of the arrays they were computed from is
+        replaced, or a unit changes. A column always takes precedence over a derived channel of the same name.
+        The cached arrays are read-only.
+
+        Values written in place into a DataFrame (e.g. `df.loc[:, 'altitude'] = ...`) keep the same array,
+        so call `invalidate_channels()` afterwards. FlightData, the NumPy backend, notices such writes.
+        """
+        if name in self.flight_data:
+            return np.asarray(self.flight_data[name], dtype=np.float64)
+        derived = DERIVED_CHANNELS.get(name)
+        if derived is None:
+            raise KeyError(f"Unknown channel '{name}', it's neither a flight data column nor a derived channel")
+
+        sources = [self._source_array(source) for source in derived.requires]
+        # The cache keeps the source arrays alive, so their memory can't be reused by other arrays
+        # and comparing the buffers detects any replaced column
+        signature = [(s.__array_interface__['data'][0], s.shape, s.strides, s.dtype) for s in sources]
+        signature.append(getattr(self.flight_data, 'version', None))
+        signature.append([self.units.get(source) for source in derived.requires])
+        cached = self._channel_cache.get(name)
+        if cached is not None and cached[1] == signature:
+            return cached[2]
+
+        si_sources = [self.si_column(source) if source in self.flight_data else source_values
+                      for source, source_values in zip(derived.requires, sources)]
+        values = np.asarray(derived.compute(*si_sources), dtype=np.float64)
+        values.flags.writeable = False
+        self._channel_cache[name] = (sources, signature, values)
+        return values
+
+    def invalidate_channels(self) -> None:
+        """Drops the cached derived channels, e.g. after modifying flight data values in place."""
+        self._channel_cache.clear()
+
+    def events_between(self, start_time: float, end_time: float) -> List[FlightEvent]:
+        """All the events that happened between start_time and end_time (inclusive)."""
+        return self.event_index.between(start_time, end_time)
+
+    def value_at(self, column: str, event_type: Union[str, FlightEventType], occurrence: int = 0) -> float:
+        """The value of a flight data column at an event, e.g. `sim.value_at('altitude', 'apogee')`."""
+        sample = self.event_index.sample_of(event_type, occurrence)
+        return float(np.asarray(self.flight_data[column])[sample])
+
+    def _sample_for(self, position: EventOrTime, default: int) -> int:
+        """Converts an event type or a time into a sample index."""
+        if position is None:
+            return default
+        if isinstance(position, (str, FlightEventType)):
+            return self.event_index.sample_of(position)
+        time = np.asarray(self.flight_data['time'])
+        return int(min(np.searchsorted(time, position, side='left'), len(time) - 1))
+
+    def window(self, start: EventOrTime = None, end: EventOrTime = None) -> FlightDataFrame:
+        """
+        The flight data between two events or times, both ends included, e.g.
+        `sim.window('burnout', 'ejectioncharge')`. The result is a positional slice, so no data is copied.
+        """
+        start_sample = self._sample_for(start, 0)
+        end_sample = self._sample_for(end, len(self.flight_data) - 1)
+        return self.flight_data.iloc[start_sample:end_sample + 1]
+
+    def column_in(self, column: str, unit: str) -> np.ndarray:
+        """A flight data column converted to another unit, e.g. `sim.column_in('altitude', 'ft')`."""
+        if column not in self.units:
+            raise ValueError(f"The unit of column '{column}' is unknown.")
+        return convert(np.asarray(self.flight_data[column], dtype=np.float64), self.units[column], unit)
+
+    def convert_units(self, units: Dict[str, str]) -> 'Simulation':
+        """
+        A copy of the simulation with some columns converted to other units, e.g.
+        `sim.convert_units({'altitude': 'ft', 'vertical_velocity': 'ft/s'})`. Each column is one vectorized operation.
+        """
+        flight_data = self.flight_data.copy()
+        new_units = dict(self.units)
+        for column, unit in units.items():
+            if column not in self.units:
+                raise ValueError(f"The unit of column '{column}' is unknown.")
+            scale, offset = conversion(self.units[column], unit)
+            flight_data[column] = np.asarray(flight_data[column], dtype=np.float64) * scale + offset
+            new_units[column] = unit
+        return replace(self, flight_data=flight_data, units=new_units)
+
+    def resample(self, dt: float, method: str = 'linear') -> 'Simulation':
+        """
+        A copy of the simulation with the flight data on a uniform time grid with a `dt` time step,
+        from the first to the last sample. `method` is 'linear' or 'previous' (sample and hold).
+        """
+        if dt <= 0:
+            raise ValueError(f"The time step must be positive, got {dt}")
+        columns = list(self.flight_data.columns)
+        time = np.asarray(self.flight_data['time'], dtype=np.float64)
+        if len(time) == 0:
+            return replace(self, flight_data=self.flight_data.copy())
+
+        grid = time[0] + dt * np.arange(int(np.floor((time[-1] - time[0]) / dt + 1e-9)) + 1)
+        values = interpolate_columns(time, self.column_values(columns), grid, method)
+        flight_data = make_flight_data(values, columns, backend_of(self.flight_data))
+        flight_data['time'] = grid
+        return replace(self, flight_data=flight_data)
+
+    def downsample(self, num_points: int, method: str = 'lttb',
+                   columns: Optional[Sequence[str]] = None) -> 'Simulation':
+        """
+        A copy of the simulation keeping at most `num_points` samples, to plot or compare long flights.
+
+        - 'lttb' keeps the samples that best preserve the shape of the `columns`, and keeps their
+          minimum and maximum first, so peaks like apogee and max acceleration are exact. Defaults to the
+          plotted channels: altitude, velocities, accelerations and lateral distance
+        - 'stride' keeps evenly spaced samples
+        """
+        if method not in DOWNSAMPLING_METHODS:
+            raise ValueError(f"Unknown downsampling method '{method}', expected one of {DOWNSAMPLING_METHODS}")
+        num_samples = len(self.flight_data)
+        if num_points >= num_samples:
+            return replace(self, flight_data=self.flight_data.copy())
+
+        if method == 'stride':
+            indices = np.unique(np.linspace(0, num_samples - 1, num_points).round().astype(np.intp))
+        else:
+            if columns is None:
+                columns = [c for c in DISPLAY_CHANNELS if c in self.flight_data.columns]
+                columns = columns or [c for c in self.flight_data.columns if c != 'time']
+            time = np.asarray(self.flight_data['time'], dtype=np.float64)
+            values = self.column_values(columns)
+            # LTTB balances all the channels, so the exact extremes of every channel are kept first, the
+            # maxima before the minima, then the LTTB picks, the first and last samples before the others
+            has_data = ~np.isnan(values).all(axis=0)
+            extremes = np.concatenate((
+                np.nanargmax(values[:, has_data], axis=0), np.nanargmin(values[:, has_data], axis=0)
+            ))
+            picks = lttb_indices(time, values, max(num_points - len(np.unique(extremes)), 3))
+            candidates = np.concatenate((extremes, picks[[0, -1]], picks[1:-1]))
+            _, first_seen = np.unique(candidates, return_index=True)
+            indices = np.sort(candidates[np.sort(first_seen)[:num_points]])
+        if isinstance(self.flight_data, FlightData):
+            return replace(self, flight_data=self.flight_data.take(indices))
+        return replace(self, flight_data=self.flight_data.take(indices).reset_index(drop=True))
+
+    def with_backend(self, backend: str) -> 'Simulation':
+        """
+        The simulation with its flight data as a pandas DataFrame ('pandas') or a FlightData ('numpy').
+        Going from NumPy to pandas doesn't copy the data.
+        """
+        check_backend(backend)
+        is_numpy = isinstance(self.flight_data, FlightData)
+        if backend == 'numpy' and not is_numpy:
+            return replace(self, flight_data=FlightData.from_pandas(self.flight_data))
+        if backend == 'pandas' and is_numpy:
+            return replace(self, flight_data=self.flight_data.to_pandas())
+        return self
+
+    def save_columns(self, directory: str) -> None:
+        """
+        Writes the flight data as one raw float64 file per channel plus a JSON manifest,
+        so it can be reopened later with `Simulation.open_columns` without decoding the XML again.
+        """
+        # Imported here as the column store depends on this module
+        from .column_store import save_columns
+        save_columns(self, directory)
+
+    @classmethod
+    def open_columns(cls, directory: str, mmap: bool = True, backend: str = 'pandas') -> 'Simulation':
+        """
+        Opens a simulation saved with `save_columns`. When `mmap` is enabled the channels are
+        memory-mapped, so only the channels that are accessed are read from disk.
+        """
+        from .column_store import open_columns
+        return open_columns(directory, mmap=mmap, backend=backend)
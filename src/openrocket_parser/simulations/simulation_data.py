@@ -3,6 +3,11 @@ Simulation Data depends on a list of events from OpenRocket.
 The timed events are used within the library as pandas dataframes
 """
 from dataclasses import dataclass
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+from openrocket_parser.enums import FlightEventType
 
 
 @dataclass
@@ -11,3 +16,68 @@ class FlightEvent:
     time: float
     type: str
     source: str = None
+
+
+def normalize_event_type(event_type: Union[str, FlightEventType]) -> str:
+    """Returns the type as written in OpenRocket files, so 'APOGEE' and FlightEventType.APOGEE both work."""
+    if isinstance(event_type, FlightEventType):
+        return event_type.value
+    return str(event_type).strip().lower()
+
+
+class EventIndex:
+    """
+    Time-sorted arrays of the flight events, with every event aligned to the first flight data sample
+    at or after it. Lookups by type and time are dictionary and binary searches instead of list scans.
+    """
+
+    def __init__(self, events: List[FlightEvent], time: np.ndarray):
+        order = sorted(range(len(events)), key=lambda i: events[i].time)
+        self.events: List[FlightEvent] = [events[i] for i in order]
+        self.times = np.array([evt.time for evt in self.events], dtype=np.float64)
+        self.types = np.array([normalize_event_type(evt.type) for evt in self.events], dtype=object)
+
+        time = np.asarray(time, dtype=np.float64)
+        self.num_samples = len(time)
+        if self.num_samples:
+            self.samples = np.minimum(np.searchsorted(time, self.times, side='left'), self.num_samples - 1)
+        else:
+            self.samples = np.full(len(self.times), -1, dtype=np.intp)
+
+        self._by_type: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for event_type in dict.fromkeys(self.types):
+            positions = np.flatnonzero(self.types == event_type)
+            self._by_type[event_type] = (self.times[positions], self.samples[positions])
+
+    def __contains__(self, event_type) -> bool:
+        return normalize_event_type(event_type) in self._by_type
+
+    def times_of(self, event_type: Union[str, FlightEventType]) -> np.ndarray:
+        """All the times of the given event type, in order. Empty if the event never happened."""
+        return self._by_type.get(normalize_event_type(event_type), (np.empty(0), None))[0]
+
+    def samples_of(self, event_type: Union[str, FlightEventType]) -> np.ndarray:
+        """The sample indices of all the events of the given type, in order."""
+        return self._by_type.get(normalize_event_type(event_type), (None, np.empty(0, dtype=np.intp)))[1]
+
+    def time_of(self, event_type: Union[str, FlightEventType], occurrence: int = 0) -> float:
+        """The time of the n-th occurrence of the event. Raises KeyError if there is no such event."""
+        times = self.times_of(event_type)
+        if not -len(times) <= occurrence < len(times):
+            raise KeyError(f"No occurrence {occurrence} of event '{normalize_event_type(event_type)}'")
+        return float(times[occurrence])
+
+    def sample_of(self, event_type: Union[str, FlightEventType], occurrence: int = 0) -> int:
+        """The sample index of the n-th occurrence of the event. Raises KeyError if there is no such event."""
+        samples = self.samples_of(event_type)
+        if not -len(samples) <= occurrence < len(samples):
+            raise KeyError(f"No occurrence {occurrence} of event '{normalize_event_type(event_type)}'")
+        if self.num_samples == 0:
+            raise ValueError("The simulation has no flight data to align the events with.")
+        return int(samples[occurrence])
+
+    def between(self, start_time: float, end_time: float) -> List[FlightEvent]:
+        """All the events with start_time <= time <= end_time."""
+        start = np.searchsorted(self.times, start_time, side='left')
+        end = np.searchsorted(self.times, end_time, side='right')
+        return self.events[start:end]
@@ -0,0 +1,11 @@
+"""
+Command line tools built on the library
+"""
+import logging
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """Sets up the console logging of the command line tools. The library itself never configures logging."""
+    logging.basicConfig(level=level, format=LOG_FORMAT)
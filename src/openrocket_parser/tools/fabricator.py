@@ -3,6 +3,7 @@ import argparse
 from kivymd.app import MDApp
 from kivy.uix.screenmanager import ScreenManager
 
+from openrocket_parser.tools import configure_logging
 from openrocket_parser.tools.fabricator_tool.main_screen import MainScreen
 from openrocket_parser.tools.fabricator_tool.settings_screen import SettingsScreen
 from openrocket_parser.units import METERS_TO_INCHES
@@ -40,6 +41,7 @@ def main():
     parser = argparse.ArgumentParser(description="Generate 2D files from OpenRocket components for fabrication.")
     _ = parser.parse_args()
 
+    configure_logging()
     logging.info(f"Opening fabricator...")
     FabricatorApp().run()
 
@@ -78,7 +78,7 @@ def _convert_units(meters):
     app = App.get_running_app()
     conversion = app.settings.get('unit_conversion', METERS_TO_INCHES)
     # logging.info(f"Converting {meters}m with factor {conversion}")
-    return (meters or 0.0) * conversion
+    return (0.0 if meters is None else meters) * conversion
 
 
 def _extract_fin_data(comp, name):
@@ -0,0 +1,227 @@
+"""
+A Tool rendering a static report sheet for every simulation of a set of OpenRocket files
+
+Each sheet has the layout of the flight visualizer showing the whole flight, with the flight events marked.
+Files are rendered in parallel by a process pool, every worker reusing one Agg figure, and a cache in the
+output directory remembers the content hash of every file, so only new or modified designs are rendered again.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from openrocket_parser.document import OrkDocument
+from openrocket_parser.simulations.loader import XmlSimulationLoader
+from openrocket_parser.tools import configure_logging
+from openrocket_parser.tools.visualizer_tool.figure import FlightFigure
+from openrocket_parser.tools.visualizer_tool.series import FlightSeries
+
+REPORT_FORMATS = ('png', 'svg', 'pdf')
+CACHE_FILE = '.report-cache.json'
+# Bumped whenever the sheets change, so cached reports are rendered again
+REPORT_VERSION = 1
+
+# The figure of the current worker process, created once and cleared for every sheet
+_FIGURE: Optional[Figure] = None
+
+
+def find_ork_files(paths: Sequence[str]) -> List[Tuple[str, str]]:
+    """
+    The .ork files among the paths, directories being searched recursively, as (path, name) pairs
+    where the name is the path relative to the searched directory, without extension.
+    """
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, files in os.walk(path):
+                for file in sorted(files):
+                    if file.lower().endswith('.ork'):
+                        file_path = os.path.join(directory, file)
+                        found.append((file_path, os.path.splitext(os.path.relpath(file_path, path))[0]))
+        elif os.path.isfile(path):
+            found.append((path, os.path.splitext(os.path.basename(path))[0]))
+        else:
+            logging.error(f"{path} doesn't exist, skipping it.")
+    return sorted(found, key=lambda item: item[1])
+
+
+def file_hash(file_path: str) -> str:
+    """SHA-256 of the file content."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _safe_name(name: str) -> str:
+    return re.sub(r'[^\w.-]+', '_', name).strip('_') or 'simulation'
+
+
+def _init_worker(dpi: int) -> None:
+    global _FIGURE
+    _FIGURE = Figure(figsize=(12, 8), dpi=dpi)
+    FigureCanvasAgg(_FIGURE)
+
+
+def render_report(file_path: str, name: str, output_dir: str, formats: Sequence[str] = ('png',)) -> List[str]:
+    """
+    Renders one sheet per simulation of an .ork file, in each format, as `output_dir/name/<n>-<simulation>.<format>`,
+    `n` being the 1-based position of the simulation in the file. Returns the paths written, none for a design
+    without simulations. Raises ValueError if the file can't be parsed, or none of its simulations could be loaded.
+    """
+    if _FIGURE is None:
+        _init_worker(100)
+    # The file is decompressed and parsed once for all its simulations
+    document = OrkDocument.open(file_path)
+    simulations_element = document.root.find('.//simulations')
+    count = 0 if simulations_element is None else len(simulations_element.findall('./simulation'))
+    if not count:
+        return []
+    loaded = XmlSimulationLoader(simulations_element, backend='numpy').load_indexed()
+    if not loaded:
+        raise ValueError(f"None of the {count} simulations could be loaded")
+    directory = os.path.join(output_dir, name)
+    os.makedirs(directory, exist_ok=True)
+
+    outputs = []
+    for position, sim in loaded:
+        _FIGURE.clear()
+        series = FlightSeries(sim)
+        flight_figure = FlightFigure(series, _FIGURE)
+        flight_figure.mark_events(sim.events)
+        flight_figure.update(len(series) - 1)
+        _FIGURE.suptitle(f"{os.path.basename(name)}: {sim.name}", fontsize=16, y=0.99)
+        for report_format in formats:
+            output = os.path.join(directory, f"{position + 1}-{_safe_name(sim.name)}.{report_format}")
+            _FIGURE.savefig(output, format=report_format)
+            outputs.append(output)
+    return outputs
+
+
+def _render_job(file_path: str, name: str, output_dir: str, formats: Sequence[str]) -> Optional[List[str]]:
+    """Renders a file in a worker. A broken file is reported and doesn't stop the other ones."""
+    try:
+        return render_report(file_path, name, output_dir, formats)
+    except Exception as e:
+        logging.error(f"Could not render {file_path}: {e}")
+        return None
+
+
+def _load_cache(output_dir: str) -> Dict[str, dict]:
+    try:
+        with open(os.path.join(output_dir, CACHE_FILE), 'r', encoding='utf-8') as cache_file:
+            return json.load(cache_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(output_dir: str, cache: Dict[str, dict]) -> None:
+    path = os.path.join(output_dir, CACHE_FILE)
+    with open(path + '.tmp', 'w', encoding='utf-8') as cache_file:
+        json.dump(cache, cache_file, indent=1, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+def generate_reports(paths: Sequence[str], output_dir: str, formats: Sequence[str] = ('png',),
+                     workers: Optional[int] = None, dpi: int = 100, force: bool = False) -> Dict[str, List[str]]:
+    """
+    Renders the report sheets of every .ork file found in the paths into `output_dir`.
+    Files whose content and report settings haven't changed since the last run are skipped, unless `force`.
+    Returns the sheets rendered in this run, by file. Designs without simulations are cached with no sheets.
+    Files that fail are logged, left out of the result and not cached.
+    """
+    for report_format in formats:
+        if report_format not in REPORT_FORMATS:
+            raise ValueError(f"Unknown report format '{report_format}', expected one of {REPORT_FORMATS}")
+    os.makedirs(output_dir, exist_ok=True)
+    cache = _load_cache(output_dir)
+    settings = {'version': REPORT_VERSION, 'formats': sorted(formats), 'dpi': dpi}
+
+    jobs = []
+    for file_path, name in find_ork_files(paths):
+        digest = file_hash(file_path)
+        entry = cache.get(name)
+        if (not force and entry and entry.get('hash') == digest and entry.get('settings') == settings
+                and all(os.path.exists(output) for output in entry.get('outputs', []))):
+            continue
+        jobs.append((file_path, name, digest))
+    logging.info(f"Rendering {len(jobs)} file(s), the others are up to date.")
+
+    rendered = {}
+    failed = []
+
+    def done(name, digest, outputs):
+        if outputs is None:
+            # Not cached, so the file is tried again on the next run
+            cache.pop(name, None)
+            failed.append(name)
+            return
+        rendered[name] = outputs
+        cache[name] = {'hash': digest, 'settings': settings, 'outputs': outputs}
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs) or 1))
+    if workers == 1:
+        _init_worker(dpi)
+        for file_path, name, digest in jobs:
+            done(name, digest, _render_job(file_path, name, output_dir, formats))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(dpi,)) as pool:
+            futures = {pool.submit(_render_job, file_path, name, output_dir, formats): (name, digest)
+                       for file_path, name, digest in jobs}
+            for future in as_completed(futures):
+                done(*futures[future], future.result())
+
+    _save_cache(output_dir, cache)
+    if failed:
+        logging.error(f"Could not render {len(failed)} file(s): {', '.join(sorted(failed))}")
+    return rendered
+
+
+def main():
+    """Main function to parse arguments and render the reports."""
+    parser = argparse.ArgumentParser(description="Render a report sheet for every simulation of OpenRocket files.")
+    parser.add_argument("paths", nargs='+', help="OpenRocket (.ork) files, or directories searched for them.")
+    parser.add_argument(
+        "--output-dir",
+        default="reports",
+        help="Directory receiving the sheets, one sub-directory per file. Default is ./reports.",
+    )
+    parser.add_argument(
+        "--format",
+        nargs='+',
+        choices=REPORT_FORMATS,
+        default=['png'],
+        dest="formats",
+        help="Formats of the sheets. Default is png.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of processes rendering the sheets. Default is the number of cores.",
+    )
+    parser.add_argument("--dpi", type=int, default=100, help="Resolution of the PNG sheets. Default is 100.")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Render every file again, even the ones that haven't changed since the last run.",
+    )
+
+    args = parser.parse_args()
+    configure_logging()
+
+    rendered = generate_reports(args.paths, args.output_dir, args.formats, args.workers, args.dpi, args.force)
+    print(f"Rendered {sum(len(outputs) for outputs in rendered.values())} sheet(s) "
+          f"from {len(rendered)} file(s) into {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,218 +1,122 @@
 """
 A Tool designed to visualize the simulation results from OpenRocket
+
+Only the simulations picked on the command line are decoded, and matplotlib is imported once
+drawing starts, so listing the simulations or a mistyped argument returns immediately.
+With `--live`, telemetry received on a UDP port or a FIFO is drawn as it arrives instead.
 """
 import argparse
-import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
 
+from openrocket_parser.simulations.live import listen
 from openrocket_parser.simulations.loader import load_simulations_from_xml
-
-
-def visualize_flight(sim_data, speed_multiplier=1.0, repeat=True):
+from openrocket_parser.simulations.scan import list_simulations
+from openrocket_parser.tools import configure_logging
+from openrocket_parser.tools.visualizer_tool.controls import PlaybackControls, describe_keys
+from openrocket_parser.tools.visualizer_tool.figure import FlightFigure
+from openrocket_parser.tools.visualizer_tool.html_export import export_html
+from openrocket_parser.tools.visualizer_tool.live import LiveFlightView
+from openrocket_parser.tools.visualizer_tool.playback import PlaybackClock
+from openrocket_parser.tools.visualizer_tool.render import render_flight
+from openrocket_parser.tools.visualizer_tool.series import FlightSeries
+
+
+def sim_numbers(text):
+    """Parses a comma separated list of 1-based simulation numbers, e.g. '1,3,5'."""
+    try:
+        numbers = [int(part) for part in text.split(',') if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{text}' is not a comma separated list of simulation numbers")
+    if not numbers or any(number <= 0 for number in numbers):
+        raise argparse.ArgumentTypeError("Simulation numbers start at 1")
+    # Duplicates are dropped, the order is kept
+    return list(dict.fromkeys(numbers))
+
+
+def visualize_flight(sim_data, speed_multiplier=1.0, repeat=True, fps=60.0, three_d=False):
     """
-    Creates and runs the matplotlib animation for the flight data.
+    Creates and runs the matplotlib animation for the flight data of a simulation, or of a list of
+    simulations overlaid on the same axes with a common time base. With `three_d`, the trajectory
+    is drawn in 3-D, east and north of the launch site, with the landing points of all the simulations.
+    The plotted channels are extracted once, and every frame only draws prefix slices of them.
+    The sample drawn at each tick follows the wall clock, so frames are dropped when drawing falls behind.
+    The timeline under the plots and the keyboard move the playback to any time, see `controls.KEYS`.
     """
-    df = sim_data.flight_data
-
-    # --- 1. SET UP THE PLOT LAYOUT ---
-    fig = plt.figure(figsize=(12, 8))
-    gs = fig.add_gridspec(3, 2)  # 3 rows, 2 columns
-
-    # Main trajectory plot
-    # @TODO Make the titles customizable through a config file
-    ax_traj = fig.add_subplot(gs[:, 0])  # Spans all rows, first column
-    ax_traj.set_title("Flight Trajectory")
-    ax_traj.set_xlabel("Downrange (m)")
-    ax_traj.set_ylabel("Altitude (m)")
-    ax_traj.grid(True)
-    ax_traj.set_aspect('equal', adjustable='box')
-
-    # Time series plots
-    ax_alt = fig.add_subplot(gs[0, 1])  # Top-right
-    ax_alt.set_title("Altitude vs. Time")
-    ax_alt.set_ylabel("Altitude (m)")
-    ax_alt.grid(True)
-
-    ax_vel = fig.add_subplot(gs[1, 1])  # Middle-right
-    ax_vel.set_title("Vertical Velocity vs. Time")
-    ax_vel.set_ylabel("Velocity (m/s)")
-    ax_vel.grid(True)
-
-    ax_acc = fig.add_subplot(gs[2, 1])  # Bottom-right
-    ax_acc.set_title("Vertical Acceleration vs. Time")
-    ax_acc.set_xlabel("Time (s)")
-    ax_acc.set_ylabel("Acceleration (m/s²)")
-    ax_acc.grid(True)
-
-    fig.tight_layout(pad=3.0)
-    fig.suptitle(f"Flight Playback: {sim_data.name}", fontsize=16, y=0.99)
-
-    ## --- INITIALIZE MAX VALUE TRACKERS ---
-    max_values = {
-        "alt": -float('inf'),
-        "vel": -float('inf'),
-        "acc": -float('inf'),
-    }
-
-    # --- 2. INITIALIZE PLOT ELEMENTS TO BE ANIMATED ---
-    # Trajectory path line
-    traj_line, = ax_traj.plot([], [], 'b-')  # Blue line for the path @TODO make this customizable
-    # Rocket marker @TODO Make customizable
-    rocket_marker, = ax_traj.plot([], [], 'r^', markersize=10, label='Rocket')
-    ax_traj.legend()
-
-    # Time series lines
-    alt_line, = ax_alt.plot([], [], 'g-')
-    vel_line, = ax_vel.plot([], [], 'm-')
-    acc_line, = ax_acc.plot([], [], 'c-')
-
-    # Add a text annotation for live data
-    live_text = ax_traj.text(
-        0.05, 0.95, '',
-        transform=ax_traj.transAxes,
-        verticalalignment='top'
-    )
-
-    alt_max_text = ax_alt.text(
-        0.98, 0.95, '',
-        transform=ax_alt.transAxes,
-        ha='right', va='top', color='g'
-    )
-    vel_max_text = ax_vel.text(
-        0.98, 0.95, '',
-        transform=ax_vel.transAxes,
-        ha='right', va='top', color='m'
-    )
-    acc_max_text = ax_acc.text(
-        0.98, 0.95, '',
-        transform=ax_acc.transAxes,
-        ha='right', va='top', color='c'
-    )
-
-    # --- 3. DEFINE ANIMATION LOGIC ---
-    # The time step in the data (e.g., 0.01s)
-    data_time_step = df['time'].diff().mean()
-    # How many data points to jump per animation frame
-    frame_step = int(speed_multiplier) if speed_multiplier >= 1 else 1
-    # Delay between animation frames in milliseconds
-    if speed_multiplier > 0:
-        frame_interval = max(
-            (data_time_step / speed_multiplier) * 1000 * frame_step,
-            1  # If the interval is less than 1, force it to one as pandas needs positive intervals
-        )
-    else:
-        frame_interval = 0
+    import matplotlib.pyplot as plt
+    from matplotlib.animation import FuncAnimation
+
+    sims = sim_data if isinstance(sim_data, (list, tuple)) else [sim_data]
+    flight_figure = FlightFigure([FlightSeries(sim) for sim in sims], three_d=three_d)
+    flight_figure.mark_events()
+    # Without repeat, the playback pauses on the landing so it can still be scrubbed
+    clock = PlaybackClock(flight_figure.timeline, speed_multiplier, loop=repeat)
+    controls = PlaybackControls(flight_figure, clock)
 
     def init():
-        """Initializes the plot for the animation."""
-        # Set plot limits based on the full dataset
-        ax_traj.set_xlim(0, df['lateral_distance'].max() * 1.1)
-        ax_traj.set_ylim(0, df['altitude'].max() * 1.1)
-
-        ax_alt.set_xlim(0, df['time'].max())
-        ax_alt.set_ylim(df['altitude'].min(), df['altitude'].max() * 1.1)
-
-        ax_vel.set_xlim(0, df['time'].max())
-        ax_vel.set_ylim(
-            df['vertical_velocity'].min() * 1.1,
-            df['vertical_velocity'].max() * 1.1
-        )
-
-        ax_acc.set_xlim(0, df['time'].max())
-        ax_acc.set_ylim(
-            df['vertical_acceleration'].min() * 1.1,
-            df['vertical_acceleration'].max() * 1.1
-        )
-
-        # Reset all lines and text
-        traj_line.set_data([], [])
-        rocket_marker.set_data([], [])
-        alt_line.set_data([], [])
-        vel_line.set_data([], [])
-        acc_line.set_data([], [])
-        live_text.set_text('')
-
-        return (traj_line, rocket_marker, alt_line, vel_line, acc_line, live_text,
-                alt_max_text, vel_max_text, acc_max_text)
-
-    def update(frame_index):
-        """Called for each frame of the animation."""
-        # Get the current slice of data based on the frame index
-        current_index = frame_index * frame_step
-        if current_index >= len(df):
-            current_index = len(df) - 1
-
-        current_time = df['time'].iloc[current_index]
-        data_slice = df[df['time'] <= current_time]
-
-        # Update trajectory plot
-        traj_line.set_data(data_slice['lateral_distance'], data_slice['altitude'])
-        plot_data = [
-            [df['lateral_distance'].iloc[current_index]],
-            [df['altitude'].iloc[current_index]]
-        ]
-        rocket_marker.set_data(plot_data)
-
-        # Update time series plots
-        alt_line.set_data(data_slice['time'], data_slice['altitude'])
-        vel_line.set_data(data_slice['time'], data_slice['vertical_velocity'])
-        acc_line.set_data(data_slice['time'], data_slice['vertical_acceleration'])
-
-        # Update text annotation
-        text_str = (
-            f"Time: {current_time:.2f} s\n"
-            f"Altitude: {df['altitude'].iloc[current_index]:.1f} m\n"
-            f"Velocity: {df['vertical_velocity'].iloc[current_index]:.1f} m/s"
-        )
-        live_text.set_text(text_str)
-
-        current_alt = df['altitude'].iloc[current_index]
-        if current_alt > max_values["alt"]:
-            max_values["alt"] = current_alt
-            alt_max_text.set_text(f'Max: {max_values["alt"]:.1f} m')
-
-        current_vel = df['vertical_velocity'].iloc[current_index]
-        if current_vel > max_values["vel"]:
-            max_values["vel"] = current_vel
-            vel_max_text.set_text(f'Max: {max_values["vel"]:.1f} m/s')
-
-        current_acc = df['vertical_acceleration'].iloc[current_index]
-        if current_acc > max_values["acc"]:
-            max_values["acc"] = current_acc
-            acc_max_text.set_text(f'Max: {max_values["acc"]:.1f} m/s²')
-
-        # Technically this is mandatory according to matplot
-        # lib to keep animations from being collected by the python GC
-        return (traj_line, rocket_marker, alt_line, vel_line, acc_line, live_text,
-                alt_max_text, vel_max_text, acc_max_text)
-
-    # --- 4. RUN THE ANIMATION ---
-    # Calculate the total number of frames needed
-    num_frames = len(df) // frame_step
-
-    # This is necessary to keep python's garbage collector from claiming the animation
+        return flight_figure.reset() + controls.artists
+
+    def update(index):
+        return flight_figure.update(index) + controls.update(index)
+
+    # This is necessary to keep python's garbage collector from claiming the animation.
+    # Blitting only redraws the animated artists over the cached static axes.
     ani = FuncAnimation(
-        fig,
+        flight_figure.figure,
         update,
-        frames=num_frames,
+        frames=clock.frames,
         init_func=init,
-        blit=False,
-        interval=frame_interval,
-        repeat=repeat
+        blit=True,
+        # Ticks at most `fps` times per second, the tick itself picks the sample to show
+        interval=1000 / fps,
+        repeat=True,
+        cache_frame_data=False,
     )
 
     plt.show()
+    return ani
+
+
+def visualize_live(source, columns=None, binary_dtype=None, capacity=100_000, fps=30.0):
+    """
+    Draws telemetry received on `udp://host:port` or read from a FIFO as it arrives, until the window
+    is closed. The last `capacity` rows are kept and redrawn at most `fps` times per second.
+    """
+    import matplotlib.pyplot as plt
+
+    stream = listen(source, columns, capacity, binary_dtype=binary_dtype, backend='numpy')
+    try:
+        view = LiveFlightView(stream)
+        view.start(fps)
+        plt.show()
+    finally:
+        stream.close()
+    return view
 
 
 def main():
     """Main function to parse arguments and launch the visualizer."""
-    parser = argparse.ArgumentParser(description="Animate OpenRocket flight simulation data tool.")
-    parser.add_argument("file", help="Path to the OpenRocket (.ork) file.")
-    parser.add_argument(
+    parser = argparse.ArgumentParser(
+        description="Animate OpenRocket flight simulation data tool.",
+        epilog=f"Playback keys:\n{describe_keys()}\nClick or drag on the timeline to move to any time.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("file", nargs='?', help="Path to the OpenRocket (.ork) file.")
+    selection = parser.add_mutually_exclusive_group()
+    selection.add_argument(
         "--sim",
-        type=int,
-        default=1,
-        help="The simulation number to visualize (1-based index). Default is 1.",
+        type=sim_numbers,
+        default=[1],
+        help="The simulation number to visualize (1-based index), or a comma separated list of "
+             "simulations to overlay (e.g., 1,3,5). Default is 1.",
+    )
+    selection.add_argument(
+        "--all",
+        action="store_true",
+        help="Overlay all the simulations of the file.",
+    )
+    selection.add_argument(
+        "--list",
+        action="store_true",
+        help="List the simulations of the file and exit.",
     )
     parser.add_argument(
         "--speed",
@@ -230,25 +134,123 @@ def main():
         dest="repeat",
         help="Disable the animation from repeating when it finishes.",
     )
+    parser.add_argument(
+        "--output",
+        help="Render the playback without a display instead: a .mp4 video (requires ffmpeg), a .gif "
+             "animation, or a directory of PNG frames for any other path.",
+    )
+    parser.add_argument(
+        "--3d",
+        action="store_true",
+        dest="three_d",
+        help="Draw the trajectory in 3-D, east and north of the launch site, with the landing points of "
+             "all the simulations.",
+    )
+    parser.add_argument(
+        "--export-html",
+        metavar="FILE",
+        help="Write the playback to a standalone HTML page instead, with the flights downsampled, "
+             "to zoom and scrub in a browser.",
+    )
+    parser.add_argument(
+        "--fps",
+        type=float,
+        default=30.0,
+        help="Frame rate of the rendered output, or maximum redraw rate of the live view. Default is 30.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of processes rendering the output. Default is the number of cores.",
+    )
+
+    live = parser.add_argument_group("live telemetry")
+    live.add_argument(
+        "--live",
+        metavar="SOURCE",
+        help="Draw telemetry as it arrives instead of a file: udp://host:port, or the path of a FIFO. "
+             "Frames are CSV lines, or packed binary records with --binary.",
+    )
+    live.add_argument(
+        "--columns",
+        type=lambda text: [name.strip() for name in text.split(',') if name.strip()],
+        help="Comma separated names of the telemetry columns, e.g. time,altitude,vertical_velocity. "
+             "Required for binary frames, CSV telemetry can send a header line instead.",
+    )
+    live.add_argument(
+        "--binary",
+        metavar="DTYPE",
+        help="Type of every value of binary frames, as a NumPy dtype, e.g. '<f4' or '<f8'.",
+    )
+    live.add_argument(
+        "--capacity",
+        type=int,
+        default=100_000,
+        help="Number of telemetry rows kept and drawn. Default is 100000.",
+    )
 
     args = parser.parse_args()
+    configure_logging()
+
+    if args.live:
+        if args.fps <= 0 or args.capacity < 1:
+            print("Error: The frame rate and the capacity must be positive.")
+            return
+        if args.binary and not args.columns:
+            print("Error: --columns is required with --binary.")
+            return
+        print(f"Listening to {args.live}...")
+        try:
+            visualize_live(args.live, args.columns, args.binary, args.capacity, args.fps)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Error: Could not receive telemetry from {args.live}: {e}")
+        return
+    if args.file is None:
+        parser.error("the file is required, unless --live is given")
 
-    # Load data using our library
-    print(f"Loading simulations from {args.file}...")
-    sims = load_simulations_from_xml(args.file)
+    if args.speed <= 0:
+        print("Error: The playback speed must be positive.")
+        return
 
-    if not sims:
+    # The simulation headers are read without decoding any flight data
+    headers = list_simulations(args.file)
+    if not headers:
         print("Error: No simulations found in the specified file.")
         return
 
-    if args.sim <= 0 or args.sim > len(sims):
-        print(f"Error: Invalid simulation number. Please choose between 1 and {len(sims)}.")
+    if args.list:
+        for header in headers:
+            apogee = f" (apogee {header['maxaltitude']:.1f} m)" if 'maxaltitude' in header else ''
+            print(f"{header['index'] + 1}: {header['name']}{apogee}")
         return
 
-    selected_sim = sims[args.sim - 1]
+    numbers = range(1, len(headers) + 1) if args.all else args.sim
+    if any(number > len(headers) for number in numbers):
+        print(f"Error: Invalid simulation number. Please choose between 1 and {len(headers)}.")
+        return
+
+    # Load data using our library, only the flight data of the selected simulations is decoded
+    print(f"Loading simulations from {args.file}...")
+    selected_sims = load_simulations_from_xml(args.file, backend='numpy', indices=[n - 1 for n in numbers])
+    if not selected_sims:
+        print("Error: The selected simulations have no flight data.")
+        return
+    names = ', '.join(f"'{sim.name}'" for sim in selected_sims)
+
+    if args.export_html:
+        if export_html(selected_sims, args.export_html):
+            print(f"Saved {names} to {args.export_html}")
+    if args.output:
+        print(f"Rendering {names} at {args.speed}x speed to {args.output}...")
+        if render_flight(selected_sims, args.output, fps=args.fps, speed=args.speed, workers=args.workers,
+                         three_d=args.three_d):
+            print(f"Saved {args.output}")
+    if args.export_html or args.output:
+        return
 
-    print(f"Starting visualization for '{selected_sim.name}' at {args.speed}x speed.")
-    visualize_flight(selected_sim, args.speed, args.repeat)
+    print(f"Starting visualization for {names} at {args.speed}x speed.")
+    visualize_flight(selected_sims, args.speed, args.repeat, three_d=args.three_d)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,3 @@
+"""
+Building blocks of the flight visualizer: the flight data extracted as arrays, and the figure drawing them
+"""
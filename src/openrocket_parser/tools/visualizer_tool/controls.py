@@ -0,0 +1,115 @@
+"""
+Interactive controls of the flight playback: a timeline to scrub with the mouse, and keyboard shortcuts.
+
+Seeking only moves the playback clock, the next animation frame draws the new position from the
+precomputed arrays and running maxima, so jumping anywhere in the flight costs the same as playing it.
+"""
+import numpy as np
+
+from .figure import FlightFigure
+from .playback import PlaybackClock
+
+# Key: description, shown by `describe_keys`
+KEYS = {
+    'space': 'pause / resume',
+    'left / right': '1 s backward / forward',
+    'shift+left / shift+right': '10 s backward / forward',
+    'p / n': 'previous / next event',
+    'home / end': 'start / end of the flight',
+}
+
+
+def describe_keys() -> str:
+    return '\n'.join(f"  {key:<26}{description}" for key, description in KEYS.items())
+
+
+class PlaybackControls:
+    """
+    A timeline under the plots, with the flight events marked, and keyboard shortcuts moving the
+    playback of a `FlightFigure` driven by a `PlaybackClock`. `artists` are drawn by the animation.
+    """
+
+    def __init__(self, flight_figure: FlightFigure, clock: PlaybackClock):
+        self.flight_figure = flight_figure
+        self.clock = clock
+        series = clock.series
+        self.start_time = float(series.time[0]) if len(series) else 0.0
+        self.event_times = series.event_times
+        figure = flight_figure.figure
+
+        # Room for the timeline under the plots
+        flight_figure.gridspec.update(bottom=0.16)
+        self.ax_timeline = figure.add_axes((0.08, 0.03, 0.88, 0.035))
+        self.ax_timeline.set_xlim(self.start_time, self.start_time + max(series.duration, 1e-9))
+        self.ax_timeline.set_yticks([])
+        self.ax_timeline.tick_params(axis='x', labelsize='small')
+        self.ax_timeline.set_navigate(False)
+        for event_time in self.event_times:
+            self.ax_timeline.axvline(event_time, color='0.4', linestyle=':', linewidth=0.8)
+        self.cursor = self.ax_timeline.axvline(self.start_time, color='r', linewidth=2)
+
+        self._dragging = False
+        canvas = figure.canvas
+        # The default shortcuts use the arrows and 'p' for the view history and panning
+        manager = getattr(canvas, 'manager', None)
+        if manager is not None and getattr(manager, 'key_press_handler_id', None) is not None:
+            canvas.mpl_disconnect(manager.key_press_handler_id)
+        canvas.mpl_connect('key_press_event', self.on_key)
+        canvas.mpl_connect('button_press_event', self.on_press)
+        canvas.mpl_connect('motion_notify_event', self.on_motion)
+        canvas.mpl_connect('button_release_event', self.on_release)
+
+    @property
+    def artists(self):
+        return (self.cursor,)
+
+    def update(self, index: int):
+        """Moves the timeline cursor to the time of the sample `index`."""
+        series = self.clock.series
+        if len(series):
+            position = series.time[min(max(int(index), 0), len(series) - 1)]
+            self.cursor.set_xdata([position, position])
+        return self.artists
+
+    def seek_event(self, direction: int) -> None:
+        """Moves to the next (direction 1) or previous (direction -1) flight event."""
+        now = self.start_time + self.clock.flight_time
+        if direction > 0:
+            position = np.searchsorted(self.event_times, now + 1e-6, side='right')
+        else:
+            position = np.searchsorted(self.event_times, now - 1e-6, side='left') - 1
+        if 0 <= position < len(self.event_times):
+            self.clock.seek(self.event_times[position] - self.start_time)
+
+    def on_key(self, event) -> None:
+        clock = self.clock
+        actions = {
+            ' ': clock.toggle,
+            'left': lambda: clock.step(-1.0),
+            'right': lambda: clock.step(1.0),
+            'shift+left': lambda: clock.step(-10.0),
+            'shift+right': lambda: clock.step(10.0),
+            'p': lambda: self.seek_event(-1),
+            'n': lambda: self.seek_event(1),
+            'home': lambda: clock.seek(0.0),
+            'end': lambda: clock.seek(clock.series.duration),
+        }
+        action = actions.get(event.key)
+        if action is not None:
+            action()
+
+    def _seek_to(self, event) -> None:
+        if event.xdata is not None:
+            self.clock.seek(event.xdata - self.start_time)
+
+    def on_press(self, event) -> None:
+        if event.inaxes is self.ax_timeline and event.button == 1:
+            self._dragging = True
+            self._seek_to(event)
+
+    def on_motion(self, event) -> None:
+        if self._dragging and event.inaxes is self.ax_timeline:
+            self._seek_to(event)
+
+    def on_release(self, event) -> None:
+        self._dragging = False
@@ -0,0 +1,372 @@
+"""
+The four panel flight figure: trajectory, altitude, vertical velocity and vertical acceleration.
+
+The layout, axis limits and every animated artist are created once. Drawing a playback position only
+hands prefix slices of the precomputed arrays to the artists, so a frame costs the same at the start
+and at the end of a long flight, and the figure can be animated with blitting. Several simulations
+can be overlaid on the same axes, each with its own set of artists, on a common time base.
+The trajectory can be drawn in 3-D instead, east and north of the launch site, from decimated paths
+so the cost of a frame doesn't depend on the length of the flights nor on how many are overlaid.
+"""
+import warnings
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+
+from openrocket_parser.enums import FlightEventType
+from openrocket_parser.simulations.resampling import lttb_indices
+from openrocket_parser.simulations.simulation_data import FlightEvent, normalize_event_type
+from .series import FlightSeries, common_timeline
+
+# Line styles of a single simulation: trajectory, rocket marker, altitude, velocity, acceleration
+# @TODO make this customizable
+SINGLE_STYLES = ('b-', 'r^', 'g-', 'm-', 'c-')
+
+# Points of the 3-D paths of all the simulations together, split between them
+PATH_POINTS = 20_000
+# Fewest points of the 3-D path of a simulation, however many are overlaid
+MIN_PATH_POINTS = 100
+# Above this many overlaid simulations, e.g. a Monte Carlo ensemble, the per-simulation labels and
+# the legend are left out: they wouldn't fit, and drawing their text would dominate the frame time
+ENSEMBLE_SIZE = 10
+
+# Short labels of the event markers, other event types are labelled with their type
+EVENT_LABELS = {
+    FlightEventType.LAUNCH: 'Launch',
+    FlightEventType.IGNITION: 'Ignition',
+    FlightEventType.LIFTOFF: 'Liftoff',
+    FlightEventType.LAUNCH_ROD: 'Rod clear',
+    FlightEventType.BURNOUT: 'Burnout',
+    FlightEventType.EJECTION_CHARGE: 'Ejection',
+    FlightEventType.STAGE_SEPARATION: 'Separation',
+    FlightEventType.APOGEE: 'Apogee',
+    FlightEventType.RECOVERY_DEVICE_DEPLOYMENT: 'Deployment',
+    FlightEventType.GROUND_HIT: 'Landing',
+    FlightEventType.SIMULATION_END: 'End',
+}
+
+
+def _nanmin(values: np.ndarray) -> float:
+    return float(np.nanmin(values)) if len(values) else np.nan
+
+
+def _nanmax(values: np.ndarray) -> float:
+    return float(np.nanmax(values)) if len(values) else np.nan
+
+
+def _limits(low: float, high: float, margin: float = 1.1):
+    """Axis limits with the margin away from zero, never empty nor NaN."""
+    low = low if np.isfinite(low) else 0.0
+    high = high if np.isfinite(high) else 0.0
+    low = low * margin if low < 0 else low
+    high = high * margin if high > 0 else high
+    return (low, high) if high > low else (low - 1.0, low + 1.0)
+
+
+def _event_label(event: FlightEvent) -> str:
+    event_type = normalize_event_type(event.type)
+    try:
+        return EVENT_LABELS.get(FlightEventType(event_type), event_type)
+    except ValueError:
+        return event_type
+
+
+def path_rows(series: FlightSeries, num_points: int) -> np.ndarray:
+    """The samples of the 3-D path, picked with LTTB to keep its shape, apogee included."""
+    if len(series) <= num_points:
+        return np.arange(len(series))
+    position = np.column_stack((series.east, series.north, series.altitude))
+    return lttb_indices(series.time, position, max(num_points, 3))
+
+
+class SeriesArtists:
+    """
+    The lines, rocket marker and "Max:" labels of one simulation, the labels unless `labels` is False.
+    With a 3-D trajectory, the path is drawn from the `path_points` samples of `path_rows`.
+    """
+
+    def __init__(self, figure: 'FlightFigure', series: FlightSeries, position: int, overlay: bool,
+                 path_points: int = PATH_POINTS, labels: bool = True):
+        self.series = series
+        self.three_d = figure.three_d
+        self.labels = labels
+        if overlay:
+            color = f'C{position % 10}'
+            styles = ('-', '^', '-', '-', '-')
+            text_colors = (color, color, color)
+            kwargs = {'color': color}
+        else:
+            styles, kwargs = SINGLE_STYLES, {}
+            text_colors = ('g', 'm', 'c')
+
+        # 3-D axes take a third, empty, coordinate
+        empty = ([], [], []) if self.three_d else ([], [])
+        self.traj_line, = figure.ax_traj.plot(*empty, styles[0], label=series.name if overlay else None, **kwargs)
+        self.rocket_marker, = figure.ax_traj.plot(*empty, styles[1], markersize=10,
+                                                  label=None if overlay else 'Rocket', **kwargs)
+        if self.three_d:
+            self.path_rows = path_rows(series, path_points)
+        self.alt_line, = figure.ax_alt.plot([], [], styles[2], **kwargs)
+        self.vel_line, = figure.ax_vel.plot([], [], styles[3], **kwargs)
+        self.acc_line, = figure.ax_acc.plot([], [], styles[4], **kwargs)
+
+        # The labels of overlaid simulations are stacked under each other
+        top = 0.95 - 0.09 * position
+        size = 'small' if overlay else None
+        self.alt_max_text, self.vel_max_text, self.acc_max_text = (
+            axes.text(0.98, top, '', transform=axes.transAxes, ha='right', va='top', color=color, fontsize=size)
+            for axes, color in zip((figure.ax_alt, figure.ax_vel, figure.ax_acc), text_colors)
+        ) if labels else (None, None, None)
+
+    @property
+    def lines(self):
+        return self.traj_line, self.rocket_marker, self.alt_line, self.vel_line, self.acc_line
+
+    @property
+    def texts(self):
+        return (self.alt_max_text, self.vel_max_text, self.acc_max_text) if self.labels else ()
+
+    def clear(self) -> None:
+        for line in self.lines:
+            line.set_data([], [])
+        if self.three_d:
+            self.traj_line.set_data_3d([], [], [])
+            self.rocket_marker.set_data_3d([], [], [])
+        for text in self.texts:
+            text.set_text('')
+
+    def set_data(self, time, lateral_distance, altitude, vertical_velocity, vertical_acceleration,
+                 maxima: Sequence[float]) -> None:
+        """
+        Draws the given samples, the rocket on the last one, with the altitude, velocity and acceleration maxima.
+        A 3-D trajectory is left to `draw_path`.
+        """
+        if not self.three_d:
+            self.traj_line.set_data(lateral_distance, altitude)
+            self.rocket_marker.set_data(lateral_distance[-1:], altitude[-1:])
+
+        self.alt_line.set_data(time, altitude)
+        self.vel_line.set_data(time, vertical_velocity)
+        self.acc_line.set_data(time, vertical_acceleration)
+
+        if not self.labels:
+            return
+        max_altitude, max_velocity, max_acceleration = maxima
+        self.alt_max_text.set_text(f'Max: {max_altitude:.1f} m')
+        self.vel_max_text.set_text(f'Max: {max_velocity:.1f} m/s')
+        self.acc_max_text.set_text(f'Max: {max_acceleration:.1f} m/s²')
+
+    def draw(self, index: int) -> None:
+        """Draws the series up to the sample `index`. Only slices of the precomputed arrays are used."""
+        s = self.series
+        end = index + 1
+        self.set_data(s.time[:end], s.lateral_distance[:end], s.altitude[:end], s.vertical_velocity[:end],
+                      s.vertical_acceleration[:end],
+                      (s.max_altitude[index], s.max_vertical_velocity[index], s.max_vertical_acceleration[index]))
+        if self.three_d:
+            self.draw_path(index)
+
+    def draw_path(self, index: int) -> None:
+        """Draws the 3-D path up to the sample `index`, from at most `path_points` + 1 samples."""
+        s = self.series
+        rows = self.path_rows[:np.searchsorted(self.path_rows, index, side='right')]
+        if not len(rows) or rows[-1] != index:
+            rows = np.append(rows, index)
+        self.traj_line.set_data_3d(s.east[rows], s.north[rows], s.altitude[rows])
+        self.rocket_marker.set_data_3d(s.east[index:index + 1], s.north[index:index + 1], s.altitude[index:index + 1])
+
+
+class FlightFigure:
+    """
+    The figure and artists of the flight visualizer for one or several simulations.
+    `update(index)` draws the flights up to a sample of the `timeline`, the simulation lasting the
+    longest, and returns the artists that changed. The other simulations are drawn up to the same time.
+    With `three_d`, the trajectory is drawn east and north of the launch site, and the landing points
+    of all the simulations are shown from the start.
+    """
+
+    def __init__(self, series: Union[FlightSeries, Sequence[FlightSeries]], figure=None, three_d: bool = False):
+        if figure is None:
+            import matplotlib.pyplot as plt
+            figure = plt.figure(figsize=(12, 8))
+        self.series: List[FlightSeries] = [series] if isinstance(series, FlightSeries) else list(series)
+        if not self.series:
+            raise ValueError("At least one simulation is required")
+        self.timeline = common_timeline(self.series)
+        self.overlay = len(self.series) > 1
+        self.ensemble = len(self.series) > ENSEMBLE_SIZE
+        self.three_d = three_d
+        self.figure = figure
+        self._build_layout()
+        self._set_limits()
+        self._build_artists()
+
+    def _build_layout(self):
+        fig = self.figure
+        # 3 rows, 2 columns. The margins are the ones tight_layout(pad=3.0) finds for the 12x8 figure,
+        # fixed because computing them costs as much as drawing the whole figure
+        self.gridspec = gs = fig.add_gridspec(3, 2, left=0.08, right=0.96, bottom=0.1, top=0.92, wspace=0.22, hspace=0.55)
+
+        # Main trajectory plot
+        # @TODO Make the titles customizable through a config file
+        if self.three_d:
+            self.ax_traj = fig.add_subplot(gs[:, 0], projection='3d')
+            self.ax_traj.set_title("Flight Trajectory")
+            self.ax_traj.set_xlabel("East (m)")
+            self.ax_traj.set_ylabel("North (m)")
+            self.ax_traj.set_zlabel("Altitude (m)")
+        else:
+            self.ax_traj = fig.add_subplot(gs[:, 0])  # Spans all rows, first column
+            self.ax_traj.set_title("Flight Trajectory")
+            self.ax_traj.set_xlabel("Downrange (m)")
+            self.ax_traj.set_ylabel("Altitude (m)")
+            self.ax_traj.grid(True)
+            self.ax_traj.set_aspect('equal', adjustable='box')
+
+        # Time series plots
+        self.ax_alt = fig.add_subplot(gs[0, 1])  # Top-right
+        self.ax_alt.set_title("Altitude vs. Time")
+        self.ax_alt.set_ylabel("Altitude (m)")
+        self.ax_alt.grid(True)
+
+        self.ax_vel = fig.add_subplot(gs[1, 1])  # Middle-right
+        self.ax_vel.set_title("Vertical Velocity vs. Time")
+        self.ax_vel.set_ylabel("Velocity (m/s)")
+        self.ax_vel.grid(True)
+
+        self.ax_acc = fig.add_subplot(gs[2, 1])  # Bottom-right
+        self.ax_acc.set_title("Vertical Acceleration vs. Time")
+        self.ax_acc.set_xlabel("Time (s)")
+        self.ax_acc.set_ylabel("Acceleration (m/s²)")
+        self.ax_acc.grid(True)
+
+        title = f"{len(self.series)} simulations" if self.overlay else self.series[0].name
+        fig.suptitle(f"Flight Playback: {title}", fontsize=16, y=0.99)
+
+    def _set_limits(self):
+        """The limits are set once from the full flights, so the axes never need to be redrawn."""
+
+        def joined(channel):
+            return np.concatenate([getattr(s, channel) for s in self.series])
+
+        altitude = joined('altitude')
+        with warnings.catch_warnings():
+            # All-NaN channels get default limits
+            warnings.simplefilter('ignore', RuntimeWarning)
+            if self.three_d:
+                # The same scale east and north, so the drift direction isn't distorted
+                drift = _nanmax(np.hypot(joined('east'), joined('north')))
+                drift = drift * 1.1 if drift > 0 else 1.0
+                self.ax_traj.set_xlim(-drift, drift)
+                self.ax_traj.set_ylim(-drift, drift)
+                self.ax_traj.set_zlim(*_limits(0.0, _nanmax(altitude)))
+            else:
+                self.ax_traj.set_xlim(*_limits(0.0, _nanmax(joined('lateral_distance'))))
+                self.ax_traj.set_ylim(*_limits(0.0, _nanmax(altitude)))
+            end_time = _nanmax(joined('time'))
+            for axes, values in ((self.ax_alt, altitude), (self.ax_vel, joined('vertical_velocity')),
+                                 (self.ax_acc, joined('vertical_acceleration'))):
+                axes.set_xlim(0, end_time if end_time > 0 else 1.0)
+                axes.set_ylim(*_limits(_nanmin(values), _nanmax(values)))
+
+    def _build_artists(self):
+        path_points = max(PATH_POINTS // len(self.series), MIN_PATH_POINTS)
+        self.tracks = [SeriesArtists(self, series, position, self.overlay, path_points, labels=not self.ensemble)
+                       for position, series in enumerate(self.series)]
+        if self.three_d:
+            self._mark_landings()
+        if not self.ensemble:
+            self.ax_traj.legend(loc='upper right', fontsize='small' if self.overlay else None)
+
+        # Text annotation for live data
+        if self.three_d:
+            self.live_text = self.ax_traj.text2D(0.02, 0.98, '', transform=self.ax_traj.transAxes,
+                                                 verticalalignment='top')
+        else:
+            self.live_text = self.ax_traj.text(0.05, 0.95, '', transform=self.ax_traj.transAxes,
+                                               verticalalignment='top')
+
+    def _mark_landings(self):
+        """The landing points of all the simulations on the ground, one static scatter drawn with the axes."""
+        landed = [s for s in self.series if len(s)]
+        east = [s.east[s.landing_index] for s in landed]
+        north = [s.north[s.landing_index] for s in landed]
+        colors = [f'C{position % 10}' if self.overlay else 'k' for position, s in enumerate(self.series) if len(s)]
+        self.landings = self.ax_traj.scatter(east, north, np.zeros(len(landed)), c=colors, marker='x', s=20,
+                                             depthshade=False, label='Landing')
+
+    def mark_events(self, events: Optional[Sequence[FlightEvent]] = None, series: Optional[FlightSeries] = None):
+        """
+        Static markers of flight events: dotted vertical lines on the time plots, labelled on the
+        altitude plot, and points on the trajectory of `series` (the timeline by default).
+        The events default to the ones of that series.
+        Events closer than 1% of the flight duration share a label, e.g. ejection and deployment.
+        """
+        series = series or self.timeline
+        events = series.events if events is None else events
+        end_time = self.ax_alt.get_xlim()[1]
+        groups: List[List[FlightEvent]] = []
+        for event in sorted(events, key=lambda e: e.time):
+            if groups and event.time - groups[-1][0].time <= 0.01 * end_time:
+                groups[-1].append(event)
+            else:
+                groups.append([event])
+
+        label_transform = self.ax_alt.get_xaxis_transform()  # data x, axes y
+        for group in groups:
+            time = group[0].time
+            for axes in (self.ax_alt, self.ax_vel, self.ax_acc):
+                axes.axvline(time, color='0.4', linestyle=':', linewidth=0.8)
+            label = ', '.join(dict.fromkeys(_event_label(event) for event in group))
+            # Right of the line, except at the end of the axis
+            side = 'right' if time > 0.9 * end_time else 'left'
+            self.ax_alt.text(time, 0.02, label, transform=label_transform, rotation=90, ha=side, va='bottom',
+                             fontsize='x-small', color='0.3', clip_on=True)
+            if len(series):
+                index = series.index_at(time)
+                if self.three_d:
+                    self.ax_traj.plot([series.east[index]], [series.north[index]], [series.altitude[index]], 'k.',
+                                      markersize=4)
+                else:
+                    self.ax_traj.plot(series.lateral_distance[index], series.altitude[index], 'k.', markersize=4)
+
+    @property
+    def artists(self):
+        """Every artist changed by `update`, as expected by blitting animations."""
+        return tuple(artist for track in self.tracks for artist in track.lines + track.texts) + (self.live_text,)
+
+    def reset(self):
+        """Clears the animated artists, the first frame of a blitting animation."""
+        for track in self.tracks:
+            track.clear()
+        self.live_text.set_text('')
+        return self.artists
+
+    def update(self, index: int):
+        """Draws the flights up to the sample `index` of the timeline."""
+        timeline = self.timeline
+        if not len(timeline):
+            return self.artists
+        index = min(max(int(index), 0), len(timeline) - 1)
+        time = timeline.time[index]
+
+        live = [f"Time: {time:.2f} s"]
+        altitudes = []
+        for track in self.tracks:
+            s = track.series
+            if not len(s):
+                continue
+            # O(log n) lookup of the same time in the other simulations
+            position = index if s is timeline else s.index_at(time)
+            track.draw(position)
+            if self.ensemble:
+                altitudes.append(s.altitude[position])
+            elif self.overlay:
+                live.append(f"{s.name}: {s.altitude[position]:.1f} m")
+            else:
+                live += [f"Altitude: {s.altitude[position]:.1f} m", f"Velocity: {s.vertical_velocity[position]:.1f} m/s"]
+        if self.ensemble and altitudes:
+            live += [f"{len(self.series)} simulations",
+                     f"Altitude: {np.nanmin(altitudes):.1f} to {np.nanmax(altitudes):.1f} m"]
+        self.live_text.set_text('\n'.join(live))
+        return self.artists
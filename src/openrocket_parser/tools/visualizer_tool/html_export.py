@@ -0,0 +1,459 @@
+"""
+Export of the flight playback to a single static HTML file, to share flights people can zoom into and scrub.
+
+The plotted channels are downsampled with LTTB, which keeps the shape of the curves and their exact
+extremes, and embedded as base64 little-endian float32 arrays: a simulation of any length takes about
+130 kB at the default 5000 points. The page draws them on canvases with a small inline script,
+so it opens from disk without a server, network access nor any library.
+"""
+import base64
+import html
+import json
+import logging
+from typing import Dict, Optional
+
+import numpy as np
+
+from openrocket_parser.simulations.simulation import Simulation
+from .figure import _event_label
+from .series import PLOTTED_CHANNELS, FlightSeries
+
+# Samples kept per simulation
+HTML_POINTS = 5000
+
+
+def encode_column(values: np.ndarray) -> str:
+    """A column as base64 little-endian float32, NaN included."""
+    return base64.b64encode(np.asarray(values, dtype='<f4').tobytes()).decode('ascii')
+
+
+def flight_payload(sim: Simulation, max_points: int = HTML_POINTS) -> Dict:
+    """The downsampled plotted channels and the events of a simulation, as embedded in the page."""
+    columns = [name for name in PLOTTED_CHANNELS[1:] if name in sim.flight_data.columns]
+    if len(sim.flight_data) > max_points:
+        sim = sim.downsample(max_points, 'lttb', columns=columns or None)
+    series = FlightSeries(sim)
+    return {
+        'name': sim.name,
+        'columns': {name: encode_column(getattr(series, name)) for name in PLOTTED_CHANNELS},
+        'events': [{'time': float(event.time), 'label': _event_label(event)} for event in series.events],
+    }
+
+
+def export_html(sim_data, output: str, max_points: int = HTML_POINTS) -> Optional[str]:
+    """
+    Writes the flight playback of a simulation, or of a list of overlaid simulations, to a standalone
+    HTML file with at most `max_points` samples per simulation. Returns the output path, or None if
+    there's nothing to export.
+    """
+    if max_points < 3:
+        raise ValueError(f"At least 3 points per simulation are needed, got {max_points}")
+    sims = sim_data if isinstance(sim_data, (list, tuple)) else [sim_data]
+    sims = [sim for sim in sims if len(sim.flight_data)]
+    if not sims:
+        logging.error("No flight data to export.")
+        return None
+
+    payload = {'simulations': [flight_payload(sim, max_points) for sim in sims]}
+    title = f"{len(sims)} simulations" if len(sims) > 1 else sims[0].name
+    # A "</script>" in a simulation name would end the element holding the data
+    data = json.dumps(payload, separators=(',', ':')).replace('<', '\\u003c')
+    page = _TEMPLATE.replace('__TITLE__', html.escape(f"Flight Playback: {title}")).replace('__DATA__', data)
+    with open(output, 'w', encoding='utf-8') as html_file:
+        html_file.write(page)
+    return output
+
+
+_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>__TITLE__</title>
+<style>
+  body { margin: 0; font: 14px sans-serif; color: #222; background: #fff; }
+  h1 { font-size: 20px; font-weight: normal; text-align: center; margin: 10px 0 4px; }
+  #plots { display: grid; grid-template-columns: 1fr 1fr; grid-template-rows: repeat(3, 1fr);
+           gap: 8px 20px; height: calc(100vh - 120px); min-height: 480px; padding: 0 16px; }
+  #plots canvas { width: 100%; height: 100%; display: block; }
+  #trajectory { grid-row: 1 / span 3; }
+  #controls { display: flex; align-items: center; gap: 12px; padding: 8px 16px; }
+  #scrubber { flex: 1; }
+  #clock { font-variant-numeric: tabular-nums; min-width: 90px; text-align: right; }
+  #help { color: #666; font-size: 12px; padding: 0 16px 8px; }
+</style>
+</head>
+<body>
+<h1>__TITLE__</h1>
+<div id="plots">
+  <div id="trajectory"><canvas></canvas></div>
+  <div><canvas id="altitude"></canvas></div>
+  <div><canvas id="vertical_velocity"></canvas></div>
+  <div><canvas id="vertical_acceleration"></canvas></div>
+</div>
+<div id="controls">
+  <button id="play">Play</button>
+  <input id="scrubber" type="range" min="0" max="1" step="any" value="0">
+  <span id="clock"></span>
+  <select id="speed">
+    <option value="0.5">0.5x</option><option value="1" selected>1x</option>
+    <option value="2">2x</option><option value="5">5x</option><option value="10">10x</option>
+  </select>
+</div>
+<div id="help">Drag across a time plot to zoom in, double-click to zoom out, click to move there.
+  Space plays and pauses, the arrows move by 1 s (10 s with shift).</div>
+<script type="application/json" id="flight-data">__DATA__</script>
+<script>
+(function () {
+  'use strict';
+  const DATA = JSON.parse(document.getElementById('flight-data').textContent);
+  const PALETTE = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b', '#e377c2', '#7f7f7f',
+                   '#bcbd22', '#17becf'];
+  // The colors of the single simulation plots of the visualizer
+  const SINGLE = {trajectory: '#0000ff', altitude: '#008000', vertical_velocity: '#bf00bf',
+                  vertical_acceleration: '#00bfbf'};
+
+  function decode(text) {
+    const binary = atob(text);
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i);
+    return new Float32Array(bytes.buffer);
+  }
+
+  function runningMax(values) {
+    const result = new Float32Array(values.length);
+    let max = NaN;
+    for (let i = 0; i < values.length; i++) {
+      if (!(values[i] <= max)) max = isNaN(values[i]) ? max : values[i];
+      result[i] = max;
+    }
+    return result;
+  }
+
+  const sims = DATA.simulations.map(function (sim, position) {
+    const columns = {};
+    for (const name in sim.columns) columns[name] = decode(sim.columns[name]);
+    const maxima = {};
+    for (const name of ['altitude', 'vertical_velocity', 'vertical_acceleration']) maxima[name] = runningMax(columns[name]);
+    return {name: sim.name, events: sim.events, columns: columns, maxima: maxima,
+            color: PALETTE[position % PALETTE.length], length: columns.time.length};
+  });
+  const overlay = sims.length > 1;
+  // The simulation lasting the longest is the time base
+  const timeline = sims.reduce((a, b) => (b.columns.time[b.length - 1] > a.columns.time[a.length - 1] ? b : a));
+  const startTime = timeline.columns.time[0];
+  const endTime = timeline.columns.time[timeline.length - 1];
+
+  const state = {time: startTime, view: [0, endTime > 0 ? endTime : 1], playing: false, speed: 1};
+
+  // Last sample at or before t
+  function indexAt(sim, t) {
+    const time = sim.columns.time;
+    let low = 0, high = sim.length;
+    while (low < high) {
+      const middle = (low + high) >> 1;
+      if (time[middle] <= t) low = middle + 1; else high = middle;
+    }
+    return Math.min(Math.max(low - 1, 0), sim.length - 1);
+  }
+
+  function extent(name, first, last) {
+    let low = Infinity, high = -Infinity;
+    for (const sim of sims) {
+      const values = sim.columns[name];
+      const start = first === undefined ? 0 : indexAt(sim, first);
+      const end = last === undefined ? sim.length - 1 : Math.min(indexAt(sim, last) + 1, sim.length - 1);
+      for (let i = start; i <= end; i++) {
+        if (values[i] < low) low = values[i];
+        if (values[i] > high) high = values[i];
+      }
+    }
+    return isFinite(low) ? [low, high] : [0, 0];
+  }
+
+  function limits(low, high) {
+    low = low < 0 ? low * 1.1 : low;
+    high = high > 0 ? high * 1.1 : high;
+    return high > low ? [low, high] : [low - 1, low + 1];
+  }
+
+  function ticks(low, high, count) {
+    const raw = (high - low) / count;
+    const magnitude = Math.pow(10, Math.floor(Math.log10(raw)));
+    const step = [1, 2, 5, 10].map(f => f * magnitude).find(s => s >= raw) || raw;
+    const result = [];
+    for (let t = Math.ceil(low / step) * step; t <= high + step * 1e-9; t += step) result.push(Math.abs(t) < step * 1e-9 ? 0 : t);
+    return result;
+  }
+
+  const MARGIN = {left: 58, right: 12, top: 24, bottom: 34};
+
+  class Panel {
+    constructor(canvas, x, y, title, xLabel, yLabel) {
+      Object.assign(this, {canvas: canvas, x: x, y: y, title: title, xLabel: xLabel, yLabel: yLabel});
+      this.context = canvas.getContext('2d');
+      this.isTime = x === 'time';
+    }
+
+    resize() {
+      const ratio = window.devicePixelRatio || 1;
+      this.width = this.canvas.clientWidth;
+      this.height = this.canvas.clientHeight;
+      this.canvas.width = this.width * ratio;
+      this.canvas.height = this.height * ratio;
+      this.context.setTransform(ratio, 0, 0, ratio, 0, 0);
+    }
+
+    ranges() {
+      if (this.isTime) {
+        return [state.view, limits(...extent(this.y, state.view[0], state.view[1]))];
+      }
+      const xRange = limits(0, extent(this.x)[1]), yRange = limits(0, extent(this.y)[1]);
+      // Same scale on both axes, like the trajectory of the visualizer
+      const width = this.width - MARGIN.left - MARGIN.right, height = this.height - MARGIN.top - MARGIN.bottom;
+      const scale = Math.max((xRange[1] - xRange[0]) / width, (yRange[1] - yRange[0]) / height);
+      return [[xRange[0], xRange[0] + scale * width], [yRange[0], yRange[0] + scale * height]];
+    }
+
+    toPixelX(value) { return MARGIN.left + (value - this.xRange[0]) / (this.xRange[1] - this.xRange[0]) * (this.width - MARGIN.left - MARGIN.right); }
+    toPixelY(value) { return this.height - MARGIN.bottom - (value - this.yRange[0]) / (this.yRange[1] - this.yRange[0]) * (this.height - MARGIN.top - MARGIN.bottom); }
+    fromPixelX(pixel) { return this.xRange[0] + (pixel - MARGIN.left) / (this.width - MARGIN.left - MARGIN.right) * (this.xRange[1] - this.xRange[0]); }
+
+    path(sim, start, end) {
+      const c = this.context, xs = sim.columns[this.x], ys = sim.columns[this.y];
+      c.beginPath();
+      let drawing = false;
+      for (let i = start; i <= end; i++) {
+        if (isNaN(xs[i]) || isNaN(ys[i])) { drawing = false; continue; }
+        const px = this.toPixelX(xs[i]), py = this.toPixelY(ys[i]);
+        if (drawing) c.lineTo(px, py); else c.moveTo(px, py);
+        drawing = true;
+      }
+      c.stroke();
+    }
+
+    draw() {
+      const c = this.context;
+      [this.xRange, this.yRange] = this.ranges();
+      c.clearRect(0, 0, this.width, this.height);
+      c.font = '11px sans-serif';
+      c.fillStyle = '#222';
+      c.textAlign = 'center';
+      c.fillText(this.title, this.width / 2, 14);
+
+      // Grid and ticks
+      c.strokeStyle = '#ddd';
+      c.lineWidth = 1;
+      for (const t of ticks(...this.xRange, 6)) {
+        const px = this.toPixelX(t);
+        c.beginPath(); c.moveTo(px, MARGIN.top); c.lineTo(px, this.height - MARGIN.bottom); c.stroke();
+        c.fillText(+t.toPrecision(6), px, this.height - MARGIN.bottom + 13);
+      }
+      c.textAlign = 'right';
+      for (const t of ticks(...this.yRange, 4)) {
+        const py = this.toPixelY(t);
+        c.beginPath(); c.moveTo(MARGIN.left, py); c.lineTo(this.width - MARGIN.right, py); c.stroke();
+        c.fillText(+t.toPrecision(6), MARGIN.left - 4, py + 4);
+      }
+      c.textAlign = 'center';
+      c.fillText(this.xLabel, (MARGIN.left + this.width - MARGIN.right) / 2, this.height - 4);
+      c.save();
+      c.translate(12, (MARGIN.top + this.height - MARGIN.bottom) / 2);
+      c.rotate(-Math.PI / 2);
+      c.fillText(this.yLabel, 0, 0);
+      c.restore();
+      c.strokeStyle = '#888';
+      c.strokeRect(MARGIN.left, MARGIN.top, this.width - MARGIN.left - MARGIN.right, this.height - MARGIN.top - MARGIN.bottom);
+
+      c.save();
+      c.beginPath();
+      c.rect(MARGIN.left, MARGIN.top, this.width - MARGIN.left - MARGIN.right, this.height - MARGIN.top - MARGIN.bottom);
+      c.clip();
+      if (this.isTime) this.drawEvents();
+
+      const labels = [];
+      sims.forEach((sim, position) => {
+        const color = overlay ? sim.color : SINGLE[this.isTime ? this.y : 'trajectory'];
+        const first = this.isTime ? indexAt(sim, state.view[0]) : 0;
+        const last = this.isTime ? Math.min(indexAt(sim, state.view[1]) + 1, sim.length - 1) : sim.length - 1;
+        const now = indexAt(sim, state.time);
+        // The whole flight faintly, the flown part over it
+        c.strokeStyle = color;
+        c.globalAlpha = 0.2;
+        c.lineWidth = 1;
+        this.path(sim, first, last);
+        c.globalAlpha = 1;
+        c.lineWidth = 1.6;
+        if (now >= first) this.path(sim, first, Math.min(now, last));
+        if (!this.isTime) {
+          const px = this.toPixelX(sim.columns[this.x][now]), py = this.toPixelY(sim.columns[this.y][now]);
+          c.fillStyle = overlay ? color : '#ff0000';
+          c.beginPath(); c.moveTo(px, py - 7); c.lineTo(px - 6, py + 5); c.lineTo(px + 6, py + 5); c.closePath(); c.fill();
+        } else {
+          const unit = {altitude: 'm', vertical_velocity: 'm/s', vertical_acceleration: 'm/s²'}[this.y];
+          labels.push([color, (overlay ? sim.name + ': ' : '') + 'Max: ' + sim.maxima[this.y][now].toFixed(1) + ' ' + unit]);
+        }
+      });
+      c.restore();
+
+      c.textAlign = this.isTime ? 'right' : 'left';
+      labels.forEach(([color, text], position) => {
+        c.fillStyle = color;
+        c.fillText(text, this.width - MARGIN.right - 6, MARGIN.top + 14 + 13 * position);
+      });
+      if (!this.isTime) this.drawReadout();
+      if (this.selection) {
+        c.fillStyle = 'rgba(0, 0, 255, 0.1)';
+        const [a, b] = this.selection.map(t => this.toPixelX(t));
+        c.fillRect(Math.min(a, b), MARGIN.top, Math.abs(b - a), this.height - MARGIN.top - MARGIN.bottom);
+      }
+    }
+
+    drawEvents() {
+      const c = this.context;
+      c.setLineDash([2, 3]);
+      c.strokeStyle = '#666';
+      c.fillStyle = '#555';
+      let previous = -Infinity;
+      for (const event of timeline.events) {
+        const px = this.toPixelX(event.time);
+        c.beginPath(); c.moveTo(px, MARGIN.top); c.lineTo(px, this.height - MARGIN.bottom); c.stroke();
+        // Labelled on the altitude plot, events closer than 1% of the view share the first label
+        if (this.y === 'altitude' && event.time - previous > 0.01 * (state.view[1] - state.view[0])) {
+          c.save();
+          c.translate(px - 3, this.height - MARGIN.bottom - 4);
+          c.rotate(-Math.PI / 2);
+          c.textAlign = 'left';
+          c.fillText(event.label, 0, 0);
+          c.restore();
+          previous = event.time;
+        }
+      }
+      c.setLineDash([]);
+      c.strokeStyle = '#d00';
+      const px = this.toPixelX(state.time);
+      c.beginPath(); c.moveTo(px, MARGIN.top); c.lineTo(px, this.height - MARGIN.bottom); c.stroke();
+    }
+
+    drawReadout() {
+      const c = this.context;
+      const lines = ['Time: ' + state.time.toFixed(2) + ' s'];
+      for (const sim of sims) {
+        const i = indexAt(sim, state.time);
+        if (overlay) {
+          lines.push(sim.name + ': ' + sim.columns.altitude[i].toFixed(1) + ' m');
+        } else {
+          lines.push('Altitude: ' + sim.columns.altitude[i].toFixed(1) + ' m',
+                     'Velocity: ' + sim.columns.vertical_velocity[i].toFixed(1) + ' m/s');
+        }
+      }
+      c.fillStyle = '#222';
+      c.textAlign = 'left';
+      c.font = '12px sans-serif';
+      lines.forEach((line, position) => c.fillText(line, MARGIN.left + 8, MARGIN.top + 16 + 15 * position));
+    }
+  }
+
+  const panels = [
+    new Panel(document.querySelector('#trajectory canvas'), 'lateral_distance', 'altitude', 'Flight Trajectory',
+              'Downrange (m)', 'Altitude (m)'),
+    new Panel(document.getElementById('altitude'), 'time', 'altitude', 'Altitude vs. Time', 'Time (s)', 'Altitude (m)'),
+    new Panel(document.getElementById('vertical_velocity'), 'time', 'vertical_velocity', 'Vertical Velocity vs. Time',
+              'Time (s)', 'Velocity (m/s)'),
+    new Panel(document.getElementById('vertical_acceleration'), 'time', 'vertical_acceleration',
+              'Vertical Acceleration vs. Time', 'Time (s)', 'Acceleration (m/s²)'),
+  ];
+
+  const scrubber = document.getElementById('scrubber');
+  const clock = document.getElementById('clock');
+  const play = document.getElementById('play');
+  scrubber.min = startTime;
+  scrubber.max = endTime;
+
+  let pending = false;
+  function redraw() {
+    if (pending) return;
+    pending = true;
+    requestAnimationFrame(function () {
+      pending = false;
+      for (const panel of panels) panel.draw();
+      scrubber.value = state.time;
+      clock.textContent = state.time.toFixed(2) + ' s';
+      play.textContent = state.playing ? 'Pause' : 'Play';
+    });
+  }
+
+  function seek(t) {
+    state.time = Math.min(Math.max(t, startTime), endTime);
+    redraw();
+  }
+
+  let last = null;
+  function tick(now) {
+    if (!state.playing) return;
+    if (last !== null) seek(state.time + (now - last) / 1000 * state.speed);
+    last = now;
+    if (state.time >= endTime) state.playing = false;
+    requestAnimationFrame(tick);
+  }
+
+  function toggle() {
+    state.playing = !state.playing;
+    if (state.playing) {
+      if (state.time >= endTime) state.time = startTime;
+      last = null;
+      requestAnimationFrame(tick);
+    }
+    redraw();
+  }
+
+  play.addEventListener('click', toggle);
+  scrubber.addEventListener('input', () => seek(parseFloat(scrubber.value)));
+  document.getElementById('speed').addEventListener('change', e => { state.speed = parseFloat(e.target.value); });
+  document.addEventListener('keydown', function (e) {
+    const step = e.shiftKey ? 10 : 1;
+    if (e.key === ' ') toggle();
+    else if (e.key === 'ArrowLeft') seek(state.time - step);
+    else if (e.key === 'ArrowRight') seek(state.time + step);
+    else if (e.key === 'Home') seek(startTime);
+    else if (e.key === 'End') seek(endTime);
+    else return;
+    e.preventDefault();
+  });
+
+  // Dragging across a time plot zooms all of them, a click moves the playback
+  for (const panel of panels.filter(p => p.isTime)) {
+    let anchor = null;
+    panel.canvas.addEventListener('mousedown', e => { anchor = panel.fromPixelX(e.offsetX); });
+    panel.canvas.addEventListener('mousemove', e => {
+      if (anchor === null) return;
+      panel.selection = [anchor, panel.fromPixelX(e.offsetX)];
+      redraw();
+    });
+    window.addEventListener('mouseup', e => {
+      if (anchor === null) return;
+      const selection = panel.selection;
+      panel.selection = null;
+      const span = selection ? Math.abs(selection[1] - selection[0]) : 0;
+      if (span > 0.005 * (state.view[1] - state.view[0])) {
+        state.view = [Math.min(...selection), Math.max(...selection)];
+        redraw();
+      } else if (e.target === panel.canvas) {
+        seek(anchor);
+      }
+      anchor = null;
+    });
+    panel.canvas.addEventListener('dblclick', () => { state.view = [0, endTime > 0 ? endTime : 1]; redraw(); });
+  }
+
+  function resize() {
+    for (const panel of panels) panel.resize();
+    redraw();
+  }
+  window.addEventListener('resize', resize);
+  resize();
+})();
+</script>
+</body>
+</html>
+"""
@@ -0,0 +1,142 @@
+"""
+Live view of telemetry, drawn in the flight figure as it arrives on a UDP port or a FIFO.
+
+Only the rows kept in the fixed-capacity ring buffer of the stream are drawn, at most `max_points`
+per line, so memory and frame time stay the same over sessions of any length. The animated artists
+are blitted over the cached axes, which are only drawn again when the data leaves their limits.
+"""
+import warnings
+from typing import Optional, Tuple
+
+import numpy as np
+
+from openrocket_parser.simulations.live import TelemetryStream
+from .figure import FlightFigure, _limits, _nanmax, _nanmin
+from .series import PLOTTED_CHANNELS, FlightSeries
+
+# Channels whose maximum since the start of the session is shown in the "Max:" labels
+MAXIMUM_CHANNELS = ('altitude', 'vertical_velocity', 'vertical_acceleration')
+
+
+class LiveFlightView(FlightFigure):
+    """
+    The flight figure following a `TelemetryStream`. `refresh` polls the stream and draws the rows of
+    its buffer. The time axes page forward by half of the buffered time span, and the value axes grow
+    with some headroom, so the whole figure is drawn again once in a while rather than every frame.
+    `start` redraws the figure from a timer of the canvas, at a capped frame rate.
+    """
+
+    def __init__(self, stream: TelemetryStream, figure=None, max_points: int = 5000):
+        if max_points < 2:
+            raise ValueError(f"At least 2 points per line are needed, got {max_points}")
+        self.stream = stream
+        self.max_points = max_points
+        # Maxima since the start of the session, including the rows dropped from the buffer
+        self.maxima = np.full(len(MAXIMUM_CHANNELS), np.nan)
+        # Whether the limits changed since the figure was last drawn in full
+        self.needs_full_draw = True
+        self._background = None
+        self.timer = None
+        stream.subscribe(self._on_rows)
+        super().__init__(FlightSeries(stream.load()[0]), figure)
+        self.figure.suptitle(f"Live Telemetry: {stream.file_path}", fontsize=16, y=0.99)
+
+    def _on_rows(self, stream: TelemetryStream, block) -> None:
+        for position, name in enumerate(MAXIMUM_CHANNELS):
+            if name in block:
+                self.maxima[position] = np.fmax(self.maxima[position], np.fmax.reduce(block[name]))
+
+    def visible_rows(self) -> Optional[Tuple[np.ndarray, ...]]:
+        """
+        The plotted channels of the buffered rows, oldest first, decimated to `max_points`.
+        The rows kept are counted from the start of the session, so they don't change from a frame to the next.
+        """
+        buffer = self.stream.buffer
+        if buffer is None or not len(buffer):
+            return None
+        count = len(buffer)
+        step = -(-count // self.max_points)
+        rows = np.arange((count - buffer.total) % step, count, step)
+        if rows[-1] != count - 1:
+            rows = np.append(rows, count - 1)
+        return tuple(buffer.column(name)[rows] if name in buffer.columns else np.full(len(rows), np.nan)
+                     for name in PLOTTED_CHANNELS)
+
+    def _grow_limits(self, time, altitude, vertical_velocity, vertical_acceleration, lateral_distance) -> bool:
+        """Moves the limits the data left. Returns whether any changed."""
+        changed = False
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            start, end = _nanmin(time), _nanmax(time)
+            low, high = self.ax_alt.get_xlim()
+            if np.isfinite(end) and not low <= end <= high:
+                page = max(0.5 * (end - start), 1.0)
+                for axes in (self.ax_alt, self.ax_vel, self.ax_acc):
+                    axes.set_xlim(start, end + page)
+                changed = True
+
+            for axes, axis, values, floor in ((self.ax_traj, 'x', lateral_distance, 0.0),
+                                              (self.ax_traj, 'y', altitude, 0.0),
+                                              (self.ax_alt, 'y', altitude, None),
+                                              (self.ax_vel, 'y', vertical_velocity, None),
+                                              (self.ax_acc, 'y', vertical_acceleration, None)):
+                minimum = _nanmin(values) if floor is None else floor
+                maximum = _nanmax(values)
+                low, high = getattr(axes, f'get_{axis}lim')()
+                if (np.isfinite(minimum) and minimum < low) or (np.isfinite(maximum) and maximum > high):
+                    # Half again the range, so the limits don't change with every new extreme
+                    getattr(axes, f'set_{axis}lim')(*_limits(min(minimum, low), max(maximum, high), margin=1.5))
+                    changed = True
+        return changed
+
+    def refresh(self) -> int:
+        """Polls the stream and draws the buffered rows. Returns the number of new rows."""
+        new_rows = self.stream.poll()
+        if not new_rows:
+            return 0
+        visible = self.visible_rows()
+        if visible is None:
+            return new_rows
+        time, altitude, vertical_velocity, vertical_acceleration, lateral_distance = visible
+        self.tracks[0].set_data(time, lateral_distance, altitude, vertical_velocity, vertical_acceleration,
+                                self.maxima)
+        self.live_text.set_text(f"Time: {time[-1]:.2f} s\nAltitude: {altitude[-1]:.1f} m\n"
+                                f"Velocity: {vertical_velocity[-1]:.1f} m/s\nRows: {self.stream.buffer.total}")
+        if self._grow_limits(*visible):
+            self.needs_full_draw = True
+        return new_rows
+
+    def _draw_artists(self) -> None:
+        for artist in self.artists:
+            self.figure.draw_artist(artist)
+
+    def _on_draw(self, event) -> None:
+        """Caches the static axes after every full draw: the first one, a resize or new limits."""
+        self._background = self.figure.canvas.copy_from_bbox(self.figure.bbox)
+        self.needs_full_draw = False
+        self._draw_artists()
+
+    def tick(self) -> None:
+        """Draws the new rows: blits the artists over the cached axes, or draws everything if the limits changed."""
+        if not self.refresh() and not self.needs_full_draw:
+            return
+        canvas = self.figure.canvas
+        if self.needs_full_draw or self._background is None:
+            canvas.draw_idle()
+            return
+        canvas.restore_region(self._background)
+        self._draw_artists()
+        canvas.blit(self.figure.bbox)
+
+    def start(self, fps: float = 30.0):
+        """Starts redrawing the figure at most `fps` times per second. Returns the timer, to be kept alive."""
+        if fps <= 0:
+            raise ValueError(f"The frame rate must be positive, got {fps}")
+        for artist in self.artists:
+            artist.set_animated(True)
+        canvas = self.figure.canvas
+        canvas.mpl_connect('draw_event', self._on_draw)
+        self.timer = canvas.new_timer(interval=max(1, int(1000 / fps)))
+        self.timer.add_callback(self.tick)
+        self.timer.start()
+        return self.timer
@@ -0,0 +1,100 @@
+"""
+Wall clock playback of a flight, independent of how fast the frames are drawn.
+"""
+import time
+from typing import Callable, Iterator
+
+from .series import FlightSeries
+
+
+class PlaybackClock:
+    """
+    Maps the wall clock to a position in the flight: the sample shown is the one at
+    `elapsed time x speed` into the flight. Whenever drawing a frame takes longer than the frame
+    interval, the next frame simply shows a later sample, so the frames in between are dropped
+    and a replay at 3x takes a third of the flight time on any machine, at any speed.
+    The playback can be paused and moved to any time, the next frame showing the new position.
+    """
+
+    def __init__(self, series: FlightSeries, speed: float = 1.0, clock: Callable[[], float] = time.monotonic,
+                 loop: bool = True):
+        """
+        :param series: The flight being played
+        :param speed: Playback speed multiplier, e.g. 2 for twice real time, 0.5 for half
+        :param clock: Source of the wall clock time in seconds, monotonic by default
+        :param loop: Whether `frames` ends with the flight, to be repeated, or pauses on its last sample
+        """
+        if speed <= 0:
+            raise ValueError(f"The playback speed must be positive, got {speed}")
+        self.series = series
+        self.speed = speed
+        self.loop = loop
+        self.paused = False
+        self._clock = clock
+        # The flight time at the wall clock time `_start`
+        self._origin = 0.0
+        self._start = clock()
+
+    def restart(self) -> None:
+        """Plays the flight again from the start."""
+        self.seek(0.0)
+        self.paused = False
+
+    @property
+    def flight_time(self) -> float:
+        """Time into the flight at the current wall clock time, from 0 to the flight duration."""
+        if self.paused:
+            return self._origin
+        return min(self._origin + (self._clock() - self._start) * self.speed, self.series.duration)
+
+    @property
+    def finished(self) -> bool:
+        return self.flight_time >= self.series.duration
+
+    def seek(self, flight_time: float) -> None:
+        """Moves the playback to a time into the flight, clipped to the flight."""
+        self._origin = min(max(float(flight_time), 0.0), self.series.duration)
+        self._start = self._clock()
+
+    def step(self, seconds: float) -> None:
+        """Moves the playback forward, or backward for negative seconds, in flight time."""
+        self.seek(self.flight_time + seconds)
+
+    def pause(self) -> None:
+        self._origin = self.flight_time
+        self.paused = True
+
+    def resume(self) -> None:
+        """Resumes the playback, from the start if it was paused on the end of the flight."""
+        if self.finished:
+            self._origin = 0.0
+        self._start = self._clock()
+        self.paused = False
+
+    def toggle(self) -> None:
+        if self.paused:
+            self.resume()
+        else:
+            self.pause()
+
+    def index(self) -> int:
+        """The sample to show now."""
+        if not len(self.series):
+            return 0
+        return self.series.index_at(self.series.time[0] + self.flight_time)
+
+    def frames(self) -> Iterator[int]:
+        """
+        The sample to show at every animation tick, from the start of the flight to its last sample.
+        Meant as the `frames` of a matplotlib animation, which restarts it when repeating. Without `loop`,
+        the playback pauses on the last sample instead of ending, so it can still be moved around.
+        """
+        self.restart()
+        while True:
+            # Checked before showing the frame, so the last sample is always shown
+            finished = self.finished and not self.paused
+            yield self.index()
+            if finished:
+                if self.loop:
+                    return
+                self.pause()
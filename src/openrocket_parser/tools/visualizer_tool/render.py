@@ -0,0 +1,190 @@
+"""
+Offline rendering of the flight playback to PNG frames, a GIF or an MP4 video, without a display.
+
+Frames are drawn with the Agg canvas, never through pyplot, so rendering works on headless machines,
+and like the interactive playback only the animated artists are drawn over the cached static axes.
+The frames are split into contiguous ranges rendered in parallel by a process pool, every worker
+reusing one figure for its whole range, and the numbered PNG frames are then stitched into the output.
+For a GIF, the workers also quantize their frames to a shared palette, so stitching only compares and
+compresses them.
+"""
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+
+from .series import FlightSeries, common_timeline
+
+FRAME_PATTERN = 'frame_{:06d}.png'
+FIGURE_SIZE = (12, 8)
+# Colors of the palette shared by the GIF frames. The last index is left free for the transparent pixels
+# of the frames, where they didn't change since the previous frame
+GIF_COLORS = 255
+GIF_TRANSPARENT = 255
+
+
+def frame_indices(series: FlightSeries, fps: float = 30.0, speed: float = 1.0) -> np.ndarray:
+    """The sample shown in each frame of a replay at `fps` frames per second of video and `speed` times real time."""
+    if fps <= 0 or speed <= 0:
+        raise ValueError(f"The frame rate and the speed must be positive, got {fps} fps at {speed}x")
+    if not len(series):
+        return np.empty(0, dtype=np.intp)
+    # Rounded up so the last frame shows the end of the flight
+    frame_count = int(np.ceil(series.duration * fps / speed)) + 1
+    times = series.time[0] + np.arange(frame_count) * (speed / fps)
+    indices = np.searchsorted(series.time, times, side='right') - 1
+    return np.clip(indices, 0, len(series) - 1)
+
+
+def _render_range(series: Sequence[FlightSeries], indices: np.ndarray, first_frame: int, directory: str,
+                  dpi: int, three_d: bool = False, palette_index: Optional[int] = None) -> int:
+    """
+    Renders a contiguous range of frames with a figure of its own. Runs in the worker processes.
+    The static axes are drawn once, every frame restores them and only draws the animated artists.
+
+    With `palette_index`, the frames are quantized to the palette of the frame showing that sample,
+    for a GIF. Every worker derives the same palette, as the frame renders the same in every process,
+    so the frames share one color table and the costly quantization is spread over the workers.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from PIL import Image
+
+    from .figure import FlightFigure
+
+    figure = Figure(figsize=FIGURE_SIZE, dpi=dpi)
+    canvas = FigureCanvasAgg(figure)
+    flight_figure = FlightFigure(series, figure, three_d)
+    flight_figure.mark_events()
+    for artist in flight_figure.reset():
+        artist.set_animated(True)
+    canvas.draw()
+    background = canvas.copy_from_bbox(figure.bbox)
+
+    def draw(index):
+        canvas.restore_region(background)
+        for artist in flight_figure.update(index):
+            figure.draw_artist(artist)
+        return Image.fromarray(np.asarray(canvas.buffer_rgba())).convert('RGB')
+
+    palette = None
+    if palette_index is not None:
+        palette = draw(palette_index).quantize(GIF_COLORS, method=Image.Quantize.FASTOCTREE)
+    for offset, index in enumerate(indices):
+        frame = draw(index)
+        if palette is not None:
+            frame = frame.quantize(palette=palette, dither=Image.Dither.NONE)
+        frame.save(os.path.join(directory, FRAME_PATTERN.format(first_frame + offset)), compress_level=1)
+    return len(indices)
+
+
+def render_frames(series: Union[FlightSeries, Sequence[FlightSeries]], directory: str, fps: float = 30.0,
+                  speed: float = 1.0, workers: Optional[int] = None, dpi: int = 100,
+                  three_d: bool = False, gif_palette: bool = False) -> List[str]:
+    """
+    Renders the replay of one or several overlaid flights as numbered PNG frames in `directory`, split
+    across `workers` processes (all the cores by default). Returns the paths of the frames, in order.
+    With `three_d`, the trajectory is drawn in 3-D, see `FlightFigure`. With `gif_palette`, the frames are
+    palette images sharing the colors of the last frame, ready to be stitched into a GIF.
+    """
+    series = [series] if isinstance(series, FlightSeries) else list(series)
+    indices = frame_indices(common_timeline(series), fps, speed)
+    os.makedirs(directory, exist_ok=True)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(indices)))
+
+    # Contiguous ranges, one per worker, so every worker draws a continuous part of the flight
+    bounds = np.linspace(0, len(indices), workers + 1).astype(int)
+    palette_index = int(indices[-1]) if gif_palette and len(indices) else None
+    if workers == 1:
+        _render_range(series, indices, 0, directory, dpi, three_d, palette_index)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            jobs = [pool.submit(_render_range, series, indices[start:stop], start, directory, dpi, three_d,
+                                palette_index)
+                    for start, stop in zip(bounds[:-1], bounds[1:])]
+            for job in jobs:
+                job.result()
+    return [os.path.join(directory, FRAME_PATTERN.format(frame)) for frame in range(len(indices))]
+
+
+def _write_gif(frames: List[str], output: str, fps: float) -> None:
+    """
+    Stitches palette frames sharing one color table, see `render_frames(gif_palette=True)`. The pixels that
+    didn't change since the previous frame are made transparent with one array comparison, which keeps the
+    file as small as Pillow's optimizer does at a fraction of its cost.
+    """
+    from PIL import Image
+
+    def load(path):
+        # Loaded and closed one at a time, so the frame files aren't all kept open
+        with Image.open(path) as image:
+            image.load()
+            return image
+
+    def deltas():
+        previous = None
+        for path in frames[1:]:
+            image = load(path)
+            pixels = np.asarray(image)
+            if previous is None:
+                previous = np.asarray(load(frames[0]))
+            delta = Image.fromarray(np.where(pixels == previous, GIF_TRANSPARENT, pixels).astype(np.uint8), 'P')
+            delta.putpalette(image.getpalette())
+            previous = pixels
+            yield delta
+
+    load(frames[0]).save(output, save_all=True, append_images=deltas(), duration=int(round(1000 / fps)), loop=0,
+                         optimize=False, transparency=GIF_TRANSPARENT, disposal=1)
+
+
+def _find_ffmpeg() -> Optional[str]:
+    """The ffmpeg executable configured for matplotlib animations, if installed."""
+    import matplotlib
+    return shutil.which(matplotlib.rcParams['animation.ffmpeg_path'])
+
+
+def _write_mp4(frames: List[str], output: str, fps: float, ffmpeg: str) -> None:
+    pattern = os.path.join(os.path.dirname(frames[0]), FRAME_PATTERN.replace('{:06d}', '%06d'))
+    subprocess.run([ffmpeg, '-y', '-loglevel', 'error', '-framerate', str(fps), '-i', pattern,
+                    '-c:v', 'libx264', '-pix_fmt', 'yuv420p', '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', output],
+                   check=True)
+
+
+def render_flight(sim_data, output: str, fps: float = 30.0, speed: float = 1.0, workers: Optional[int] = None,
+                  dpi: int = 100, three_d: bool = False) -> Optional[str]:
+    """
+    Renders the flight playback of a simulation, or of a list of overlaid simulations, to `output`:
+    an `.mp4` video (requires ffmpeg), a `.gif` animation, or a directory of PNG frames for any other path.
+    Returns the output path, or None if nothing could be rendered.
+    """
+    sims = sim_data if isinstance(sim_data, (list, tuple)) else [sim_data]
+    series = [FlightSeries(sim) for sim in sims]
+    if not any(len(s) for s in series):
+        logging.error(f"{', '.join(sim.name for sim in sims)}: no flight data to render.")
+        return None
+
+    extension = os.path.splitext(output)[1].lower()
+    if extension not in ('.mp4', '.gif'):
+        render_frames(series, output, fps, speed, workers, dpi, three_d)
+        return output
+    ffmpeg = _find_ffmpeg() if extension == '.mp4' else None
+    if extension == '.mp4' and ffmpeg is None:
+        logging.error("ffmpeg is required to write videos, install it or render a GIF or frames instead.")
+        return None
+
+    with tempfile.TemporaryDirectory(prefix='openrocket-frames-') as directory:
+        frames = render_frames(series, directory, fps, speed, workers, dpi, three_d, gif_palette=extension == '.gif')
+        try:
+            if extension == '.gif':
+                _write_gif(frames, output, fps)
+            else:
+                _write_mp4(frames, output, fps, ffmpeg)
+        except (OSError, subprocess.CalledProcessError) as e:
+            logging.error(f"Could not write {output}: {e}")
+            return None
+    return output
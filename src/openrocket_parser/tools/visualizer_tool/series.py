@@ -0,0 +1,66 @@
+"""
+The flight data drawn by the visualizer, extracted once from a simulation as NumPy arrays.
+"""
+from typing import Sequence
+
+import numpy as np
+
+from openrocket_parser.enums import FlightEventType
+from openrocket_parser.simulations.simulation import Simulation
+
+# Channels drawn by the visualizer
+PLOTTED_CHANNELS = ('time', 'altitude', 'vertical_velocity', 'vertical_acceleration', 'lateral_distance')
+# Channels of the 3-D trajectory, east and north of the launch site
+POSITION_CHANNELS = ('position_east_of_launch', 'position_north_of_launch', 'lateral_direction')
+
+
+class FlightSeries:
+    """
+    The plotted channels of one simulation as contiguous float64 arrays, plus their running maxima,
+    so any playback position is drawn with prefix slices and O(1) lookups instead of filtering the data.
+    """
+
+    def __init__(self, sim: Simulation):
+        self.name = sim.name
+        values = sim.column_values(PLOTTED_CHANNELS + POSITION_CHANNELS)
+        self.time = np.ascontiguousarray(values[:, 0])
+        self.altitude = np.ascontiguousarray(values[:, 1])
+        self.vertical_velocity = np.ascontiguousarray(values[:, 2])
+        self.vertical_acceleration = np.ascontiguousarray(values[:, 3])
+        self.lateral_distance = np.ascontiguousarray(values[:, 4])
+        # Without the position columns, from the lateral direction, counterclockwise from east
+        east, north, direction = values[:, 5], values[:, 6], values[:, 7]
+        self.east = np.where(np.isnan(east), self.lateral_distance * np.cos(direction), east)
+        self.north = np.where(np.isnan(north), self.lateral_distance * np.sin(direction), north)
+
+        # Running maxima for the "Max:" labels, NaN samples are skipped
+        self.max_altitude = np.fmax.accumulate(self.altitude) if len(self) else self.altitude
+        self.max_vertical_velocity = np.fmax.accumulate(self.vertical_velocity) if len(self) else self.vertical_velocity
+        self.max_vertical_acceleration = (
+            np.fmax.accumulate(self.vertical_acceleration) if len(self) else self.vertical_acceleration
+        )
+
+        # Flight events in time order, with the first sample at or after each of them
+        event_index = sim.event_index
+        self.events = list(event_index.events)
+        self.event_times = event_index.times
+        self.event_samples = event_index.samples
+        ground_hit = event_index.samples_of(FlightEventType.GROUND_HIT)
+        self.landing_index = int(ground_hit[0]) if len(ground_hit) and ground_hit[0] < len(self) else len(self) - 1
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    @property
+    def duration(self) -> float:
+        return float(self.time[-1] - self.time[0]) if len(self) else 0.0
+
+    def index_at(self, time: float) -> int:
+        """The last sample at or before `time`, clipped to the data."""
+        index = int(np.searchsorted(self.time, time, side='right')) - 1
+        return min(max(index, 0), len(self) - 1)
+
+
+def common_timeline(series: Sequence[FlightSeries]) -> FlightSeries:
+    """The series lasting the longest. Simulations start at t=0, so it is the time base of an overlay."""
+    return max(series, key=lambda s: float(np.nanmax(s.time)) if len(s) else -np.inf)
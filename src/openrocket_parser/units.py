@@ -1,25 +1,234 @@
 """
 Unit conversion utilities for OpenRocket Parser.
+
+Units are kept in a small registry keyed by their symbol, each one knowing its quantity and how it
+maps to the SI unit of that quantity. Conversions work the same on scalars, NumPy arrays and pandas
+columns: a whole channel is converted with one vectorized multiply (plus an add for temperatures).
 """
+from dataclasses import dataclass
+import re
+from typing import Dict, Optional, Tuple
+
+import numpy as np
 
 METERS_TO_INCHES = 39.3701
 METERS_TO_MILLIMETERS = 1000.0
 MILLIMETERS_PER_INCH = 25.4
 
+STANDARD_GRAVITY = 9.80665
+
+
+@dataclass(frozen=True)
+class Unit:
+    """
+    A unit of a physical quantity. A value in this unit is `value * factor + offset` in the SI unit
+    of the quantity, the offset only being used by temperatures.
+    """
+    symbol: str
+    quantity: str
+    factor: float
+    offset: float = 0.0
+
+
+UNITS: Dict[str, Unit] = {}
+
+
+def register_unit(symbol: str, quantity: str, factor: float, offset: float = 0.0, aliases=()) -> Unit:
+    """Adds a unit to the registry, optionally under several spellings (e.g. 'm/s²' and 'm/s2')."""
+    unit = Unit(symbol, quantity, float(factor), float(offset))
+    for name in (symbol, *aliases):
+        UNITS[name] = unit
+    return unit
+
+
+for _symbol, _quantity, _factor, _aliases in [
+    ('m', 'length', 1.0, ()),
+    ('mm', 'length', 0.001, ()),
+    ('cm', 'length', 0.01, ()),
+    ('km', 'length', 1000.0, ()),
+    ('in', 'length', 0.0254, ('"',)),
+    ('ft', 'length', 0.3048, ("'",)),
+    ('mi', 'length', 1609.344, ()),
+    ('nmi', 'length', 1852.0, ()),
+    ('s', 'time', 1.0, ()),
+    ('ms', 'time', 0.001, ()),
+    ('min', 'time', 60.0, ()),
+    ('h', 'time', 3600.0, ()),
+    ('m/s', 'velocity', 1.0, ()),
+    ('km/h', 'velocity', 1000.0 / 3600.0, ()),
+    ('ft/s', 'velocity', 0.3048, ()),
+    ('mph', 'velocity', 1609.344 / 3600.0, ('mi/h',)),
+    ('kt', 'velocity', 1852.0 / 3600.0, ('kn',)),
+    ('m/s²', 'acceleration', 1.0, ('m/s2', 'm/s^2')),
+    ('ft/s²', 'acceleration', 0.3048, ('ft/s2', 'ft/s^2')),
+    ('G', 'acceleration', STANDARD_GRAVITY, ('g0',)),
+    ('m/s³', 'jerk', 1.0, ('m/s3', 'm/s^3')),
+    ('G/s', 'jerk', STANDARD_GRAVITY, ()),
+    ('kg', 'mass', 1.0, ()),
+    ('g', 'mass', 0.001, ()),
+    ('lb', 'mass', 0.45359237, ('lbm',)),
+    ('oz', 'mass', 0.028349523125, ()),
+    ('N', 'force', 1.0, ()),
+    ('kN', 'force', 1000.0, ()),
+    ('lbf', 'force', 0.45359237 * STANDARD_GRAVITY, ()),
+    ('N·s', 'impulse', 1.0, ('Ns', 'N s')),
+    ('lbf·s', 'impulse', 0.45359237 * STANDARD_GRAVITY, ('lbf s',)),
+    ('Pa', 'pressure', 1.0, ()),
+    ('hPa', 'pressure', 100.0, ()),
+    ('kPa', 'pressure', 1000.0, ()),
+    ('mbar', 'pressure', 100.0, ()),
+    ('bar', 'pressure', 100000.0, ()),
+    ('atm', 'pressure', 101325.0, ()),
+    ('psi', 'pressure', 6894.757293168, ()),
+    ('inHg', 'pressure', 3386.389, ()),
+    ('rad', 'angle', 1.0, ()),
+    ('°', 'angle', np.pi / 180.0, ('deg',)),
+    ('rad/s', 'angular_velocity', 1.0, ()),
+    ('°/s', 'angular_velocity', np.pi / 180.0, ('deg/s',)),
+    ('r/s', 'angular_velocity', 2.0 * np.pi, ('rps',)),
+    ('rpm', 'angular_velocity', 2.0 * np.pi / 60.0, ()),
+    ('m²', 'area', 1.0, ('m2', 'm^2')),
+    ('cm²', 'area', 1e-4, ('cm2', 'cm^2')),
+    ('in²', 'area', 0.0254 ** 2, ('in2', 'in^2')),
+    ('kg·m²', 'moment_of_inertia', 1.0, ('kg m²', 'kgm²', 'kg·m2')),
+    ('g·cm²', 'moment_of_inertia', 1e-7, ('g cm²',)),
+    ('lb·in²', 'moment_of_inertia', 0.45359237 * 0.0254 ** 2, ('lb in²',)),
+    ('kg/m³', 'density', 1.0, ('kg/m3', 'kg/m^3')),
+    ('g/cm³', 'density', 1000.0, ('g/cm3', 'g/cm^3')),
+    ('K', 'temperature', 1.0, ()),
+]:
+    register_unit(_symbol, _quantity, _factor, aliases=_aliases)
+
+register_unit('°C', 'temperature', 1.0, 273.15, aliases=('C', 'degC'))
+register_unit('°F', 'temperature', 5.0 / 9.0, 273.15 - 32.0 * 5.0 / 9.0, aliases=('F', 'degF'))
+
+# SI units of the flight data channels of OpenRocket files, whose XML headers don't carry units
+FLIGHT_DATA_UNITS: Dict[str, str] = {
+    'time': 's',
+    'altitude': 'm',
+    'vertical_velocity': 'm/s',
+    'vertical_acceleration': 'm/s²',
+    'total_velocity': 'm/s',
+    'total_acceleration': 'm/s²',
+    'position_east_of_launch': 'm',
+    'position_north_of_launch': 'm',
+    'lateral_distance': 'm',
+    'lateral_direction': 'rad',
+    'lateral_velocity': 'm/s',
+    'lateral_acceleration': 'm/s²',
+    'latitude': 'rad',
+    'longitude': 'rad',
+    'gravitational_acceleration': 'm/s²',
+    'angle_of_attack': 'rad',
+    'roll_rate': 'rad/s',
+    'pitch_rate': 'rad/s',
+    'yaw_rate': 'rad/s',
+    'mass': 'kg',
+    'motor_mass': 'kg',
+    'longitudinal_moment_of_inertia': 'kg·m²',
+    'rotational_moment_of_inertia': 'kg·m²',
+    'cp_location': 'm',
+    'cg_location': 'm',
+    'thrust': 'N',
+    'drag_force': 'N',
+    'coriolis_acceleration': 'm/s²',
+    'reference_length': 'm',
+    'reference_area': 'm²',
+    'vertical_orientation_zenith': 'rad',
+    'lateral_orientation_azimuth': 'rad',
+    'wind_velocity': 'm/s',
+    'air_temperature': 'K',
+    'air_pressure': 'Pa',
+    'speed_of_sound': 'm/s',
+    'simulation_time_step': 's',
+    'computation_time': 's',
+}
+
+# SI units of the numeric component fields, by attribute name. OpenRocket stores angles in degrees
+COMPONENT_FIELD_UNITS: Dict[str, str] = {
+    **{name: 'm' for name in (
+        'length', 'radius', 'position', 'thickness', 'outerradius', 'innerradius', 'instanceseparation',
+        'axialoffset', 'radialposition', 'packedlength', 'packedradius', 'cordlength', 'deployaltitude',
+        'diameter', 'linelength', 'outerdiameter', 'innerdiameter', 'height', 'baseheight', 'flangeheight',
+        'screwheight', 'rootchord', 'tipchord', 'sweeplength', 'tabheight', 'tablength', 'tabposition',
+        'filletradius', 'overhang', 'radiusoffset',
+    )},
+    **{name: '°' for name in ('radialdirection', 'angleoffset', 'cant', 'rotation', 'clusterrotation')},
+    'mass': 'kg',
+    'overridemass': 'kg',
+    'deploydelay': 's',
+}
+
+_UNIT_SUFFIX = re.compile(r'^(?P<label>.*?)\s*\((?P<unit>[^()]*)\)\s*$')
+
+
+def get_unit(symbol: str) -> Unit:
+    """Looks a unit up by its symbol, raising a ValueError for unknown units."""
+    unit = UNITS.get(symbol.strip()) if isinstance(symbol, str) else None
+    if unit is None:
+        raise ValueError(f"Unknown unit '{symbol}'")
+    return unit
+
+
+def conversion(from_unit: str, to_unit: str) -> Tuple[float, float]:
+    """
+    The (scale, offset) pair so that `value * scale + offset` converts from `from_unit` to `to_unit`.
+    Raises a ValueError when the units measure different quantities.
+    """
+    source, target = get_unit(from_unit), get_unit(to_unit)
+    if source.quantity != target.quantity:
+        raise ValueError(f"Cannot convert {source.quantity} in '{from_unit}' to {target.quantity} in '{to_unit}'")
+    scale = source.factor / target.factor
+    return scale, (source.offset - target.offset) / target.factor
+
+
+def convert(values, from_unit: str, to_unit: str):
+    """
+    Converts a scalar, array or pandas column between two units of the same quantity,
+    e.g. `convert(sim.flight_data['altitude'], 'm', 'ft')`. Arrays are converted in one vectorized
+    operation and keep their type; None is treated as 0.
+    """
+    if values is None:
+        values = 0.0
+    scale, offset = conversion(from_unit, to_unit)
+    if isinstance(values, (list, tuple)):
+        values = np.asarray(values, dtype=np.float64)
+    converted = values * scale
+    return converted + offset if offset else converted
+
+
+def split_unit(header: str) -> Tuple[str, Optional[str]]:
+    """
+    Splits a trailing unit off a column header: 'Vertical acceleration (m/s²)' gives
+    ('Vertical acceleration', 'm/s²'). A trailing parenthesis that isn't a known unit, as in
+    'Vertical orientation (zenith)', is kept in the label and the unit is None.
+    """
+    match = _UNIT_SUFFIX.match(header.strip())
+    if match and match.group('unit').strip() in UNITS:
+        return match.group('label'), UNITS[match.group('unit').strip()].symbol
+    return header.strip(), None
+
+
+def _zero_if_none(value):
+    """Replaces a missing value by 0 without testing the truth of arrays."""
+    return 0.0 if value is None else value
+
+
 def meters_to_inches(meters):
     """Converts meters to inches."""
-    return (meters or 0.0) * METERS_TO_INCHES
+    return _zero_if_none(meters) * METERS_TO_INCHES
+
 
 def meters_to_millimeters(meters):
     """Converts meters to millimeters."""
-    return (meters or 0.0) * METERS_TO_MILLIMETERS
+    return _zero_if_none(meters) * METERS_TO_MILLIMETERS
+
 
 def inches_to_millimeters(inches):
     """Converts inches to millimeters."""
-    return (inches or 0.0) * MILLIMETERS_PER_INCH
+    return _zero_if_none(inches) * MILLIMETERS_PER_INCH
+
 
 def millimeters_to_inches(millimeters):
     """Converts millimeters to inches."""
-    if millimeters is None:
-        return 0.0
-    return millimeters / MILLIMETERS_PER_INCH
+    return _zero_if_none(millimeters) / MILLIMETERS_PER_INCH
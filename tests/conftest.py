@@ -0,0 +1,20 @@
+from dataclasses import replace
+from os.path import dirname, join
+
+import pytest
+
+from openrocket_parser.simulations.loader import load_simulations_from_xml
+
+SAMPLE = join(dirname(__file__), "sample.ork")
+
+
+@pytest.fixture(scope="session")
+def sample_sims():
+    """Loads all the simulations of the sample.ork file, once for the whole session."""
+    return load_simulations_from_xml(SAMPLE)
+
+
+@pytest.fixture
+def sample_sim(sample_sims):
+    """The first simulation of the sample.ork file, with a fresh copy of the flight data the test may modify."""
+    return replace(sample_sims[0], flight_data=sample_sims[0].flight_data.copy())
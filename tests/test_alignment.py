@@ -0,0 +1,72 @@
+import gzip
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from openrocket_parser.simulations.alignment import align, estimate_time_offset, residuals
+from openrocket_parser.simulations.loader import TelemetryCsvLoader
+
+
+@pytest.fixture
+def altimeter_log(sample_sim, tmp_path):
+    """Writes a 1 kHz altimeter log in feet and milliseconds, recorded 3.25 s late with some noise."""
+    time = np.arange(-5.0, 170.0, 0.001)
+    altitude = np.interp(time - 3.25, sample_sim.flight_data["time"], sample_sim.flight_data["altitude"],
+                         left=0.0, right=0.0)
+    altitude += np.random.default_rng(0).normal(0.0, 0.3, len(time))
+    path = tmp_path / "altimeter.csv"
+    pd.DataFrame({"Time (ms)": time * 1000.0, "Alt (ft)": altitude / 0.3048, "Temp": 20.0}).to_csv(path, index=False)
+    return str(path)
+
+
+def _load_log(path):
+    return TelemetryCsvLoader(
+        path,
+        column_map={"Time (ms)": "time", "Alt (ft)": "altitude"},
+        scales={"time": 0.001, "altitude": 0.3048},
+        chunk_size=50_000,
+    ).load()[0]
+
+
+def test_telemetry_loader_maps_and_scales(altimeter_log):
+    telemetry = _load_log(altimeter_log)
+
+    assert list(telemetry.flight_data.columns) == ["time", "altitude"]
+    assert len(telemetry.flight_data) == 175_000
+    assert telemetry.flight_data["time"].iloc[0] == pytest.approx(-5.0)
+    assert telemetry.flight_data["altitude"].max() == pytest.approx(502.9, abs=2.0)
+
+
+def test_telemetry_loader_missing_file(tmp_path):
+    assert TelemetryCsvLoader(str(tmp_path / "missing.csv")).load() == []
+
+
+def test_telemetry_loader_missing_column(altimeter_log):
+    with pytest.raises(KeyError, match="Alt \\(m\\)"):
+        TelemetryCsvLoader(altimeter_log, column_map={"Time (ms)": "time", "Alt (m)": "altitude"}).load()
+
+
+def test_telemetry_loader_compressed_file(altimeter_log, tmp_path):
+    # The line count of a compressed file is no bound of its rows, the array grows instead
+    path = str(tmp_path / "altimeter.csv.gz")
+    with open(altimeter_log, 'rb') as source, gzip.open(path, 'wb') as compressed:
+        shutil.copyfileobj(source, compressed)
+    telemetry = _load_log(path)
+    assert len(telemetry.flight_data) == 175_000
+    np.testing.assert_array_equal(telemetry.flight_data["altitude"], _load_log(altimeter_log).flight_data["altitude"])
+
+
+def test_estimate_offset_and_align(sample_sim, altimeter_log):
+    telemetry = _load_log(altimeter_log)
+
+    assert estimate_time_offset(sample_sim, telemetry, dt=0.01) == pytest.approx(3.25, abs=0.02)
+    assert estimate_time_offset(sample_sim, telemetry, max_offset=5.0) == pytest.approx(3.25, abs=0.05)
+    assert abs(estimate_time_offset(sample_sim, telemetry, dt=0.01, max_offset=1.0)) <= 1.0
+
+    aligned, offset = align(sample_sim, telemetry)
+    assert offset == pytest.approx(3.25, abs=0.05)
+    stats = residuals(sample_sim, aligned).loc["altitude"]
+    assert abs(stats["mean"]) < 0.5
+    assert stats["std"] < 2.0
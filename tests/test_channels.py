@@ -0,0 +1,114 @@
+from dataclasses import replace
+from os.path import dirname, join
+
+import numpy as np
+import pytest
+
+from openrocket_parser import compute_metrics
+from openrocket_parser.simulations.channels import DERIVED_CHANNELS, register_channel
+from openrocket_parser.simulations.loader import CsvSimulationLoader, load_simulations_from_xml
+
+
+@pytest.fixture
+def counted_channel():
+    calls = []
+
+    @register_channel('test_altitude_km', ('altitude',), unit='km')
+    def altitude_km(altitude):
+        calls.append(1)
+        return altitude / 1000.0
+
+    yield calls
+    del DERIVED_CHANNELS['test_altitude_km']
+
+
+def test_derived_values(sample_sim):
+    metrics = compute_metrics([sample_sim])
+    assert np.nanmax(sample_sim.channel('dynamic_pressure')) == pytest.approx(metrics['max_q'][0])
+    np.testing.assert_allclose(
+        sample_sim.channel('total_acceleration_g'), sample_sim.channel('total_acceleration') / 9.80665
+    )
+    assert sample_sim.channel('jerk').shape == (len(sample_sim.flight_data),)
+
+    # Columns take precedence, the derived drag is only used when the log has no drag column
+    np.testing.assert_array_equal(sample_sim.channel('drag_force'), sample_sim.flight_data['drag_force'].to_numpy())
+    without_drag = replace(sample_sim, flight_data=sample_sim.flight_data.drop(columns=['drag_force']))
+    time = sample_sim.channel('time')
+    coast = (time > 3.0) & (time < 10.0)
+    relative_error = np.abs(without_drag.channel('drag_force') - sample_sim.channel('drag_force')) / sample_sim.channel('drag_force')
+    assert np.nanmedian(relative_error[coast]) < 0.05
+
+
+def test_channels_are_cached(sample_sim, counted_channel):
+    first = sample_sim.channel('test_altitude_km')
+    second = sample_sim.channel('test_altitude_km')
+    assert first is second
+    assert len(counted_channel) == 1
+    assert not first.flags.writeable
+
+    # Replacing a source column invalidates the cached channel
+    sample_sim.flight_data['altitude'] = sample_sim.flight_data['altitude'] * 2.0
+    assert sample_sim.channel('test_altitude_km')[-1] == pytest.approx(first[-1] * 2.0)
+    assert len(counted_channel) == 2
+
+    sample_sim.invalidate_channels()
+    sample_sim.channel('test_altitude_km')
+    assert len(counted_channel) == 3
+
+
+def test_derived_dependencies_are_cached(sample_sim):
+    sample_sim.channel('dynamic_pressure')
+    density = sample_sim.channel('air_density')
+    sample_sim.channel('dynamic_pressure')
+    assert sample_sim.channel('air_density') is density
+
+
+def test_unknown_or_missing_channels(sample_sim):
+    with pytest.raises(KeyError):
+        sample_sim.channel('not_a_channel')
+    no_pressure = replace(sample_sim, flight_data=sample_sim.flight_data.drop(columns=['air_pressure']))
+    with pytest.raises(KeyError):
+        no_pressure.channel('dynamic_pressure')
+
+
+def test_numpy_backend(sample_sims, counted_channel):
+    sim = load_simulations_from_xml(join(dirname(__file__), "sample.ork"), backend='numpy')[0]
+    np.testing.assert_allclose(sim.channel('dynamic_pressure'), sample_sims[0].channel('dynamic_pressure'))
+
+    # FlightData overwrites columns in place, which also invalidates the cache
+    first = sim.channel('test_altitude_km').copy()
+    sim.flight_data['altitude'] = 0.0
+    assert np.all(sim.channel('test_altitude_km') == 0.0) and first.max() > 0
+    assert len(counted_channel) == 2
+
+
+def test_sources_are_converted_to_si(sample_sim, tmp_path):
+    # An OpenRocket CSV export with the temperature in °C and the pressure in mbar
+    path = tmp_path / "export.csv"
+    columns = sample_sim.column_values(['time', 'total_velocity', 'air_temperature', 'air_pressure'])
+    columns[:, 2] -= 273.15
+    columns[:, 3] /= 100.0
+    with open(path, 'w', encoding='utf-8') as csv_file:
+        csv_file.write("# Time (s),Total velocity (m/s),Air temperature (°C),Air pressure (mbar)\n")
+        for row in columns:
+            csv_file.write(','.join(repr(float(v)) for v in row) + '\n')
+
+    exported = CsvSimulationLoader(str(path)).load()[0]
+    assert exported.units['air_pressure'] == 'mbar'
+    np.testing.assert_allclose(exported.channel('dynamic_pressure'), sample_sim.channel('dynamic_pressure'), rtol=1e-9)
+    # The columns themselves stay in the units of the file
+    np.testing.assert_allclose(exported.channel('air_pressure'), columns[:, 3])
+
+    # Changing a unit recomputes the channel
+    exported.units['air_pressure'] = 'hPa'
+    np.testing.assert_allclose(exported.channel('dynamic_pressure'), sample_sim.channel('dynamic_pressure'), rtol=1e-9)
+    exported.units['air_pressure'] = 'kPa'
+    np.testing.assert_allclose(exported.channel('dynamic_pressure'), 10.0 * sample_sim.channel('dynamic_pressure'),
+                               rtol=1e-9)
+
+
+def test_in_place_writes_need_invalidation(sample_sim):
+    before = sample_sim.channel('total_acceleration_g').copy()
+    sample_sim.flight_data.loc[:, 'total_acceleration'] = 2.0 * sample_sim.flight_data['total_acceleration']
+    sample_sim.invalidate_channels()
+    np.testing.assert_allclose(sample_sim.channel('total_acceleration_g'), 2.0 * before)
@@ -0,0 +1,75 @@
+import json
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from openrocket_parser.simulations.simulation import Simulation
+
+
+def test_save_writes_manifest_and_columns(sample_sim, tmp_path):
+    sample_sim.save_columns(str(tmp_path))
+
+    with open(tmp_path / "manifest.json") as manifest_file:
+        manifest = json.load(manifest_file)
+
+    assert manifest["name"] == sample_sim.name
+    assert manifest["length"] == len(sample_sim.flight_data)
+    assert [c["name"] for c in manifest["columns"]] == list(sample_sim.flight_data.columns)
+    assert len(manifest["events"]) == len(sample_sim.events)
+    altitude_file = next(c["file"] for c in manifest["columns"] if c["name"] == "altitude")
+    assert (tmp_path / altitude_file).stat().st_size == len(sample_sim.flight_data) * 8
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_round_trip(sample_sim, tmp_path, mmap):
+    sample_sim.save_columns(str(tmp_path))
+    reopened = Simulation.open_columns(str(tmp_path), mmap=mmap)
+
+    assert reopened.name == sample_sim.name
+    assert reopened.summary == sample_sim.summary
+    assert reopened.events == sample_sim.events
+    pd.testing.assert_frame_equal(reopened.flight_data, sample_sim.flight_data)
+
+
+def test_mmap_columns_are_not_copied(sample_sim, tmp_path):
+    sample_sim.save_columns(str(tmp_path))
+    reopened = Simulation.open_columns(str(tmp_path), mmap=True)
+
+    altitude = reopened.flight_data["altitude"].to_numpy()
+    # Walk the view chain down to the buffer that owns the data
+    owner = altitude
+    while owner.base is not None and isinstance(owner.base, np.ndarray):
+        owner = owner.base
+    assert isinstance(owner, np.memmap)
+
+
+def test_open_rejects_truncated_column(sample_sim, tmp_path):
+    sample_sim.save_columns(str(tmp_path))
+    with open(tmp_path / "manifest.json") as manifest_file:
+        manifest = json.load(manifest_file)
+    column_path = tmp_path / manifest["columns"][0]["file"]
+    column_path.write_bytes(column_path.read_bytes()[:16])
+
+    with pytest.raises(ValueError):
+        Simulation.open_columns(str(tmp_path), mmap=False)
+
+
+def test_column_values_only_read_requested_columns(tmp_path):
+    # 40 channels of 100k samples on disk, 32 MB, of which 2 channels are read
+    data = np.random.default_rng(0).random((100_000, 40))
+    columns = ['time', 'altitude'] + [f'channel_{i}' for i in range(38)]
+    Simulation(name='long', description='', motor_config='default',
+               flight_data=pd.DataFrame(data, columns=columns)).save_columns(str(tmp_path))
+    reopened = Simulation.open_columns(str(tmp_path), mmap=True)
+
+    tracemalloc.start()
+    try:
+        values = reopened.column_values(['altitude', 'not_a_column', 'time'])
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    np.testing.assert_array_equal(values[:, [0, 2]], data[:, [1, 0]])
+    assert np.isnan(values[:, 1]).all()
+    assert peak < 2 * values.nbytes
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from openrocket_parser.simulations.loader import CsvSimulationLoader
+
+
+def _write_openrocket_csv(sim, path):
+    """Writes the simulation the way OpenRocket exports it, with the header and events as comments."""
+    time = sim.flight_data['time'].to_numpy()
+    events = sorted(sim.events, key=lambda e: e.time)
+    names = {'groundhit': 'GROUND_HIT', 'launchrod': 'Launch rod clearance'}
+    with open(path, 'w', encoding='utf-8') as csv_file:
+        csv_file.write(f"# {sim.name}\n")
+        csv_file.write(f"# {len(events)} events\n")
+        csv_file.write("# Time (s),Altitude (m),Vertical velocity (m/s),Vertical acceleration (m/s²),Mach number ()\n")
+        for row, t in enumerate(time):
+            while events and events[0].time <= t:
+                event = events.pop(0)
+                csv_file.write(f"# Event {names.get(event.type, event.type.upper())} occurred at t={event.time} seconds\n")
+            values = sim.flight_data.iloc[row][['time', 'altitude', 'vertical_velocity', 'vertical_acceleration',
+                                                'mach_number']]
+            csv_file.write(','.join(repr(float(v)) for v in values) + '\n')
+
+
+def test_streaming_blocks(sample_sim, tmp_path):
+    path = tmp_path / 'export.csv'
+    _write_openrocket_csv(sample_sim, path)
+
+    loader = CsvSimulationLoader(str(path), block_size=100, dtype=np.float32)
+    blocks = list(loader.iter_blocks())
+    assert loader.columns == ['time', 'altitude', 'vertical_velocity', 'vertical_acceleration', 'mach_number']
+    assert loader.units['vertical_acceleration'] == 'm/s²'
+    assert all(len(block['time']) <= 100 for block in blocks)
+    assert all(block['altitude'].dtype == np.float32 for block in blocks)
+    altitude = np.concatenate([block['altitude'] for block in blocks])
+    np.testing.assert_allclose(altitude, sample_sim.flight_data['altitude'].to_numpy(), rtol=1e-6)
+
+
+def test_load_parses_events(sample_sim, tmp_path):
+    path = tmp_path / 'export.csv'
+    _write_openrocket_csv(sample_sim, path)
+
+    sim = CsvSimulationLoader(str(path), block_size=64).load()[0]
+    assert len(sim.flight_data) == len(sample_sim.flight_data)
+    assert [e.type for e in sim.events] == [e.type for e in sorted(sample_sim.events, key=lambda e: e.time)]
+    assert sim.value_at('altitude', 'apogee') == pytest.approx(sample_sim.value_at('altitude', 'apogee'))
+    assert 'groundhit' in sim.event_index and 'launchrod' in sim.event_index
+
+
+def test_plain_header(tmp_path):
+    path = tmp_path / 'plain.csv'
+    path.write_text("Time (s),Altitude (ft)\n0,0\n# Event APOGEE occurred at t=0.5 seconds\n1,10\n2,5\n")
+    sim = CsvSimulationLoader(str(path)).load()[0]
+    assert sim.flight_data['altitude'].tolist() == [0.0, 10.0, 5.0]
+    assert sim.units == {'time': 's', 'altitude': 'ft'}
+    assert sim.events[0].type == 'apogee' and sim.events[0].time == 0.5
+
+
+def test_missing_file():
+    assert CsvSimulationLoader('does_not_exist.csv').load() == []
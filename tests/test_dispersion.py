@@ -0,0 +1,92 @@
+import json
+from dataclasses import replace
+from os.path import join, dirname
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from openrocket_parser.simulations.dispersion import LandingDispersion, landing_points
+from openrocket_parser.simulations.loader import load_simulations_from_xml
+from openrocket_parser.simulations.simulation import Simulation
+from openrocket_parser.simulations.simulation_data import FlightEvent
+
+
+def _landing_sim(name, east, north):
+    time = np.array([0.0, 1.0, 2.0])
+    return Simulation(
+        name=name, description="", motor_config="default",
+        events=[FlightEvent(time=1.0, type="groundhit")],
+        flight_data=pd.DataFrame({
+            "time": time,
+            "position_east_of_launch": [0.0, east, east + 100.0],
+            "position_north_of_launch": [0.0, north, north + 100.0],
+            "lateral_distance": [0.0, np.hypot(east, north), 1000.0],
+        }),
+        conditions={"launchlatitude": 30.0, "launchlongitude": -100.0},
+    )
+
+
+def test_landing_points_use_ground_hit():
+    points = landing_points([_landing_sim("a", 30.0, 40.0)])
+
+    assert points["east"].iloc[0] == 30.0
+    assert points["north"].iloc[0] == 40.0
+    assert points["drift"].iloc[0] == pytest.approx(50.0)
+    assert points["max_drift"].iloc[0] == 1000.0
+    assert points["latitude"].iloc[0] > 30.0
+    assert points["longitude"].iloc[0] > -100.0
+
+
+def test_landing_points_from_sample_file():
+    sims = load_simulations_from_xml(join(dirname(__file__), "sample.ork"))
+    points = landing_points(sims)
+
+    assert list(points["drift"].round(3)) == [266.907, 381.651, 333.875]
+    assert (points["launch_latitude"] == 28.61).all()
+
+
+def test_landing_points_in_degrees(sample_sims):
+    # A CSV export: angles in degrees, lengths in feet, and no launch site in the conditions
+    columns = ['position_east_of_launch', 'position_north_of_launch']
+    sims = [replace(sim, flight_data=sim.flight_data.drop(columns=columns), conditions={}) for sim in sample_sims]
+    exported = [sim.convert_units({'lateral_direction': '°', 'latitude': '°', 'longitude': '°',
+                                   'lateral_distance': 'ft'}) for sim in sims]
+
+    expected, points = landing_points(sims), landing_points(exported)
+    for column in ('east', 'north', 'drift', 'latitude', 'longitude'):
+        np.testing.assert_allclose(points[column], expected[column], rtol=1e-9)
+    np.testing.assert_allclose(points['latitude'], 28.6, atol=0.05)
+
+
+def test_ellipses():
+    sims = [_landing_sim(str(i), east, north) for i, (east, north) in
+            enumerate([(-20.0, 0.0), (20.0, 0.0), (0.0, -10.0), (0.0, 10.0)])]
+    dispersion = LandingDispersion.from_simulations(sims)
+
+    one_sigma, two_sigma, _ = dispersion.ellipses()
+    np.testing.assert_allclose(dispersion.mean, [0.0, 0.0], atol=1e-12)
+    assert one_sigma.semi_major == pytest.approx(np.sqrt(800.0 / 3.0))
+    assert one_sigma.semi_minor == pytest.approx(np.sqrt(200.0 / 3.0))
+    assert abs(np.cos(one_sigma.angle)) == pytest.approx(1.0)
+    assert two_sigma.semi_major == pytest.approx(2.0 * one_sigma.semi_major)
+    assert dispersion.ellipse(probability=one_sigma.probability).sigma == pytest.approx(1.0)
+    assert dispersion.max_drift == pytest.approx(20.0)
+    with pytest.raises(ValueError):
+        dispersion.ellipse()
+
+
+def test_exports(tmp_path):
+    sims = [_landing_sim("a", 10.0, 0.0), _landing_sim("b", -10.0, 5.0)]
+    dispersion = LandingDispersion.from_simulations(sims)
+
+    dispersion.to_csv(str(tmp_path / "points.csv"))
+    dispersion.ellipses_to_csv(str(tmp_path / "ellipses.csv"))
+    dispersion.to_geojson(str(tmp_path / "landing.geojson"))
+
+    assert list(pd.read_csv(tmp_path / "points.csv")["name"]) == ["a", "b"]
+    assert list(pd.read_csv(tmp_path / "ellipses.csv")["sigma"]) == [1.0, 2.0, 3.0]
+    with open(tmp_path / "landing.geojson") as geojson_file:
+        collection = json.load(geojson_file)
+    kinds = [feature["properties"]["kind"] for feature in collection["features"]]
+    assert kinds == ["landing", "landing", "ellipse", "ellipse", "ellipse"]
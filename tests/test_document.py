@@ -0,0 +1,64 @@
+from os.path import join, dirname
+import zipfile
+
+import pytest
+
+from openrocket_parser.document import OrkDocument
+from openrocket_parser.simulations.loader import load_simulations_from_xml
+
+
+@pytest.fixture
+def sample_ork_path():
+    """Returns the path to the plain XML sample.ork file."""
+    return join(dirname(__file__), "sample.ork")
+
+
+@pytest.fixture
+def zipped_ork_path(sample_ork_path, tmp_path):
+    """Packs the sample into a ZIP container, the way OpenRocket saves compressed designs."""
+    zipped_path = tmp_path / "zipped.ork"
+    with zipfile.ZipFile(zipped_path, "w", zipfile.ZIP_DEFLATED) as zip_ref:
+        zip_ref.write(sample_ork_path, "rocket.ork")
+    return str(zipped_path)
+
+
+def test_document_views_are_lazy(sample_ork_path):
+    document = OrkDocument.open(sample_ork_path)
+
+    assert "rocket" not in document.__dict__
+    assert "simulations" not in document.__dict__
+
+    assert document.rocket.name == "Version3"
+    assert document.rocket is document.rocket
+    assert "simulations" not in document.__dict__
+
+
+@pytest.mark.parametrize("path_fixture", ["sample_ork_path", "zipped_ork_path"])
+def test_document_reads_plain_and_zipped_files(path_fixture, request):
+    document = OrkDocument.open(request.getfixturevalue(path_fixture))
+
+    assert document.rocket.name == "Version3"
+    assert len(document.simulations) == 3
+    assert document.simulations[0].name == "Sim 1 - H97J-6"
+
+
+def test_loader_reads_zipped_files(zipped_ork_path):
+    assert len(load_simulations_from_xml(zipped_ork_path)) == 3
+
+
+def test_document_invalid_file(tmp_path):
+    invalid_path = tmp_path / "invalid.ork"
+    invalid_path.write_text("<openrocket><rocket>")
+
+    with pytest.raises(ValueError):
+        OrkDocument.open(str(invalid_path))
+
+
+def test_document_without_rocket(tmp_path):
+    path = tmp_path / "no_rocket.ork"
+    path.write_text("<openrocket><simulations/></openrocket>")
+    document = OrkDocument.open(str(path))
+
+    assert document.simulations == []
+    with pytest.raises(ValueError):
+        _ = document.rocket
@@ -0,0 +1,69 @@
+from os.path import join, dirname
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from openrocket_parser.simulations.ensemble import Ensemble
+from openrocket_parser.simulations.loader import load_simulations_from_xml
+from openrocket_parser.simulations.resampling import interpolate_columns
+from openrocket_parser.simulations.simulation import Simulation
+
+
+def _ramp(name, end_time, slope):
+    time = np.linspace(0.0, end_time, int(end_time * 10) + 1)
+    return Simulation(
+        name=name, description="", motor_config="default",
+        flight_data=pd.DataFrame({"time": time, "altitude": slope * time, "mass": np.ones_like(time)}),
+    )
+
+
+def test_interpolate_columns():
+    time = np.array([0.0, 1.0, 3.0])
+    values = np.array([[0.0, 10.0], [1.0, 20.0], [3.0, 40.0]])
+    grid = np.array([-1.0, 0.5, 2.0, 3.0, 4.0])
+
+    linear = interpolate_columns(time, values, grid, "linear")
+    previous = interpolate_columns(time, values, grid, "previous")
+
+    np.testing.assert_allclose(linear[1:4], [[0.5, 15.0], [2.0, 30.0], [3.0, 40.0]])
+    np.testing.assert_allclose(previous[1:4], [[0.0, 10.0], [1.0, 20.0], [3.0, 40.0]])
+    assert np.isnan(linear[[0, 4]]).all()
+    with pytest.raises(ValueError):
+        interpolate_columns(time, values, grid, "cubic")
+
+
+def test_ensemble_statistics():
+    ensemble = Ensemble.from_simulations([_ramp("a", 2.0, 1.0), _ramp("b", 2.0, 3.0), _ramp("c", 1.0, 5.0)], dt=0.5)
+
+    assert ensemble.data.shape == (3, 5, 2)
+    assert ensemble.data.flags["C_CONTIGUOUS"]
+    assert ensemble.channels == ["altitude", "mass"]
+    np.testing.assert_allclose(ensemble.time, [0.0, 0.5, 1.0, 1.5, 2.0])
+    # The shorter run has no data after its end, and doesn't count in the statistics
+    assert list(ensemble.valid[2]) == [True, True, True, False, False]
+    np.testing.assert_allclose(ensemble.mean("altitude"), [0.0, 1.5, 3.0, 3.0, 4.0])
+    np.testing.assert_allclose(ensemble.percentile(50, "altitude")[-1], 4.0)
+    low, mean, high = ensemble.envelope("altitude", sigma=2.0)
+    np.testing.assert_allclose(high - mean, 2.0 * ensemble.std("altitude"))
+    assert ensemble.mean().shape == (5, 2)
+
+
+def test_ensemble_run_selection():
+    ensemble = Ensemble.from_simulations([_ramp("a", 2.0, 1.0), _ramp("b", 2.0, 3.0)], channels=["altitude"])
+
+    apogees = ensemble.run_values("altitude")
+    np.testing.assert_allclose(apogees, [2.0, 6.0])
+    high_runs = ensemble.select(apogees > 3.0)
+    assert high_runs.names == ["b"]
+    assert len(high_runs) == 1
+    with pytest.raises(KeyError):
+        ensemble.channel("mass")
+
+
+def test_ensemble_from_sample_file():
+    sims = load_simulations_from_xml(join(dirname(__file__), "sample.ork"))
+    ensemble = Ensemble.from_simulations(sims, channels=["altitude", "vertical_velocity"], dt=0.05)
+
+    assert len(ensemble) == 3
+    np.testing.assert_allclose(ensemble.run_values("altitude"), [sim.summary["maxaltitude"] for sim in sims], atol=1.0)
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from openrocket_parser.enums import FlightEventType
+from openrocket_parser.simulations.simulation import Simulation
+from openrocket_parser.simulations.simulation_data import FlightEvent, EventIndex
+
+
+def test_event_index_aligns_samples():
+    time = np.array([0.0, 0.5, 1.0, 1.5, 2.0])
+    events = [
+        FlightEvent(time=1.2, type="apogee"),
+        FlightEvent(time=0.0, type="launch"),
+        FlightEvent(time=5.0, type="groundhit"),
+    ]
+    index = EventIndex(events, time)
+
+    assert list(index.types) == ["launch", "apogee", "groundhit"]
+    assert index.sample_of("launch") == 0
+    assert index.sample_of("APOGEE") == 3
+    # Events after the last sample are clamped to it
+    assert index.sample_of(FlightEventType.GROUND_HIT) == 4
+    assert "burnout" not in index
+    with pytest.raises(KeyError):
+        index.sample_of("burnout")
+
+
+def test_value_at_event(sample_sim):
+    assert sample_sim.value_at("altitude", FlightEventType.APOGEE) == sample_sim.summary["maxaltitude"]
+    assert sample_sim.event_index.time_of("apogee") == sample_sim.summary["timetoapogee"]
+
+
+def test_events_between(sample_sim):
+    events = sample_sim.events_between(0.1, 3.0)
+    assert [evt.type for evt in events] == ["launchrod", "burnout"]
+
+
+def test_window_is_a_view(sample_sim):
+    window = sample_sim.window("burnout", "ejectioncharge")
+
+    assert window["time"].iloc[0] == pytest.approx(2.336)
+    assert window["time"].iloc[-1] == pytest.approx(8.336)
+    assert np.shares_memory(window["altitude"].to_numpy(), sample_sim.flight_data["altitude"].to_numpy())
+
+
+def test_window_with_times_and_open_ends(sample_sim):
+    assert len(sample_sim.window()) == len(sample_sim.flight_data)
+    # A time ends the window at the first sample at or after it
+    window_times = sample_sim.window(None, 1.0)["time"]
+    assert window_times.iloc[-2] < 1.0 <= window_times.iloc[-1]
+    assert sample_sim.window("apogee")["time"].iloc[-1] == sample_sim.flight_data["time"].iloc[-1]
+
+
+def test_event_index_is_rebuilt_when_data_changes():
+    sim = Simulation(
+        name="test", description="", motor_config="default",
+        events=[FlightEvent(time=1.0, type="apogee")],
+        flight_data=pd.DataFrame({"time": [0.0, 1.0, 2.0]}),
+    )
+    assert sim.event_index.sample_of("apogee") == 1
+
+    sim.flight_data = pd.DataFrame({"time": [0.0, 0.5, 1.0, 1.5]})
+    assert sim.event_index.sample_of("apogee") == 2
@@ -0,0 +1,82 @@
+from os.path import dirname, join
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from openrocket_parser import compute_metrics
+from openrocket_parser.simulations.flight_data import FlightData
+from openrocket_parser.simulations.loader import CsvSimulationLoader, load_simulations_from_xml
+from openrocket_parser.simulations.simulation import Simulation
+
+SAMPLE = join(dirname(__file__), "sample.ork")
+
+
+@pytest.fixture(scope="module")
+def numpy_sims():
+    return load_simulations_from_xml(SAMPLE, backend='numpy')
+
+
+def test_flight_data_container():
+    data = FlightData(np.array([[0.0, 1.0], [1.0, 3.0], [2.0, 2.0]]), ['time', 'altitude'])
+    assert len(data) == 3 and data.columns == ['time', 'altitude'] and 'altitude' in data
+    assert data['altitude'].tolist() == [1.0, 3.0, 2.0]
+    assert data['altitude'].flags.c_contiguous
+    assert data.iloc[1:].to_numpy().tolist() == [[1.0, 3.0], [2.0, 2.0]]
+    assert data.take([0, 2])['time'].tolist() == [0.0, 2.0]
+
+    copy = data.copy()
+    copy['altitude'] = 0.0
+    copy['mach_number'] = [0.1, 0.2, 0.3]
+    assert data['altitude'].tolist() == [1.0, 3.0, 2.0]
+    assert copy.columns == ['time', 'altitude', 'mach_number']
+    with pytest.raises(KeyError):
+        data['velocity']
+    with pytest.raises(ValueError):
+        FlightData(np.zeros((3, 3)), ['time'])
+
+
+def test_to_pandas_does_not_copy(numpy_sims):
+    flight_data = numpy_sims[0].flight_data
+    frame = flight_data.to_pandas()
+    assert isinstance(frame, pd.DataFrame)
+    assert np.shares_memory(frame['altitude'].to_numpy(), flight_data['altitude'])
+    assert numpy_sims[0].with_backend('pandas').flight_data.columns.tolist() == flight_data.columns
+
+
+def test_numpy_backend_matches_pandas(sample_sims, numpy_sims):
+    assert isinstance(numpy_sims[0].flight_data, FlightData)
+    np.testing.assert_array_equal(
+        numpy_sims[0].flight_data.to_numpy(), sample_sims[0].flight_data.to_numpy(dtype=np.float64)
+    )
+    pd.testing.assert_frame_equal(compute_metrics(numpy_sims), compute_metrics(sample_sims))
+
+    sim = numpy_sims[0]
+    assert sim.value_at('altitude', 'apogee') == sample_sims[0].value_at('altitude', 'apogee')
+    window = sim.window('burnout', 'apogee')
+    assert isinstance(window, FlightData)
+    assert len(window) == len(sample_sims[0].window('burnout', 'apogee'))
+    assert isinstance(sim.resample(0.1).flight_data, FlightData)
+    downsampled = sim.downsample(100)
+    assert isinstance(downsampled.flight_data, FlightData)
+    assert downsampled.flight_data['altitude'].max() == sim.flight_data['altitude'].max()
+
+
+def test_column_store_numpy_backend(numpy_sims, tmp_path):
+    numpy_sims[0].save_columns(str(tmp_path))
+    reopened = Simulation.open_columns(str(tmp_path), backend='numpy')
+    assert isinstance(reopened.flight_data, FlightData)
+    np.testing.assert_array_equal(reopened.flight_data.to_numpy(), numpy_sims[0].flight_data.to_numpy())
+
+
+def test_csv_numpy_backend(tmp_path):
+    path = tmp_path / 'plain.csv'
+    path.write_text("Time (s),Altitude (m)\n0,0\n# Event APOGEE occurred at t=1 seconds\n1,10\n2,5\n")
+    sim = CsvSimulationLoader(str(path), backend='numpy').load()[0]
+    assert isinstance(sim.flight_data, FlightData)
+    assert sim.flight_data['altitude'].tolist() == [0.0, 10.0, 5.0]
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        CsvSimulationLoader('flight.csv', backend='polars')
@@ -0,0 +1,99 @@
+import re
+import subprocess
+import sys
+from os.path import dirname, join
+from typing import Sequence
+
+import pytest
+
+import openrocket_parser
+
+SAMPLE = join(dirname(__file__), "sample.ork")
+
+# Cumulative import time budget of `import openrocket_parser`, in microseconds.
+# Importing pandas alone takes longer than this, so the budget catches an eager pandas import.
+IMPORT_TIME_BUDGET_US = 150_000
+
+
+def _run(args: Sequence[str]) -> subprocess.CompletedProcess:
+    """Runs a fresh interpreter with the given command line arguments, e.g. ['-c', code]."""
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, check=True)
+
+
+def test_import_time_budget():
+    # The best of a few runs, so a busy machine doesn't fail the test
+    timings = []
+    for _ in range(3):
+        result = _run(['-X', 'importtime', '-c', 'import openrocket_parser'])
+        match = re.search(r'^import time:\s+\d+ \|\s+(\d+) \| openrocket_parser$', result.stderr, re.MULTILINE)
+        assert match, result.stderr[-2000:]
+        timings.append(int(match.group(1)))
+    assert min(timings) < IMPORT_TIME_BUDGET_US, f"import openrocket_parser took {min(timings)} us"
+
+
+def test_import_is_lazy_and_leaves_logging_alone():
+    result = _run(['-c', (
+        "import sys, logging, openrocket_parser\n"
+        "print(sorted(m for m in ('pandas', 'matplotlib', 'openrocket_parser.simulations.loader') if m in sys.modules))\n"
+        "print(len(logging.getLogger().handlers))"
+    )])
+    assert result.stdout.split('\n')[:2] == ['[]', '0']
+
+
+def test_numpy_backend_never_imports_pandas():
+    result = _run(['-c', (
+        "import sys\n"
+        "from openrocket_parser.simulations.loader import load_simulations_from_xml\n"
+        "from openrocket_parser.simulations.metrics import concatenate_columns\n"
+        f"sims = load_simulations_from_xml({SAMPLE!r}, backend='numpy')\n"
+        "concatenate_columns(sims, ['altitude'])\n"
+        "print(len(sims), 'pandas' in sys.modules)"
+    )])
+    assert result.stdout.strip() == '3 False'
+
+
+def test_numpy_backend_without_pandas_installed():
+    result = _run(['-c', (
+        "import sys\n"
+        "sys.modules['pandas'] = None\n"
+        "from openrocket_parser.simulations import alignment, dispersion\n"
+        "from openrocket_parser.simulations.loader import load_simulations_from_xml\n"
+        f"sims = load_simulations_from_xml({SAMPLE!r}, backend='numpy')\n"
+        "print(alignment.estimate_time_offset(sims[0], sims[0]))"
+    )])
+    assert float(result.stdout) == pytest.approx(0.0, abs=1e-6)
+
+
+def test_pandas_backend_without_pandas_installed():
+    result = _run(['-c', (
+        "import sys\n"
+        "sys.modules['pandas'] = None\n"
+        "from openrocket_parser.simulations.loader import CsvSimulationLoader, load_simulations_from_xml\n"
+        "from openrocket_parser.document import OrkDocument\n"
+        "for load in (lambda: load_simulations_from_xml(" + repr(SAMPLE) + "),\n"
+        "             lambda: OrkDocument.open(" + repr(SAMPLE) + ").simulations,\n"
+        "             lambda: CsvSimulationLoader('flight.csv').load()):\n"
+        "    try:\n"
+        "        load()\n"
+        "    except ImportError as e:\n"
+        "        print('[pandas]' in str(e))\n"
+    )])
+    assert result.stdout.split() == ['True', 'True', 'True']
+
+
+def test_lazy_attributes():
+    assert openrocket_parser.OrkDocument.__name__ == 'OrkDocument'
+    assert 'compute_metrics' in dir(openrocket_parser)
+    with pytest.raises(AttributeError):
+        openrocket_parser.not_a_public_name
+
+
+def test_components_registered_before_first_parse():
+    result = _run(['-c', (
+        "from openrocket_parser.core import load_rocket_from_xml\n"
+        "from openrocket_parser.components.components import COMPONENT_REGISTRY\n"
+        "print(sorted(t for t in ('stage', 'nosecone', 'bodytube', 'finset', 'motormount') if t in COMPONENT_REGISTRY))\n"
+        f"rocket = load_rocket_from_xml({SAMPLE!r})\n"
+        "print(type(rocket.stages[-1]).__name__, type(rocket.stages[-1].subcomponents[0]).__name__)"
+    )])
+    assert result.stdout.split('\n')[:2] == ["['bodytube', 'finset', 'motormount', 'nosecone', 'stage']", 'Stage NoseCone']
@@ -0,0 +1,175 @@
+import os
+import socket
+import time
+
+import numpy as np
+import pytest
+
+from openrocket_parser import follow, listen
+from openrocket_parser.simulations import live
+from openrocket_parser.simulations.live import CsvFollower, RingBuffer
+
+
+def test_ring_buffer_wraps():
+    buffer = RingBuffer(['time', 'altitude'], capacity=5)
+    buffer.append(np.array([[0.0, 0.0], [1.0, 10.0], [2.0, 20.0]]))
+    assert len(buffer) == 3
+    assert buffer.column('time').tolist() == [0.0, 1.0, 2.0]
+
+    buffer.append(np.array([[3.0, 30.0], [4.0, 40.0], [5.0, 50.0], [6.0, 60.0]]))
+    assert len(buffer) == 5 and buffer.total == 7
+    assert buffer.column('altitude').tolist() == [20.0, 30.0, 40.0, 50.0, 60.0]
+    assert buffer.to_array()[:, 0].tolist() == [2.0, 3.0, 4.0, 5.0, 6.0]
+
+    buffer.append(np.arange(20, dtype=np.float64).reshape(10, 2))
+    assert buffer.column('time').tolist() == [10.0, 12.0, 14.0, 16.0, 18.0]
+    with pytest.raises(KeyError):
+        buffer.column('velocity')
+
+
+def test_follow_reads_only_appended_lines(tmp_path):
+    path = tmp_path / 'daq.csv'
+    path.write_text("# Time (s),Pressure (kPa)\n0,100\n1,101\n")
+
+    follower = follow(str(path), capacity=4)
+    blocks = []
+    follower.subscribe(lambda f, block: blocks.append(block['time'].tolist()))
+    assert follower.columns == ['time', 'pressure']
+    assert follower.units['pressure'] == 'kPa'
+    assert follower.buffer.column('pressure').tolist() == [100.0, 101.0]
+
+    # A partially written line waits for its newline
+    with open(path, 'a', encoding='utf-8') as daq:
+        daq.write("2,102\n# Event IGNITION occurred at t=2.5 seconds\n3,1")
+    assert follower.poll() == 1
+    assert blocks == [[2.0]]
+    assert [e.type for e in follower.events] == ['ignition']
+
+    with open(path, 'a', encoding='utf-8') as daq:
+        daq.write("03\n4,104\n")
+    assert follower.poll() == 2
+    assert blocks == [[2.0], [3.0, 4.0]]
+    assert follower.poll() == 0
+    # Capacity of 4 rows, the first one was dropped
+    assert follower.buffer.column('pressure').tolist() == [101.0, 102.0, 103.0, 104.0]
+
+    sim = follower.load()[0]
+    assert sim.flight_data['time'].tolist() == [1.0, 2.0, 3.0, 4.0]
+    assert sim.units['time'] == 's'
+
+
+def test_follow_restarts_after_truncation(tmp_path):
+    path = tmp_path / 'daq.csv'
+    path.write_text("Time (s),Thrust (N)\n0,0\n1,50\n2,80\n")
+    follower = follow(str(path))
+    path.write_text("Time (s),Thrust (N)\n0,5\n")
+    follower.poll()
+    assert follower.buffer.column('thrust').tolist() == [5.0]
+
+
+def test_follow_reads_in_bounded_blocks(tmp_path, monkeypatch):
+    monkeypatch.setattr(live, 'READ_BLOCK_SIZE', 16)
+    path = tmp_path / 'daq.csv'
+    path.write_text("Time (s),Thrust (N)\n" + ''.join(f"{i},{10 * i}\n" for i in range(100)))
+
+    follower = CsvFollower(str(path))
+    blocks = []
+    follower.subscribe(lambda f, block: blocks.append(len(block['time'])))
+    assert follower.poll() == 100
+    # Each block of the backlog is parsed on its own, lines longer than a block wait for the next one
+    assert len(blocks) > 10 and max(blocks) <= 5
+    assert follower.buffer.column('thrust').tolist() == [10.0 * i for i in range(100)]
+
+
+def test_follow_restarts_after_rewrite(tmp_path):
+    path = tmp_path / 'daq.csv'
+    path.write_text("Time (s),Thrust (N)\n0,0\n1,50\n")
+    follower = follow(str(path))
+    # Truncated and written again past the previous offset before the next poll
+    path.write_text("Time (s),Thrust (N)\n0,7\n1,8\n2,9\n")
+    assert follower.poll() == 3
+    assert follower.buffer.column('thrust').tolist() == [7.0, 8.0, 9.0]
+
+    # Replaced by another file starting with the same bytes
+    replacement = tmp_path / 'new.csv'
+    replacement.write_text("Time (s),Thrust (N)\n0,7\n1,8\n2,9\n3,10\n")
+    os.replace(replacement, path)
+    assert follower.poll() == 4
+    assert follower.buffer.column('thrust').tolist() == [7.0, 8.0, 9.0, 10.0]
+
+
+def _udp_stream(**kwargs):
+    stream = listen('udp://127.0.0.1:0', **kwargs)
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    return stream, sender
+
+
+def _poll_until(stream, rows, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while stream.buffer is None or stream.buffer.total < rows:
+        assert time.monotonic() < deadline, "telemetry not received"
+        if stream.poll() == 0:
+            time.sleep(0.01)
+
+
+def test_listen_udp_csv():
+    stream, sender = _udp_stream(capacity=3, backend='numpy')
+    with sender:
+        # Sent before the header, dropped
+        sender.sendto(b"5,50\n", stream.address)
+        sender.sendto(b"Time (s),Altitude (m)\n0,0\n1,10", stream.address)
+        sender.sendto(b"2,20\nnot a frame\n3,30\n", stream.address)
+        _poll_until(stream, 4)
+    stream.close()
+
+    assert stream.columns == ['time', 'altitude']
+    assert stream.units['altitude'] == 'm'
+    # Capacity of 3 rows, every datagram ends its last frame
+    assert stream.buffer.column('altitude').tolist() == [10.0, 20.0, 30.0]
+    assert stream.dropped == 2
+
+
+def test_listen_udp_binary_frames():
+    stream, sender = _udp_stream(columns=['time', 'altitude'], binary_dtype='<f4')
+    blocks = []
+    stream.subscribe(lambda s, block: blocks.append(len(block['time'])))
+    frames = np.arange(2000, dtype='<f4').reshape(-1, 2)
+    with sender:
+        for start in range(0, len(frames), 100):
+            sender.sendto(frames[start:start + 100].tobytes(), stream.address)
+        # A truncated frame is dropped with its datagram tail
+        sender.sendto(frames[:2].tobytes()[:12], stream.address)
+        _poll_until(stream, 1001)
+    stream.close()
+
+    assert stream.buffer.total == 1001
+    assert stream.buffer.column('altitude')[:1000].tolist() == frames[:, 1].tolist()
+    assert stream.dropped == 1 and sum(blocks) == 1001
+
+    with pytest.raises(ValueError):
+        listen('udp://127.0.0.1:0', binary_dtype='<f4')
+    with pytest.raises(ValueError):
+        listen('udp://127.0.0.1')
+
+
+@pytest.mark.skipif(not hasattr(os, 'mkfifo'), reason="FIFOs are POSIX only")
+def test_listen_fifo(tmp_path):
+    path = str(tmp_path / 'telemetry')
+    os.mkfifo(path)
+    stream = listen(path, columns=['time', 'altitude'], binary_dtype='<f8')
+    assert stream.poll() == 0
+
+    writer = os.open(path, os.O_WRONLY)
+    data = np.array([[0.0, 0.0], [1.0, 10.0], [2.0, 20.0], [3.0, 30.0]]).tobytes()
+    # Frames split anywhere wait for their remaining bytes, the whole frames before the split are kept
+    os.write(writer, data[:40])
+    assert stream.poll() == 2
+    # Split inside a value
+    os.write(writer, data[40:52])
+    assert stream.poll() == 1
+    os.write(writer, data[52:])
+    assert stream.poll() == 1
+    os.close(writer)
+    assert stream.poll() == 0
+    stream.close()
+    assert stream.buffer.column('altitude').tolist() == [0.0, 10.0, 20.0, 30.0]
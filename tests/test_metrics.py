@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from openrocket_parser.simulations.metrics import compute_metrics
+from openrocket_parser.simulations.simulation import Simulation
+from openrocket_parser.simulations.simulation_data import FlightEvent
+
+
+def test_metrics_match_openrocket_summary(sample_sims):
+    metrics = compute_metrics(sample_sims)
+
+    assert len(metrics) == len(sample_sims)
+    for (_, row), sim in zip(metrics.iterrows(), sample_sims):
+        assert row["name"] == sim.name
+        assert row["apogee"] == pytest.approx(sim.summary["maxaltitude"])
+        assert row["apogee_time"] == pytest.approx(sim.summary["timetoapogee"])
+        assert row["max_velocity"] == pytest.approx(sim.summary["maxvelocity"])
+        assert row["max_mach"] == pytest.approx(sim.summary["maxmach"])
+        assert row["rail_exit_velocity"] == pytest.approx(sim.summary["launchrodvelocity"])
+        assert row["landing_velocity"] == pytest.approx(sim.summary["groundhitvelocity"], abs=0.05)
+        assert row["max_q"] > 0
+
+
+def test_metrics_with_drogue_and_main():
+    time = np.arange(0.0, 31.0)
+    altitude = np.concatenate((np.linspace(0, 100, 11), 100 - 4.0 * np.arange(1, 11), 60 - 6.0 * np.arange(1, 11)))
+    sim = Simulation(
+        name="dual deploy", description="", motor_config="default",
+        events=[
+            FlightEvent(time=10.0, type="apogee"),
+            FlightEvent(time=10.0, type="recoverydevicedeployment"),
+            FlightEvent(time=20.0, type="recoverydevicedeployment"),
+            FlightEvent(time=30.0, type="groundhit"),
+        ],
+        flight_data=pd.DataFrame({"time": time, "altitude": altitude}),
+    )
+
+    metrics = compute_metrics([sim]).iloc[0]
+
+    assert metrics["drogue_descent_rate"] == pytest.approx(4.0)
+    assert metrics["main_descent_rate"] == pytest.approx(6.0)
+    # Missing columns and events yield NaN instead of failing
+    assert np.isnan(metrics["max_mach"])
+    assert np.isnan(metrics["burnout_altitude"])
+
+
+def test_metrics_of_no_simulations():
+    assert len(compute_metrics([])) == 0
+
+
+def test_max_q_uses_units(sample_sim):
+    # The air data of an OpenRocket CSV export in mbar and °C
+    exported = sample_sim.convert_units({'air_pressure': 'mbar', 'air_temperature': '°C'})
+    metrics = compute_metrics([sample_sim, exported])
+    assert metrics['max_q'][1] == pytest.approx(metrics['max_q'][0])
+    assert metrics['max_q'][0] == pytest.approx(np.nanmax(sample_sim.channel('dynamic_pressure')))
@@ -0,0 +1,116 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+from os.path import dirname, join
+
+import pytest
+
+matplotlib = pytest.importorskip("matplotlib")
+
+from openrocket_parser.tools.flight_report import find_ork_files, generate_reports  # noqa: E402
+
+SAMPLE = join(dirname(__file__), "sample.ork")
+
+
+@pytest.fixture
+def designs(tmp_path):
+    directory = tmp_path / "designs"
+    (directory / "iteration").mkdir(parents=True)
+    shutil.copy(SAMPLE, directory / "iteration" / "rocket.ork")
+    return directory
+
+
+def test_find_ork_files(designs):
+    (designs / "notes.txt").write_text("not a design")
+    assert find_ork_files([str(designs)]) == [(str(designs / "iteration" / "rocket.ork"), join("iteration", "rocket"))]
+    assert find_ork_files([SAMPLE]) == [(SAMPLE, "sample")]
+
+
+def test_reports_are_incremental(designs, tmp_path):
+    output_dir = str(tmp_path / "reports")
+    rendered = generate_reports([str(designs)], output_dir, formats=('png', 'svg'), workers=1, dpi=30)
+
+    outputs = rendered[join("iteration", "rocket")]
+    assert len(outputs) == 3 * 2
+    assert all(os.path.getsize(output) > 0 for output in outputs)
+
+    # Nothing changed
+    assert generate_reports([str(designs)], output_dir, formats=('png', 'svg'), workers=1, dpi=30) == {}
+    # Other settings, or a modified design, are rendered again
+    assert generate_reports([str(designs)], output_dir, formats=('png',), workers=1, dpi=30)
+    with open(designs / "iteration" / "rocket.ork", 'a') as design:
+        design.write("\n")
+    assert generate_reports([str(designs)], output_dir, formats=('png',), workers=1, dpi=30)
+    # Deleted sheets are rendered again
+    os.remove(outputs[0])
+    assert generate_reports([str(designs)], output_dir, formats=('png', 'svg'), workers=1, dpi=30)
+
+
+def test_broken_files_are_reported(designs, tmp_path, caplog):
+    (designs / "broken.ork").write_text("not xml")
+    output_dir = str(tmp_path / "reports")
+    rendered = generate_reports([str(designs)], output_dir, workers=2, dpi=30)
+    assert "broken" not in rendered
+    assert len(rendered[join("iteration", "rocket")]) == 3
+    with open(join(output_dir, ".report-cache.json")) as cache_file:
+        assert "broken" not in json.load(cache_file)
+    assert "Could not render 1 file(s): broken" in caplog.text
+
+    # Tried again on the next run, the unchanged design is skipped
+    caplog.clear()
+    assert generate_reports([str(designs)], output_dir, workers=1, dpi=30) == {}
+    assert "Could not render 1 file(s): broken" in caplog.text
+    with pytest.raises(ValueError):
+        generate_reports([str(designs)], str(tmp_path / "reports"), formats=('jpg',))
+
+
+def test_sheets_are_numbered_by_file_position(designs, tmp_path):
+    # The first simulation has no flight data, the other sheets keep their numbers
+    with open(SAMPLE, encoding='utf-8') as sample:
+        document = sample.read()
+    start = document.index('<flightdata')
+    end = document.index('</flightdata>') + len('</flightdata>')
+    (designs / "partial.ork").write_text(document[:start] + document[end:], encoding='utf-8')
+
+    rendered = generate_reports([str(designs / "partial.ork")], str(tmp_path / "reports"), workers=1, dpi=30)
+    assert [os.path.basename(output).split('-')[0] for output in rendered["partial"]] == ['2', '3']
+
+
+def test_reports_without_pandas(designs, tmp_path):
+    # The visualizer extra doesn't install pandas, the sheets only need NumPy arrays
+    result = subprocess.run([sys.executable, '-c', (
+        "import sys\n"
+        "sys.modules['pandas'] = None\n"
+        "from openrocket_parser.tools.flight_report import generate_reports\n"
+        f"rendered = generate_reports([{str(designs)!r}], {str(tmp_path / 'reports')!r}, workers=1, dpi=30)\n"
+        "print(sum(len(outputs) for outputs in rendered.values()))"
+    )], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '3'
+
+
+def test_designs_without_simulations_are_cached(designs, tmp_path):
+    with open(SAMPLE, encoding='utf-8') as sample:
+        document = sample.read()
+    start = document.index('<simulations>')
+    end = document.index('</simulations>') + len('</simulations>')
+    (designs / "bare.ork").write_text(document[:start] + document[end:], encoding='utf-8')
+    output_dir = str(tmp_path / "reports")
+
+    rendered = generate_reports([str(designs / "bare.ork")], output_dir, workers=1, dpi=30)
+    assert rendered == {"bare": []}
+    with open(join(output_dir, ".report-cache.json")) as cache_file:
+        assert json.load(cache_file)["bare"]["outputs"] == []
+    assert generate_reports([str(designs / "bare.ork")], output_dir, workers=1, dpi=30) == {}
+
+
+def test_files_are_parsed_once(designs, tmp_path, monkeypatch):
+    import openrocket_parser.document as document
+    reads = []
+    export = document.export_xml_from_ork
+    monkeypatch.setattr(document, 'export_xml_from_ork', lambda path: reads.append(path) or export(path))
+
+    rendered = generate_reports([str(designs)], str(tmp_path / "reports"), workers=1, dpi=30)
+    assert len(rendered[join("iteration", "rocket")]) == 3
+    assert len(reads) == 1
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from openrocket_parser.simulations.resampling import lttb_indices
+from openrocket_parser.simulations.simulation import Simulation
+
+
+def test_resample_uniform_grid(sample_sim):
+    resampled = sample_sim.resample(0.1)
+    time = resampled.flight_data["time"].to_numpy()
+
+    np.testing.assert_allclose(np.diff(time), 0.1)
+    assert list(resampled.flight_data.columns) == list(sample_sim.flight_data.columns)
+    assert resampled.events == sample_sim.events
+    assert resampled.flight_data["altitude"].max() == pytest.approx(sample_sim.summary["maxaltitude"], abs=1.0)
+    # The original simulation is left untouched
+    assert len(sample_sim.flight_data) == 751
+
+
+def test_resample_previous():
+    sim = Simulation(name="steps", description="", motor_config="default",
+                     flight_data=pd.DataFrame({"time": [0.0, 1.0, 2.0], "thrust": [10.0, 20.0, 0.0]}))
+
+    resampled = sim.resample(0.5, method="previous")
+
+    assert list(resampled.flight_data["thrust"]) == [10.0, 10.0, 20.0, 20.0, 0.0]
+    with pytest.raises(ValueError):
+        sim.resample(0.0)
+
+
+def test_downsample_keeps_peaks(sample_sim):
+    downsampled = sample_sim.downsample(60)
+    data = downsampled.flight_data
+
+    assert 50 <= len(data) <= 60
+    assert data["time"].is_monotonic_increasing
+    assert data["altitude"].max() == sample_sim.flight_data["altitude"].max()
+    assert data["vertical_acceleration"].max() == sample_sim.flight_data["vertical_acceleration"].max()
+    assert data["time"].iloc[-1] == sample_sim.flight_data["time"].iloc[-1]
+
+
+@pytest.mark.parametrize("num_points", [1, 2, 3, 5, 10, 13])
+def test_downsample_stays_within_budget(sample_sim, num_points):
+    data = sample_sim.downsample(num_points).flight_data
+    assert len(data) <= num_points
+    assert data["altitude"].max() == sample_sim.flight_data["altitude"].max()
+    assert np.all(np.diff(data["time"].to_numpy()) >= 0)
+
+
+def test_downsample_stride_and_short_data(sample_sim):
+    assert len(sample_sim.downsample(50, method="stride").flight_data) == 50
+    assert len(sample_sim.downsample(10000).flight_data) == 751
+    with pytest.raises(ValueError):
+        sample_sim.downsample(50, method="random")
+
+
+def test_lttb_on_a_spike():
+    x = np.arange(1000.0)
+    y = np.zeros(1000)
+    y[437] = 5.0
+
+    indices = lttb_indices(x, y, 20)
+
+    assert 437 in indices
+    assert indices[0] == 0 and indices[-1] == 999
+    assert np.all(np.diff(indices) > 0)
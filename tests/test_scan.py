@@ -0,0 +1,91 @@
+from os.path import join, dirname
+import shutil
+import zipfile
+
+import numpy as np
+import pytest
+
+from openrocket_parser.simulations.loader import _drop_datapoints, _parse_datapoints, load_simulations_from_xml
+from openrocket_parser.simulations.scan import list_simulations, scan_summaries, _skip_datapoints
+
+
+@pytest.fixture
+def sample_ork_path():
+    """Returns the path to the plain XML sample.ork file."""
+    return join(dirname(__file__), "sample.ork")
+
+
+def test_scan_matches_full_load(sample_ork_path):
+    summaries = scan_summaries([sample_ork_path], max_workers=1)
+    sims = load_simulations_from_xml(sample_ork_path)
+
+    assert list(summaries["name"]) == [sim.name for sim in sims]
+    for (_, row), sim in zip(summaries.iterrows(), sims):
+        for key, value in sim.summary.items():
+            assert row[key] == value
+    assert list(summaries["launchrodlength"]) == [1.0, 1.0, 1.0]
+    assert list(summaries["windaverage"]) == [2.0, 2.0, 2.0]
+
+
+def test_scan_in_parallel(sample_ork_path, tmp_path):
+    plain_path = tmp_path / "plain.ork"
+    shutil.copy(sample_ork_path, plain_path)
+    zipped_path = tmp_path / "zipped.ork"
+    with zipfile.ZipFile(zipped_path, "w", zipfile.ZIP_DEFLATED) as zip_ref:
+        zip_ref.write(sample_ork_path, "rocket.ork")
+
+    summaries = scan_summaries([plain_path, zipped_path], max_workers=2)
+
+    assert len(summaries) == 6
+    assert list(summaries["index"]) == [0, 1, 2, 0, 1, 2]
+    assert summaries["maxaltitude"].iloc[0] == summaries["maxaltitude"].iloc[3]
+
+
+def test_scan_skips_unreadable_files(sample_ork_path, tmp_path, caplog):
+    invalid_path = tmp_path / "invalid.ork"
+    invalid_path.write_text("<openrocket><simulations>")
+
+    summaries = scan_summaries([sample_ork_path, invalid_path], max_workers=1)
+
+    assert len(summaries) == 3
+    assert len(caplog.records) >= 1
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 4096])
+def test_skip_datapoints_across_chunk_boundaries(chunk_size):
+    document = (b"<flightdata a='1'><databranch><event time='0'/>"
+                b"<datapoint>1,2</datapoint><datapoint>3,4</datapoint></databranch></flightdata>")
+    chunks = [document[i:i + chunk_size] for i in range(0, len(document), chunk_size)]
+
+    assert b"".join(_skip_datapoints(chunks)) == (
+        b"<flightdata a='1'><databranch><event time='0'/></databranch></flightdata>"
+    )
+
+
+def test_list_then_load_selected_simulations(sample_ork_path):
+    headers = list_simulations(sample_ork_path)
+    sims = load_simulations_from_xml(sample_ork_path)
+    assert [header["name"] for header in headers] == [sim.name for sim in sims]
+
+    selected = load_simulations_from_xml(sample_ork_path, backend="numpy", indices=[2, 0])
+    assert [sim.name for sim in selected] == [sims[0].name, sims[2].name]
+    assert np.array_equal(selected[1].flight_data.to_numpy(), sims[2].flight_data.to_numpy(), equal_nan=True)
+    assert [evt.type for evt in selected[1].events] == [evt.type for evt in sims[2].events]
+
+
+def test_drop_datapoints_keeps_the_document_well_formed(sample_ork_path):
+    with open(sample_ork_path, "rb") as ork_file:
+        document = ork_file.read()
+    reduced = _drop_datapoints(document, keep={1})
+
+    assert reduced.count(b"<datapoint>") == len(load_simulations_from_xml(sample_ork_path)[1].flight_data)
+    assert reduced.count(b"</databranch>") == document.count(b"</databranch>")
+    assert reduced.count(b"<event ") == document.count(b"<event ")
+
+
+def test_parse_datapoints():
+    values = _parse_datapoints(["0.1,NaN,1e3", "0.2,2,-4.5e-2"], 3)
+    assert values.shape == (2, 3)
+    assert np.isnan(values[0, 1]) and values[1, 2] == -0.045
+    with pytest.raises(ValueError):
+        _parse_datapoints(["0.1,oops,3"], 3)
@@ -0,0 +1,78 @@
+from os.path import dirname, join
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from openrocket_parser.components.components import TrapezoidFinSet
+from openrocket_parser.core import load_rocket_from_xml
+from openrocket_parser.simulations.loader import parse_header
+from openrocket_parser.units import convert, conversion, meters_to_inches, split_unit
+
+
+def test_parse_header_splits_unit():
+    assert parse_header('Vertical acceleration (m/s²)') == ('vertical_acceleration', 'm/s²')
+    assert parse_header('Time (s)') == ('time', 's')
+    # A parenthesis that isn't a unit stays in the name
+    assert split_unit('Vertical orientation (zenith)') == ('Vertical orientation (zenith)', None)
+    assert parse_header('Vertical orientation (zenith) (°)') == ('vertical_orientation_zenith', '°')
+    # XML headers have no unit, OpenRocket's SI unit is used
+    assert parse_header('Altitude') == ('altitude', 'm')
+    assert parse_header('Mach number') == ('mach_number', None)
+
+
+def test_convert_is_vectorized():
+    values = np.array([0.0, 1.0, 100.0])
+    np.testing.assert_allclose(convert(values, 'm', 'ft'), values / 0.3048)
+    np.testing.assert_allclose(convert(np.array([0.0, 100.0]), '°C', '°F'), [32.0, 212.0])
+    series = convert(pd.Series([1.0, 2.0]), 'kg', 'g')
+    assert isinstance(series, pd.Series)
+    assert series.tolist() == [1000.0, 2000.0]
+    assert conversion('ft', 'in') == pytest.approx((12.0, 0.0))
+    with pytest.raises(ValueError):
+        convert(values, 'm', 's')
+    with pytest.raises(ValueError):
+        convert(values, 'm', 'furlong')
+
+
+def test_legacy_helpers_accept_arrays():
+    np.testing.assert_allclose(meters_to_inches(np.array([0.0, 1.0])), [0.0, 39.3701])
+    assert meters_to_inches(None) == 0.0
+
+
+def test_simulation_units(sample_sim):
+    assert sample_sim.units['altitude'] == 'm'
+    assert sample_sim.units['vertical_acceleration'] == 'm/s²'
+    assert 'mach_number' not in sample_sim.units
+
+    altitude_ft = sample_sim.column_in('altitude', 'ft')
+    np.testing.assert_allclose(altitude_ft, sample_sim.flight_data['altitude'].to_numpy() / 0.3048)
+
+    converted = sample_sim.convert_units({'altitude': 'ft', 'vertical_velocity': 'ft/s'})
+    assert converted.units['altitude'] == 'ft'
+    assert sample_sim.units['altitude'] == 'm'
+    np.testing.assert_allclose(converted.flight_data['altitude'].to_numpy(), altitude_ft)
+    with pytest.raises(ValueError):
+        sample_sim.column_in('mach_number', 'm')
+
+
+def test_units_survive_column_store(sample_sim, tmp_path):
+    sample_sim.save_columns(str(tmp_path))
+    reopened = type(sample_sim).open_columns(str(tmp_path))
+    assert reopened.units == sample_sim.units
+
+
+def test_component_field_units():
+    rocket = load_rocket_from_xml(join(dirname(__file__), "sample.ork"))
+
+    def walk(component):
+        yield component
+        for child in getattr(component, 'subcomponents', None) or []:
+            yield from walk(child)
+
+    fins = [c for stage in rocket.stages for c in walk(stage) if isinstance(c, TrapezoidFinSet)]
+    assert TrapezoidFinSet.field_units()['rootchord'] == 'm'
+    assert TrapezoidFinSet.field_units()['cant'] == '°'
+    assert fins[0].value_in('rootchord', 'mm') == pytest.approx(fins[0].rootchord * 1000.0)
+    with pytest.raises(ValueError):
+        fins[0].value_in('name', 'mm')
@@ -0,0 +1,339 @@
+import argparse
+import base64
+import json
+import os
+import re
+import socket
+from dataclasses import replace
+from time import monotonic
+
+import numpy as np
+import pytest
+
+matplotlib = pytest.importorskip("matplotlib")
+matplotlib.use("Agg")
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+
+from openrocket_parser.simulations.live import listen  # noqa: E402
+from openrocket_parser.tools.flight_visualizer import sim_numbers  # noqa: E402
+from openrocket_parser.tools.visualizer_tool import figure as figure_module  # noqa: E402
+from openrocket_parser.tools.visualizer_tool.controls import PlaybackControls  # noqa: E402
+from openrocket_parser.tools.visualizer_tool.figure import FlightFigure  # noqa: E402
+from openrocket_parser.tools.visualizer_tool.html_export import export_html  # noqa: E402
+from openrocket_parser.tools.visualizer_tool.live import LiveFlightView  # noqa: E402
+from openrocket_parser.tools.visualizer_tool.playback import PlaybackClock  # noqa: E402
+from openrocket_parser.tools.visualizer_tool.render import frame_indices, render_flight, render_frames  # noqa: E402
+from openrocket_parser.tools.visualizer_tool.series import FlightSeries  # noqa: E402
+
+
+@pytest.fixture
+def flight_figure(sample_sim):
+    return FlightFigure(FlightSeries(sample_sim), Figure(figsize=(12, 8)))
+
+
+def test_series_running_maxima(sample_sim):
+    series = FlightSeries(sample_sim)
+    altitude = np.asarray(sample_sim.flight_data['altitude'])
+
+    assert len(series) == len(altitude)
+    assert series.time.flags.c_contiguous
+    assert series.max_altitude[-1] == pytest.approx(np.nanmax(altitude))
+    assert np.all(np.diff(series.max_altitude) >= 0)
+    assert series.index_at(-1.0) == 0
+    assert series.index_at(series.time[-1] + 1.0) == len(series) - 1
+
+
+def test_update_draws_prefix(flight_figure):
+    series = flight_figure.timeline
+    track = flight_figure.tracks[0]
+    index = len(series) // 2
+    flight_figure.update(index)
+
+    x, y = track.alt_line.get_data()
+    assert len(x) == index + 1
+    assert np.array_equal(np.asarray(y), series.altitude[:index + 1], equal_nan=True)
+    assert track.alt_max_text.get_text() == f"Max: {np.nanmax(series.altitude[:index + 1]):.1f} m"
+
+
+def test_max_labels_follow_the_playback_position(flight_figure):
+    series = flight_figure.timeline
+    flight_figure.update(len(series) - 1)
+    flight_figure.update(1)
+    # Seeking back shows the maximum up to that position, not the maximum seen so far
+    assert flight_figure.tracks[0].alt_max_text.get_text() == f"Max: {series.max_altitude[1]:.1f} m"
+
+
+def test_static_limits_and_reset(flight_figure):
+    series = flight_figure.timeline
+    limits = flight_figure.ax_alt.get_ylim()
+    flight_figure.update(len(series) - 1)
+    assert flight_figure.ax_alt.get_ylim() == limits
+    assert limits[1] >= np.nanmax(series.altitude)
+
+    artists = flight_figure.reset()
+    assert len(artists) == 9
+    assert len(flight_figure.tracks[0].traj_line.get_xdata()) == 0
+
+
+def test_overlay_on_a_common_time_base(sample_sims):
+    series = [FlightSeries(sim) for sim in sample_sims]
+    flight_figure = FlightFigure(series, Figure(figsize=(12, 8)))
+    timeline = flight_figure.timeline
+
+    assert timeline.time[-1] == max(s.time[-1] for s in series)
+    assert len(flight_figure.artists) == 8 * len(series) + 1
+    index = len(timeline) // 3
+    flight_figure.update(index)
+    time = timeline.time[index]
+    for track in flight_figure.tracks:
+        drawn = track.alt_line.get_xdata()
+        assert len(drawn) == track.series.index_at(time) + 1
+        assert drawn[-1] <= time
+    # The axes hold every simulation
+    assert flight_figure.ax_alt.get_ylim()[1] >= max(np.nanmax(s.altitude) for s in series)
+
+
+def test_sim_numbers():
+    assert sim_numbers("1,3,5") == [1, 3, 5]
+    assert sim_numbers("2, 2,1") == [2, 1]
+    with pytest.raises(argparse.ArgumentTypeError):
+        sim_numbers("0")
+    with pytest.raises(argparse.ArgumentTypeError):
+        sim_numbers("one")
+
+
+def test_frame_indices_follow_the_playback_clock(sample_sim):
+    series = FlightSeries(sample_sim)
+    indices = frame_indices(series, fps=10, speed=4)
+
+    assert len(indices) == int(np.ceil(series.duration * 10 / 4)) + 1
+    assert indices[0] == 0 and indices[-1] == len(series) - 1
+    assert np.all(np.diff(indices) >= 0)
+    # Every frame shows the last sample at or before its playback time
+    assert series.time[indices[25]] <= series.time[0] + 25 * 0.4 + 1e-9
+    with pytest.raises(ValueError):
+        frame_indices(series, fps=0)
+
+
+def test_render_frames_in_parallel(sample_sim, tmp_path):
+    series = FlightSeries(sample_sim)
+    frames = render_frames(series, str(tmp_path / "frames"), fps=1, speed=40, workers=2, dpi=20)
+
+    assert len(frames) == len(frame_indices(series, fps=1, speed=40))
+    assert all(os.path.getsize(frame) > 0 for frame in frames)
+
+
+def test_render_gif(sample_sim, tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    ImageSequence = pytest.importorskip("PIL.ImageSequence")
+    output = render_flight(sample_sim, str(tmp_path / "flight.gif"), fps=1, speed=40, workers=1, dpi=20)
+
+    with Image.open(output) as gif:
+        assert gif.size == (240, 160)
+        assert gif.n_frames > 1
+        shown = [np.asarray(frame.convert('RGB')) for frame in ImageSequence.Iterator(gif)]
+
+    # The transparent unchanged pixels of every frame composite to the rendered frames, pixel for pixel
+    frames = render_frames(FlightSeries(sample_sim), str(tmp_path / "frames"), fps=1, speed=40, workers=2, dpi=20,
+                           gif_palette=True)
+    assert len(shown) == len(frames)
+    for frame, expected in zip(shown, frames):
+        with Image.open(expected) as image:
+            assert image.mode == 'P'
+            np.testing.assert_array_equal(frame, np.asarray(image.convert('RGB')))
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_playback_clock_follows_wall_time(sample_sim):
+    series = FlightSeries(sample_sim)
+    fake = FakeClock()
+    clock = PlaybackClock(series, speed=3.0, clock=fake)
+
+    fake.now += 2.0
+    assert clock.index() == series.index_at(series.time[0] + 6.0)
+    assert not clock.finished
+    # The whole flight takes a third of its duration at 3x
+    fake.now += series.duration / 3.0 - 2.0
+    assert clock.finished
+    with pytest.raises(ValueError):
+        PlaybackClock(series, speed=0)
+
+
+def test_playback_drops_frames_when_drawing_is_slow(sample_sim):
+    series = FlightSeries(sample_sim)
+    fake = FakeClock()
+    clock = PlaybackClock(series, speed=0.5, clock=fake)
+
+    shown = []
+    for index in clock.frames():
+        shown.append(index)
+        # Every frame takes 10 seconds to draw
+        fake.now += 10.0
+    assert len(shown) == int(np.ceil(series.duration / 5.0)) + 1
+    assert shown[-1] == len(series) - 1
+    assert np.all(np.diff(shown) > 1)
+
+
+def test_pause_seek_and_hold_at_the_end(sample_sim):
+    series = FlightSeries(sample_sim)
+    fake = FakeClock()
+    clock = PlaybackClock(series, speed=1.0, clock=fake, loop=False)
+
+    clock.seek(50.0)
+    fake.now += 2.0
+    assert clock.flight_time == pytest.approx(52.0)
+    clock.pause()
+    fake.now += 30.0
+    assert clock.flight_time == pytest.approx(52.0)
+    clock.step(-100.0)
+    assert clock.flight_time == 0.0
+
+    frames = clock.frames()
+    next(frames)
+    fake.now += series.duration + 1.0
+    assert next(frames) == len(series) - 1
+    # Without loop the playback holds the last sample instead of ending
+    assert next(frames) == len(series) - 1
+    assert clock.paused
+    clock.resume()
+    assert clock.flight_time == 0.0
+
+
+class Key:
+    def __init__(self, key):
+        self.key = key
+
+
+def test_keyboard_controls_and_event_markers(sample_sim):
+    series = FlightSeries(sample_sim)
+    flight_figure = FlightFigure(series, Figure(figsize=(12, 8)))
+    flight_figure.mark_events()
+    fake = FakeClock()
+    clock = PlaybackClock(series, clock=fake)
+    controls = PlaybackControls(flight_figure, clock)
+
+    apogee = series.event_times[[event.type for event in series.events].index('apogee')]
+    clock.seek(apogee - series.time[0] - 0.1)
+    controls.on_key(Key('n'))
+    assert clock.flight_time == pytest.approx(apogee - series.time[0])
+    controls.on_key(Key('shift+right'))
+    assert clock.flight_time == pytest.approx(apogee + 10.0 - series.time[0])
+    controls.on_key(Key('p'))
+    assert clock.flight_time == pytest.approx(apogee - series.time[0])
+    controls.on_key(Key(' '))
+    assert clock.paused
+
+    # A seek draws the running maxima at the new position
+    index = clock.index()
+    flight_figure.update(index)
+    controls.update(index)
+    assert flight_figure.tracks[0].alt_max_text.get_text() == f"Max: {series.max_altitude[index]:.1f} m"
+    assert controls.cursor.get_xdata()[0] == series.time[index]
+    # Event lines on the three time plots
+    assert len(flight_figure.ax_acc.lines) > len(flight_figure.tracks)
+
+
+def test_live_view_stays_bounded():
+    stream = listen('udp://127.0.0.1:0', columns=['time', 'altitude', 'vertical_velocity'], capacity=2000,
+                    binary_dtype='<f8')
+    view = LiveFlightView(stream, Figure(figsize=(12, 8)), max_points=500)
+    FigureCanvasAgg(view.figure)
+    view.start(fps=30)
+    track = view.tracks[0]
+
+    def send(start, count):
+        time = np.arange(start, start + count) * 0.01
+        frames = np.column_stack((time, 1000 - (time - 10) ** 2, -2 * (time - 10)))
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+            for block in np.array_split(frames, max(1, count // 500)):
+                sender.sendto(block.tobytes(), stream.address)
+        deadline = monotonic() + 5
+        while stream.buffer is None or stream.buffer.total < start + count:
+            assert monotonic() < deadline
+            view.tick()
+
+    # The first frames draw the whole figure, then only the artists are blitted
+    send(0, 1000)
+    view.figure.canvas.draw()
+    assert not view.needs_full_draw and view._background is not None
+    assert len(track.alt_line.get_xdata()) == 501
+
+    send(1000, 5000)
+    # Only the last 2000 rows are kept, decimated to 500 points, the maxima cover the whole session
+    time = np.asarray(track.alt_line.get_xdata())
+    assert len(time) <= 501 and time[-1] == pytest.approx(59.99)
+    assert time[0] == pytest.approx(40.0)
+    assert view.maxima[0] == pytest.approx(1000.0)
+    assert track.vel_max_text.get_text() == "Max: 20.0 m/s"
+    low, high = view.ax_alt.get_xlim()
+    assert low <= 40.0 and high >= 59.99
+    assert stream.buffer.column('time').nbytes == 2000 * 8
+    stream.close()
+
+
+def test_export_html_downsamples(sample_sim, tmp_path):
+    time = np.asarray(sample_sim.flight_data['time'])
+    long_sim = sample_sim.resample((time[-1] - time[0]) / 100_000)
+    long_sim.name = 'Long </script> flight'
+    output = str(tmp_path / 'flight.html')
+
+    assert export_html([long_sim, sample_sim], output, max_points=2000) == output
+    page = open(output, encoding='utf-8').read()
+    assert len(page) < 500_000
+    assert page.count('</script>') == 2
+
+    data = re.search(r'id="flight-data">(.*?)</script>', page, re.DOTALL).group(1)
+    payload = json.loads(data)
+    first = payload['simulations'][0]
+    assert first['name'] == long_sim.name
+    altitude = np.frombuffer(base64.b64decode(first['columns']['altitude']), dtype='<f4')
+    assert len(altitude) <= 2000
+    # The apogee is kept exactly
+    assert altitude.max() == np.float32(np.nanmax(np.asarray(long_sim.flight_data['altitude'])))
+    assert 'Apogee' in [event['label'] for event in first['events']]
+
+
+def test_series_east_north(sample_sim):
+    series = FlightSeries(sample_sim)
+    east = np.asarray(sample_sim.flight_data['position_east_of_launch'])
+    assert np.array_equal(series.east, east, equal_nan=True)
+    assert series.landing_index == sample_sim.event_index.sample_of('groundhit')
+
+    # Exports without the position columns fall back to the lateral distance and direction
+    columns = ['time', 'altitude', 'lateral_distance', 'lateral_direction']
+    no_position = replace(sample_sim, flight_data=sample_sim.flight_data[columns])
+    fallback = FlightSeries(no_position)
+    valid = ~np.isnan(east)
+    assert np.allclose(fallback.east[valid], east[valid], atol=0.05)
+
+
+def test_three_d_paths_are_decimated(sample_sims):
+    time = np.asarray(sample_sims[0].flight_data['time'])
+    long_sim = sample_sims[0].resample((time[-1] - time[0]) / 50_000)
+    series = [FlightSeries(long_sim)] + [FlightSeries(sim) for sim in sample_sims] * 4
+    flight_figure = FlightFigure(series, Figure(figsize=(12, 8)), three_d=True)
+
+    assert flight_figure.ensemble and flight_figure.ax_traj.name == '3d'
+    # Every landing point is drawn once, with the axes
+    assert len(flight_figure.landings.get_offsets()) == len(series)
+    # No per-simulation labels, they wouldn't fit
+    assert len(flight_figure.artists) == 5 * len(series) + 1
+
+    track = flight_figure.tracks[0]
+    budget = max(figure_module.PATH_POINTS // len(series), figure_module.MIN_PATH_POINTS)
+    assert len(track.path_rows) <= budget
+    index = len(series[0]) - 1
+    flight_figure.update(index)
+    east, north, altitude = track.traj_line.get_data_3d()
+    assert len(east) <= budget + 1
+    assert altitude.max() == pytest.approx(np.nanmax(series[0].altitude))
+    assert east[-1] == series[0].east[index] and "13 simulations" in flight_figure.live_text.get_text()